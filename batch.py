@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+批量课表转换工具
+将一个目录（或清单文件）中的所有课表 Excel 文件并行转换为 .ics 日历文件
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator, Optional
+
+from convert import parse_start_date
+from course_parser import SDUST_DURATION, SDUST_TIMETABLE, cache_stats, parse_timetable_from_xls
+from data import School
+from event_cache import shared_cache
+from excel_reader import BACKENDS
+from ics_diff import changes_path, load_event_index
+from output_store import (MANIFEST_NAME, STORE_DIR, OutputStore, canonical_courses, dedupe_ratio,
+                          timetable_digest, write_manifest)
+import profiling
+
+EXCEL_SUFFIXES = (".xls", ".xlsx")
+
+
+def find_inputs(input_dir: str) -> list[str]:
+    """递归查找目录下的所有 Excel 课表文件（忽略 Office 临时文件）"""
+    files = []
+    for path in Path(input_dir).rglob("*"):
+        if path.suffix.lower() in EXCEL_SUFFIXES and not path.name.startswith("~$"):
+            files.append(str(path))
+    return sorted(files)
+
+
+def read_manifest(manifest: str) -> list[str]:
+    """
+    读取清单文件：每行一个 Excel 文件路径，# 开头为注释
+    相对路径以清单文件所在目录为基准
+    """
+    base = os.path.dirname(os.path.abspath(manifest))
+    files = []
+    with open(manifest, encoding="utf-8") as r:
+        for line in r:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            files.append(line if os.path.isabs(line) else os.path.join(base, line))
+    return files
+
+
+def output_path_for(input_path: str, input_root: Optional[str], output_dir: str) -> str:
+    """按输入文件的相对路径计算输出 .ics 路径，避免不同子目录下的同名文件互相覆盖"""
+    if input_root:
+        relative = os.path.relpath(input_path, input_root)
+    else:
+        relative = os.path.basename(input_path)
+    return os.path.join(output_dir, os.path.splitext(relative)[0] + ".ics")
+
+
+def convert_one(task: tuple[str, str, dict]) -> dict:
+    """
+    转换单个课表文件（在工作进程中执行）
+    task: (输入路径, 输出路径, 转换选项)，转换选项见 run_batch
+    所有异常都在此处捕获，单个文件失败不影响其他文件
+    开启性能分析时，结果中的 stages 为该文件各阶段的记录，见 profiling
+    结果中的 cache 为所在进程解析缓存和事件渲染缓存的累计命中统计（见 course_parser.cache_stats、event_cache），
+    pid 为进程号
+    开启去重时，结果中的 digest 为课表摘要，rendered 表示本次是否进行了渲染（否则沿用已有的相同日历），见 output_store
+    """
+    input_path, output_path, options = task
+    profiler = previous = None
+    if options.get('profile'):
+        profiler = profiling.Profiler()
+        profiler.start()
+        previous = profiling.activate(profiler)
+    began = time.perf_counter()
+    try:
+        with profiling.stage("convert"):
+            with profiling.stage("parse"):
+                courses = parse_timetable_from_xls(input_path, verbose=False, backend=options['backend'],
+                                                   use_cache=options['use_cache'])
+            if not courses:
+                raise ValueError("未能解析到任何课程信息")
+            digest = None
+            if options['store']:
+                courses = canonical_courses(courses)
+                digest = timetable_digest(courses, SDUST_DURATION, SDUST_TIMETABLE,
+                                          options['start'], options['compact'])
+            school = School(
+                duration=SDUST_DURATION,
+                timetable=list(SDUST_TIMETABLE),
+                start=options['start'],
+                courses=courses,
+                compact=options['compact'],
+                event_cache=shared_cache(),  # 同一班级的学生共用已渲染的事件
+            )
+            events = len(courses) if options['compact'] else sum(len(course.weeks) for course in courses)
+            if options['incremental'] and os.path.exists(output_path):
+                # 增量更新：沿用上一版本的 SEQUENCE，并另存一份只包含变化事件的日历
+                with profiling.stage("generate.changes") as stage:
+                    school.previous = load_event_index(output_path)
+                    school.only_changed = True
+                    with open(changes_path(output_path), "wb") as w:
+                        stage.count(bytes=school.write_to(w))
+                    school.only_changed = False
+            with profiling.stage("generate") as stage:
+                if digest:
+                    store = OutputStore(options['store'])
+                    rendered = store.put(digest, school.write_to)
+                    store.link(digest, output_path)
+                    size = os.path.getsize(output_path)
+                    stage.count(rendered=int(rendered))
+                else:
+                    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+                    if os.path.exists(output_path) and os.stat(output_path).st_nlink > 1:
+                        os.unlink(output_path)  # 之前去重输出的硬链接，直接改写会影响其他学生的日历
+                    with open(output_path, "wb") as w:
+                        size = school.write_to(w)
+                stage.count(bytes=size, courses=len(courses), events=events)
+        result = {
+            'success': True,
+            'input': input_path,
+            'output': output_path,
+            'courses': len(courses),
+            'events': events,
+            'bytes': size,
+            'elapsed': time.perf_counter() - began,
+        }
+        if digest:
+            result.update(digest=digest, rendered=rendered)
+    except Exception as e:
+        result = {
+            'success': False,
+            'input': input_path,
+            'error': f"{type(e).__name__}: {e}",
+            'elapsed': time.perf_counter() - began,
+        }
+    result['pid'] = os.getpid()
+    result['cache'] = {**cache_stats(), 'events': shared_cache().cache_info()}
+    if profiler is not None:
+        profiling.activate(previous)
+        profiler.stop()
+        result['stages'] = profiler.records
+    return result
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """最近秩法计算百分位数"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(len(ordered) * percent / 100))
+    return ordered[rank - 1]
+
+
+def run_batch(inputs: list[str], output_dir: str, start: tuple[int, int, int],
+              jobs: Optional[int] = None, input_root: Optional[str] = None,
+              chunksize: int = 8, backend: str = "auto", use_cache: bool = True,
+              compact: bool = False, incremental: bool = False, profile: bool = False,
+              dedupe: bool = False) -> Iterator[dict]:
+    """
+    并行转换多个课表文件，按输入顺序逐个产出结果字典
+    jobs: 进程数，默认为 CPU 核心数；为 1 时在当前进程内顺序执行
+    backend: Excel 读取后端，见 excel_reader.read_workbook_grid
+    use_cache: 是否使用解析缓存，见 parse_cache
+    compact: 是否使用精简模式（RRULE 重复事件），见 School
+    incremental: 输出文件已存在时按其内容增量更新，见 ics_diff
+    profile: 是否记录各文件的阶段耗时与内存峰值，见 profiling
+    dedupe: 内容相同的日历只渲染一次，输出文件硬链接到输出目录下的存储对象，见 output_store（不能与 incremental 同时使用）
+    """
+    if dedupe and incremental:
+        raise ValueError("去重输出不能与增量更新同时使用")
+    options = {
+        'start': start,
+        'backend': backend,
+        'use_cache': use_cache,
+        'compact': compact,
+        'incremental': incremental,
+        'profile': profile,
+        'store': os.path.join(output_dir, STORE_DIR) if dedupe else None,
+    }
+    tasks = [(path, output_path_for(path, input_root, output_dir), options) for path in inputs]
+    if jobs == 1:
+        yield from map(convert_one, tasks)
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(convert_one, tasks, chunksize=chunksize)
+
+
+def merge_cache_stats(results: list[dict]) -> dict[str, dict]:
+    """
+    汇总各工作进程的解析缓存命中统计：
+    每个结果带有所在进程的累计计数，同一进程取最大值，再对所有进程求和
+    """
+    latest: dict[tuple[int, str], dict] = {}
+    for r in results:
+        for name, info in r.get('cache', {}).items():
+            seen = latest.setdefault((r['pid'], name), {'hits': 0, 'misses': 0})
+            seen['hits'] = max(seen['hits'], info['hits'])
+            seen['misses'] = max(seen['misses'], info['misses'])
+    totals: dict[str, dict] = {}
+    for (_, name), info in latest.items():
+        total = totals.setdefault(name, {'hits': 0, 'misses': 0})
+        total['hits'] += info['hits']
+        total['misses'] += info['misses']
+    for total in totals.values():
+        calls = total['hits'] + total['misses']
+        total['hit_rate'] = total['hits'] / calls if calls else 0.0
+    return totals
+
+
+def summarize(results: list[dict], wall_time: float) -> dict:
+    """汇总吞吐量、单文件耗时、解析缓存命中率与去重比例"""
+    latencies = [r['elapsed'] for r in results]
+    succeeded = [r for r in results if r['success']]
+    digests = [r['digest'] for r in succeeded if 'digest' in r]
+    distinct = len(set(digests))
+    return {
+        'files': len(results),
+        'succeeded': len(succeeded),
+        'failed': len(results) - len(succeeded),
+        'events': sum(r['events'] for r in succeeded),
+        'wall_time': wall_time,
+        'files_per_sec': len(results) / wall_time if wall_time > 0 else 0.0,
+        'p50': percentile(latencies, 50),
+        'p99': percentile(latencies, 99),
+        'cache': merge_cache_stats(results),
+        'dedupe': {
+            'outputs': len(digests),
+            'distinct': distinct,
+            'rendered': sum(r['rendered'] for r in succeeded if 'digest' in r),
+            'ratio': dedupe_ratio(len(digests), distinct),
+        },
+    }
+
+
+def print_summary(summary: dict, failures: list[dict]):
+    """打印批量转换总结"""
+    print("\n" + "="*60)
+    print("📊 批量转换总结")
+    print("="*60)
+    print(f"📁 文件总数：{summary['files']}（成功 {summary['succeeded']}，失败 {summary['failed']}）")
+    print(f"📅 日历事件：{summary['events']}")
+    print(f"⏱️  总耗时：{summary['wall_time']:.2f} 秒")
+    print(f"🚀 吞吐量：{summary['files_per_sec']:.1f} 文件/秒")
+    print(f"⏳ 单文件耗时：p50 {summary['p50'] * 1000:.1f} ms，p99 {summary['p99'] * 1000:.1f} ms")
+    cells = summary['cache'].get('parse_course_info')
+    if cells and cells['hits'] + cells['misses']:
+        print(f"🧠 单元格解析缓存：命中 {cells['hits']}，未命中 {cells['misses']}（命中率 {cells['hit_rate']:.1%}）")
+    events = summary['cache'].get('events')
+    if events and events['hits'] + events['misses']:
+        print(f"🧩 事件渲染缓存：命中 {events['hits']}，未命中 {events['misses']}（命中率 {events['hit_rate']:.1%}）")
+    dedupe = summary['dedupe']
+    if dedupe['outputs']:
+        print(f"🗜️  去重：{dedupe['outputs']} 个日历只有 {dedupe['distinct']} 种不同内容（去重比例 {dedupe['ratio']:.1%}），"
+              f"本次渲染 {dedupe['rendered']} 个")
+    if failures:
+        print("\n❌ 失败的文件：")
+        for r in failures:
+            print(f"   - {r['input']}：{r['error']}")
+    print("="*60)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="批量将课表 Excel 文件转换为 .ics 日历文件",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+使用示例：
+  python batch.py exports/ -s 2025-09-01              # 转换 exports 目录下所有课表
+  python batch.py exports/ -s 2025-09-01 -o ics/ -j 8 # 指定输出目录和进程数
+  python batch.py -m list.txt -s 2025-09-01           # 按清单文件转换
+        """
+    )
+
+    parser.add_argument('input', nargs='?', help='课表 Excel 文件所在目录（递归查找）')
+    parser.add_argument('-m', '--manifest', help='清单文件，每行一个 Excel 文件路径')
+    parser.add_argument('-s', '--start', required=True, help='开学日期，如 2025-09-01')
+    parser.add_argument('-o', '--output', default='ics_output', help='输出目录 (默认: ics_output)')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='并行进程数 (默认: CPU 核心数)')
+    parser.add_argument('--backend', choices=BACKENDS, default='auto', help='Excel 读取后端 (默认: auto)')
+    parser.add_argument('--no-cache', action='store_true', help='不使用解析缓存，强制重新解析所有文件')
+    parser.add_argument('--compact', action='store_true', help='精简模式：每个课程时间段只生成一个重复事件')
+    parser.add_argument('--incremental', action='store_true',
+                        help='增量更新：沿用已有输出文件中事件的 SEQUENCE，并生成只含变化事件的 .changes.ics')
+    parser.add_argument('--dedupe', action='store_true',
+                        help=f'内容相同的日历只渲染一次，输出文件硬链接到 {STORE_DIR} 目录，并写出 {MANIFEST_NAME}')
+    parser.add_argument('--chunksize', type=int, default=8, help='每次分发给工作进程的文件数 (默认: 8)')
+    parser.add_argument('--profile', nargs='?', const=profiling.DEFAULT_REPORT, metavar='REPORT',
+                        help=f'记录各阶段耗时与内存峰值并写出 JSON 报告（默认: {profiling.DEFAULT_REPORT}）')
+    parser.add_argument('--profiler', choices=profiling.HOOKS,
+                        help='同时使用 cProfile 或 pyinstrument 分析当前进程（配合 -j 1 使用）')
+
+    args = parser.parse_args()
+
+    if not args.input and not args.manifest:
+        parser.error("请指定输入目录或清单文件")
+    if args.dedupe and args.incremental:
+        parser.error("--dedupe 不能与 --incremental 同时使用")
+
+    try:
+        start = parse_start_date(args.start)
+    except ValueError:
+        print("❌ 日期格式错误，请使用正确格式（如：2025-09-01）")
+        return 1
+
+    if args.manifest:
+        inputs = read_manifest(args.manifest)
+        input_root = None
+    else:
+        inputs = find_inputs(args.input)
+        input_root = args.input
+
+    if not inputs:
+        print("❌ 错误：未找到任何 Excel 课表文件")
+        return 1
+
+    print(f"📋 共 {len(inputs)} 个课表文件，输出到 {args.output}")
+
+    profile_session = profiling.session_from(args.profile, args.profiler)
+    if profile_session:
+        if profile_session.hook and args.jobs != 1:
+            print(f"⚠️  {profile_session.hook} 只分析当前进程，要分析转换过程请使用 -j 1")
+        profile_session.start()
+
+    results = []
+    failures = []
+    began = time.perf_counter()
+    for result in run_batch(inputs, args.output, start, args.jobs, input_root,
+                            args.chunksize, args.backend, not args.no_cache, args.compact,
+                            args.incremental, profile_session is not None, args.dedupe):
+        if profile_session:
+            profile_session.add_records(result.pop('stages', []))
+        results.append(result)
+        if not result['success']:
+            failures.append(result)
+        if len(results) % 100 == 0:
+            print(f"   已完成 {len(results)}/{len(inputs)}")
+    summary = summarize(results, time.perf_counter() - began)
+    if args.dedupe:
+        write_manifest(os.path.join(args.output, MANIFEST_NAME),
+                       {os.path.relpath(r['output'], args.output).replace(os.sep, "/"): r['digest']
+                        for r in results if r['success']})
+
+    print_summary(summary, failures)
+    if profile_session:
+        profile_session.finish(batch=summary)
+    return 0 if not failures else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
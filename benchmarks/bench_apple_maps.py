@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Apple Maps 地点表加载基准测试
+对比首次流式解析日历与从地点索引缓存读取的耗时
+
+使用方式：python benchmarks/bench_apple_maps.py [地点日历.ics] [--count 3000]   # 不指定文件时生成合成日历
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import parse_cache
+from data import AppleMaps
+from ics_fold import fold_line
+
+
+def synthetic_calendar(path: str, count: int):
+    """生成合成的 Apple Maps 导出日历：count 个地点，长行按 75 字节折叠"""
+    with open(path, "w", encoding="utf-8") as w:
+        w.write("BEGIN:VCALENDAR\nVERSION:2.0\n")
+        for n in range(count):
+            title = f"山东科技大学J{n}号楼"
+            for line in ("BEGIN:VEVENT", "DTSTART:20250901T080000", f"SUMMARY:{title}",
+                         f"LOCATION:{title}\\n山东省青岛市黄岛区前湾港路579号",
+                         f"X-APPLE-STRUCTURED-LOCATION;VALUE=URI;X-ADDRESS=山东省青岛市黄岛区前湾港路579号;"
+                         f"X-APPLE-RADIUS=70.58;X-TITLE={title}:geo:35.99{n:04d},120.12{n:04d}",
+                         "END:VEVENT"):
+                w.write("\n".join(fold_line(line)) + "\n")
+        w.write("END:VCALENDAR\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apple Maps 地点表加载基准测试")
+    parser.add_argument('calendar', nargs='?', help='Apple Maps 导出的日历文件')
+    parser.add_argument('--count', type=int, default=3000, help='合成日历的地点数 (默认: 3000)')
+    parser.add_argument('--rounds', type=int, default=5, help='缓存读取重复次数 (默认: 5)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        parse_cache.CACHE_DIR = tmp
+        calendar = args.calendar
+        if calendar is None:
+            calendar = os.path.join(tmp, "maps.ics")
+            synthetic_calendar(calendar, args.count)
+
+        began = time.perf_counter()
+        AppleMaps(calendar, use_cache=False)
+        parse_time = time.perf_counter() - began
+
+        AppleMaps(calendar)  # 写入索引
+        cached = []
+        for _ in range(args.rounds):
+            began = time.perf_counter()
+            maps = AppleMaps(calendar)
+            cached.append(time.perf_counter() - began)
+
+    print(f"📋 {len(maps.locations)} 个地点，日历 {os.path.basename(calendar)}")
+    print(f"   流式解析：{parse_time * 1000:8.1f} ms")
+    print(f"   索引读取：{min(cached) * 1000:8.1f} ms（{args.rounds} 次中最快）")
+
+
+if __name__ == "__main__":
+    main()
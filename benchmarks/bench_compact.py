@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+精简模式（RRULE 重复事件）基准测试
+在合成课表上对比逐周事件与重复事件两种输出的文件大小、事件数、生成耗时，
+以及按行展开并逐个读取事件的耗时（近似日历客户端导入时的解析开销）
+
+使用方式：python benchmarks/bench_compact.py [课表1.xls ...] [--seeds 20]   # 不指定文件时使用合成课表
+"""
+
+import argparse
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from course_parser import SDUST_DURATION, SDUST_TIMETABLE, parse_timetable_from_xls, parse_weeks
+from data import Course, School
+
+WEEK_EXPRESSIONS = ["1-16[周]", "1-11,13-14[周]", "2-16[双周]", "1-15[单周]", "9-16[周]", "1-8[周]"]
+
+
+def synthetic_courses(count: int = 25, seed: int = 0) -> list[Course]:
+    """生成合成课表：count 个课程时间段，周次取自常见的周次表达式"""
+    rng = random.Random(seed)
+    return [Course(
+        name=f"课程{n % 12}",
+        teacher=f"教师{n % 12}",
+        classroom=f"J{n % 9 + 1}-{100 + n}室",
+        location=f"山东科技大学J{n % 9 + 1}",
+        weekday=rng.randrange(1, 6),
+        weeks=parse_weeks(rng.choice(WEEK_EXPRESSIONS)),
+        indexes=rng.choice([(1, 2), (3, 4), (5, 6), (7, 8), (9, 10)]),
+    ) for n in range(count)]
+
+
+def render(courses: list[Course], compact: bool) -> tuple[bytes, float]:
+    """生成日历，返回 (编码后的内容, 耗时)"""
+    school = School(duration=SDUST_DURATION, timetable=list(SDUST_TIMETABLE), start=(2025, 9, 1),
+                    courses=courses, compact=compact)
+    began = time.perf_counter()
+    out = io.BytesIO()
+    school.write_to(out)
+    return out.getvalue(), time.perf_counter() - began
+
+
+def import_time(content: bytes) -> tuple[int, float]:
+    """展开折叠行并逐个收集事件属性，返回 (事件数, 耗时)"""
+    began = time.perf_counter()
+    events = []
+    current = None
+    for line in content.decode("utf-8").replace("\n ", "").split("\n"):
+        if line == "BEGIN:VEVENT":
+            current = {}
+        elif line == "END:VEVENT":
+            events.append(current)
+            current = None
+        elif current is not None:
+            name, _, value = line.partition(":")
+            current[name] = value
+    return len(events), time.perf_counter() - began
+
+
+def main():
+    parser = argparse.ArgumentParser(description="精简模式（RRULE 重复事件）基准测试")
+    parser.add_argument('files', nargs='*', help='课表 Excel 文件，不指定时使用合成课表')
+    parser.add_argument('--seeds', type=int, default=20, help='合成课表数量 (默认: 20)')
+    args = parser.parse_args()
+
+    missing = [path for path in args.files if not os.path.isfile(path)]
+    if missing:
+        parser.error(f"文件不存在：{', '.join(missing)}")
+    if args.files:
+        timetables = [parse_timetable_from_xls(path, verbose=False) for path in args.files]
+    else:
+        timetables = [synthetic_courses(seed=seed) for seed in range(args.seeds)]
+
+    totals = {}
+    for compact in (False, True):
+        size = events = render_time = parse_time = 0
+        for courses in timetables:
+            content, elapsed = render(courses, compact)
+            count, parsed = import_time(content)
+            size += len(content)
+            events += count
+            render_time += elapsed
+            parse_time += parsed
+        totals[compact] = (size, events, render_time, parse_time)
+
+    print(f"📋 共 {len(timetables)} 份课表")
+    for compact, label in ((False, "逐周事件"), (True, "重复事件")):
+        size, events, render_time, parse_time = totals[compact]
+        print(f"   {label}：{size / 1024:8.1f} KB，{events:5d} 个事件，"
+              f"生成 {render_time * 1000:7.1f} ms，读取 {parse_time * 1000:7.1f} ms")
+    (size, events, _, parse_time), (compact_size, compact_events, _, compact_parse) = totals[False], totals[True]
+    print(f"📉 文件大小减少 {(1 - compact_size / size) * 100:.1f}%，"
+          f"事件数减少 {(1 - compact_events / events) * 100:.1f}%，"
+          f"读取耗时减少 {(1 - compact_parse / parse_time) * 100:.1f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
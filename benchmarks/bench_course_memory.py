@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Course 内存占用基准测试
+模拟同一班级大量学生的课表常驻内存，使用 tracemalloc 统计每个 Course 实例平均占用的字节数：
+旧版为带 __dict__ 的普通 dataclass，字符串和周次列表每个实例各持一份；
+新版为 slots 不可变 dataclass，字符串经共享字符串池去重，周次为共享的 WeekSet
+
+使用方式：python benchmarks/bench_course_memory.py [--students 2000]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from course_parser import extract_courses_from_grid, merge_duplicate_courses
+
+# 同一班级学生导出的课表单元格文本完全相同
+CELLS = [
+    "高等数学（A）（2-1）\n张三(教授)\n1-16[周]\nJ7-106室",
+    "大学英语（A）\n李四(副教授)\n1-15[单周]\nJs1-305室",
+    "电路（2）\n王五(讲师)\n2-16[双周]\n品学楼B107",
+    "线性代数\n赵六(教授)\n1-11,13-14[周]\nJ3-201室",
+    "程序设计基础(C语言)\n孙七(讲师)\n9-16[周]\n实训6层-610室",
+]
+WEEKDAYS = ["星期一", "星期二", "星期三", "星期四", "星期五", "星期六", "星期日"]
+SLOTS = ["第一大节", "第二大节", "第三大节", "第四大节", "第五大节"]
+
+
+@dataclass
+class LegacyCourse:
+    """旧版 Course：普通 dataclass，周次与节次为列表"""
+    name: str
+    teacher: str
+    classroom: str
+    location: Any
+    weekday: int
+    weeks: list[int]
+    indexes: list[int]
+
+
+def student_grid(seed: int) -> list[list[str]]:
+    """生成一名学生的课表表格；每次都复制单元格文本，模拟从不同文件读取"""
+    grid = [["课表"], [""] + WEEKDAYS]
+    for row, slot in enumerate(SLOTS):
+        cells = ["".join(list(CELLS[(row + col) % len(CELLS)])) if (row + col) % 3 else ""
+                 for col in range(7)]
+        grid.append(["".join(list(slot))] + cells)
+    return grid
+
+
+def legacy_courses(grid: list[list[str]]) -> list[LegacyCourse]:
+    """按旧版方式构造课程：每个实例持有各自的字符串副本与列表"""
+    copy = lambda text: "".join(list(text))
+    return [LegacyCourse(copy(c.name), copy(c.teacher), copy(c.classroom), copy(c.location),
+                         c.weekday, list(c.weeks), list(c.indexes))
+            for c in merge_duplicate_courses(extract_courses_from_grid(grid))]
+
+
+def measure(build, students: int) -> tuple[int, int]:
+    """构造所有学生的课程并常驻内存，返回 (课程实例数, 占用字节数)"""
+    grids = [student_grid(i) for i in range(students)]
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    resident = [build(grid) for grid in grids]
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    count = sum(len(courses) for courses in resident)
+    return count, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Course 内存占用基准测试")
+    parser.add_argument('--students', type=int, default=2000, help='模拟学生数 (默认: 2000)')
+    args = parser.parse_args()
+    students = args.students
+
+    # 预热解析缓存，使两种方式的比较只反映 Course 实例本身的开销
+    merge_duplicate_courses(extract_courses_from_grid(student_grid(0)))
+
+    legacy_count, legacy_size = measure(legacy_courses, students)
+    count, size = measure(lambda grid: merge_duplicate_courses(extract_courses_from_grid(grid)), students)
+
+    print(f"👥 模拟学生数：{students}，课程时间段：{count}")
+    print(f"🐢 旧版 Course：{legacy_size / legacy_count:8.1f} 字节/实例")
+    print(f"🚀 新版 Course：{size / count:8.1f} 字节/实例")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Excel 读取后端基准测试
+对比 pandas 与 xlrd/openpyxl 直读两种路径的模块导入耗时和单文件解析耗时
+
+使用方式：python benchmarks/bench_excel_reader.py 课表1.xls 课表2.xlsx ... [--rounds 5]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from course_parser import parse_timetable_from_xls
+
+
+def import_time(module: str) -> float:
+    """在全新的解释器中测量导入某个模块的耗时（秒）"""
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    output = subprocess.check_output([sys.executable, "-c", code], cwd=ROOT)
+    return float(output)
+
+
+def parse_time(files: list[str], backend: str, rounds: int = 5) -> float:
+    """多轮解析全部文件，返回单文件平均耗时（秒）"""
+    began = time.perf_counter()
+    for _ in range(rounds):
+        for file_path in files:
+            parse_timetable_from_xls(file_path, verbose=False, backend=backend)
+    return (time.perf_counter() - began) / (rounds * len(files))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Excel 读取后端基准测试")
+    parser.add_argument('files', nargs='+', help='课表 Excel 文件')
+    parser.add_argument('--rounds', type=int, default=5, help='重复解析轮数 (默认: 5)')
+    args = parser.parse_args()
+
+    missing = [path for path in args.files if not os.path.isfile(path)]
+    if missing:
+        parser.error(f"文件不存在：{', '.join(missing)}")
+
+    print("📦 模块导入耗时：")
+    for module in ("pandas", "xlrd", "openpyxl"):
+        try:
+            print(f"   {module:<10} {import_time(module) * 1000:8.1f} ms")
+        except subprocess.CalledProcessError:
+            print(f"   {module:<10} 未安装")
+
+    print("📄 单文件解析耗时：")
+    for backend in ("pandas", "auto"):
+        print(f"   {backend:<10} {parse_time(args.files, backend, args.rounds) * 1000:8.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+课表单元格提取基准测试
+在数千个合成课表上对比逐行逐列提取（每个单元格重新查找星期和大节）与
+一次性确定星期列、大节行并批量解析单元格的耗时，并测量完整解析 Excel 文件的单文件耗时
+
+使用方式：python benchmarks/bench_extract.py [--grids 5000] [--files 1000] [--format xlsx]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from batch import percentile
+from course_parser import (extract_courses_from_grid, find_weekday_header, parse_course_info,
+                           parse_timetable_from_xls)
+from synthetic import generate_exports, synthetic_grid
+
+
+def legacy_time_slot_to_index(slot_name):
+    slot_mapping = {'第一大节': (1, 2), '第二大节': (3, 4), '第三大节': (5, 6), '第四大节': (7, 8), '第五大节': (9, 10)}
+    return slot_mapping.get(slot_name, ())
+
+
+def legacy_weekday_name_to_number(weekday_name):
+    weekday_mapping = {'星期一': 1, '星期二': 2, '星期三': 3, '星期四': 4, '星期五': 5, '星期六': 6, '星期日': 7}
+    return weekday_mapping.get(weekday_name, 0)
+
+
+def legacy_extract(grid):
+    """改写前的实现：逐行逐列访问单元格，每个单元格都重新查找大节和星期"""
+    courses = []
+    header_row, weekdays = find_weekday_header(grid)
+    for row in grid[header_row + 1:] if weekdays else []:
+        time_slot = row[0] if row else ""
+        if '第' not in time_slot:
+            continue
+        time_indexes = legacy_time_slot_to_index(time_slot)
+        if not time_indexes:
+            continue
+        for col_idx, weekday_name in weekdays:
+            if col_idx >= len(row):
+                continue
+            cell_content = row[col_idx]
+            if not cell_content:
+                continue
+            weekday_num = legacy_weekday_name_to_number(weekday_name)
+            if weekday_num == 0:
+                continue
+            for course_info in parse_course_info(cell_content):
+                courses.append({
+                    'name': course_info.name,
+                    'teacher': course_info.teacher,
+                    'classroom': course_info.classroom,
+                    'weekday': weekday_num,
+                    'weeks': course_info.weeks,
+                    'indexes': time_indexes,
+                })
+    return courses
+
+
+def best_of(func, rounds: int) -> float:
+    func()  # 预热
+    samples = []
+    for _ in range(rounds):
+        began = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - began)
+    return min(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="课表单元格提取基准测试")
+    parser.add_argument('--grids', type=int, default=5000, help='合成课表表格数量 (默认: 5000)')
+    parser.add_argument('--files', type=int, default=1000, help='完整解析的 Excel 文件数量，0 表示跳过 (默认: 1000)')
+    parser.add_argument('--format', choices=['xls', 'xlsx'], default='xlsx', help='Excel 文件格式 (默认: xlsx)')
+    parser.add_argument('--rounds', type=int, default=3, help='重复次数 (默认: 3)')
+    args = parser.parse_args()
+
+    grids = [synthetic_grid(seed=seed, weekend=seed % 4 == 0) for seed in range(args.grids)]
+    mismatched = sum(legacy_extract(grid) != extract_courses_from_grid(grid) for grid in grids)
+
+    legacy = best_of(lambda: [legacy_extract(grid) for grid in grids], args.rounds)
+    batched = best_of(lambda: [extract_courses_from_grid(grid) for grid in grids], args.rounds)
+
+    print(f"⏱️  单元格提取（{args.grids} 个课表）：")
+    print(f"   逐格提取：{legacy / args.grids * 1e6:8.1f} µs/个")
+    print(f"   批量提取：{batched / args.grids * 1e6:8.1f} µs/个   ×{legacy / batched:.2f}")
+    print(f"   结果{'一致' if not mismatched else f'不一致：{mismatched} 个课表'}")
+
+    if args.files:
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = generate_exports(tmp, args.files, class_size=1, fmt=args.format)
+            latencies = []
+            began = time.perf_counter()
+            for path in paths:
+                started = time.perf_counter()
+                parse_timetable_from_xls(path, verbose=False, use_cache=False)
+                latencies.append(time.perf_counter() - started)
+            total = time.perf_counter() - began
+        print(f"\n⏱️  完整解析（{args.files} 个 .{args.format} 文件，不使用缓存）：")
+        print(f"   总耗时 {total:.2f} 秒，{args.files / total:.1f} 文件/秒")
+        print(f"   单文件耗时：p50 {percentile(latencies, 50) * 1000:.2f} ms，"
+              f"p99 {percentile(latencies, 99) * 1000:.2f} ms")
+    return 1 if mismatched else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
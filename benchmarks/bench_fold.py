@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+行折叠微基准测试
+对比旧版按 72 个字符切片的折叠循环与 ics_fold 按字节折叠（fold_line / FoldingWriter）
+得到整份 UTF-8 编码日历的耗时，并统计各方式产出的超过 75 字节的物理行数
+"""
+
+import io
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ics_fold import FOLD_LIMIT, FoldingWriter, fold_line
+
+# 典型的日历内容行：短的 ASCII 行与较长的中文 SUMMARY/DESCRIPTION 行
+LINES = [
+    "BEGIN:VEVENT",
+    "SUMMARY:高等数学 - J7-106室",
+    "DESCRIPTION:任课教师：张三\\n本周周次：第3周\\n课程进度：第5次课，共32次课，剩27次课"
+    "\\n本周进度：第1次课，共2次课，剩1次课\\n下次上课：2025/09/18(本周四)",
+    "DTSTART;TZID=Asia/Shanghai:20250915T080000",
+    "DTEND;TZID=Asia/Shanghai:20250915T095000",
+    "UID:5ad609c89952ac417f408a14e65d24b9",
+    "LOCATION:山东科技大学J7",
+    "END:VEVENT",
+] * 500
+
+
+def legacy_fold(lines: list[str]) -> list[str]:
+    """旧版：按字符切片，每次迭代复制剩余内容"""
+    texts = []
+    for line in lines:
+        first = True
+        while line:
+            texts.append((" " if not first else "") + line[:72])
+            line = line[72:]
+            first = False
+    return texts
+
+
+def byte_fold(lines: list[str]) -> list[str]:
+    """新版：按字节折叠为字符串行"""
+    texts = []
+    for line in lines:
+        texts.extend(fold_line(line))
+    return texts
+
+
+def writer_fold(lines: list[str]) -> bytes:
+    """新版：直接折叠进预分配缓冲区并写入流"""
+    out = io.BytesIO()
+    writer = FoldingWriter(out)
+    writer.write_lines(lines)
+    writer.flush()
+    return out.getvalue()
+
+
+def oversized(physical_lines: list[str]) -> int:
+    return sum(1 for line in physical_lines if len(line.encode("utf-8")) > FOLD_LIMIT)
+
+
+def main():
+    rounds = 50
+    cases = [
+        ("旧版 72 字符切片", lambda: "\n".join(legacy_fold(LINES)).encode("utf-8"), lambda: legacy_fold(LINES)),
+        ("fold_line 字节折叠", lambda: "\n".join(byte_fold(LINES)).encode("utf-8"), lambda: byte_fold(LINES)),
+        ("FoldingWriter 写入流", lambda: writer_fold(LINES),
+         lambda: writer_fold(LINES).decode("utf-8").split("\n")),
+    ]
+    print(f"📋 {len(LINES)} 个内容行，重复 {rounds} 次")
+    for name, run, physical in cases:
+        seconds = min(timeit.repeat(run, number=rounds, repeat=3)) / rounds
+        print(f"   {name:<20} {seconds * 1000:7.2f} ms/次   超过 {FOLD_LIMIT} 字节的行：{oversized(physical())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+课程进度计算基准测试
+在合成的 30 门课程、20 周课表上对比旧版逐次排序扫描与新版有序索引二分查找的耗时
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data import Course, School, Weeks
+
+WEEKDAY_NAMES = {1: '周一', 2: '周二', 3: '周三', 4: '周四', 5: '周五', 6: '周六', 7: '周日'}
+
+
+def build_school(course_count: int = 30, weeks: int = 20, slots_per_course: int = 3, seed: int = 0) -> School:
+    """生成合成课表：每门课程在一周内有若干个时间段，全部覆盖 1..weeks 周"""
+    rng = random.Random(seed)
+    courses = []
+    for n in range(course_count):
+        for _ in range(slots_per_course):
+            start = rng.randrange(1, 9) * 2 - 1
+            courses.append(Course(
+                name=f"课程{n}",
+                teacher=f"教师{n}",
+                classroom=f"J{n % 9 + 1}-{100 + n}室",
+                location="",
+                weekday=rng.randrange(1, 6),
+                weeks=Weeks(1, weeks),
+                indexes=[start, start + 1],
+            ))
+    return School(duration=110, timetable=[(8, 0)] * 10, start=(2025, 9, 1), courses=courses)
+
+
+def legacy_progress(school: School, course: Course, current_week: int, stats: dict) -> dict:
+    """旧版实现：每次课都重建并排序全部上课事件，再线性扫描三次"""
+    all_course_events = []
+    for schedule in stats.get('schedules', []):
+        for week in schedule['weeks']:
+            all_course_events.append((week, schedule['weekday']))
+    all_course_events.sort()
+    total_classes = len(all_course_events)
+
+    current_class_num = 0
+    for week, weekday in all_course_events:
+        if week < current_week or (week == current_week and weekday <= course.weekday):
+            current_class_num += 1
+        else:
+            break
+
+    this_week_events = [(week, weekday) for week, weekday in all_course_events if week == current_week]
+    week_total = len(this_week_events)
+    week_current = sum(1 for _, weekday in this_week_events if weekday <= course.weekday)
+    if week_total == 0:
+        week_total = 1
+        week_current = 0
+
+    next_event = None
+    for week, weekday in all_course_events:
+        if week > current_week or (week == current_week and weekday > course.weekday):
+            next_event = (week, weekday)
+            break
+
+    next_class_date = next_class_info = ""
+    if next_event:
+        next_week, next_weekday = next_event
+        weekday_name = WEEKDAY_NAMES.get(next_weekday, f"周{next_weekday}")
+        next_class_date = school.time(next_week, next_weekday, 1).strftime("%Y/%m/%d")
+        weeks_diff = next_week - current_week
+        if weeks_diff == 0:
+            next_class_info = f"本{weekday_name}"
+        elif weeks_diff == 1:
+            next_class_info = f"下{weekday_name}"
+        elif weeks_diff <= 4:
+            next_class_info = f"{weeks_diff}周后{weekday_name}"
+        else:
+            next_class_info = f"第{next_week}周{weekday_name}"
+
+    return {
+        'current_class_num': current_class_num,
+        'total_classes': total_classes,
+        'week_current_class': week_current,
+        'week_total_classes': week_total,
+        'next_class_info': next_class_info,
+        'next_class_date': next_class_date
+    }
+
+
+def run(school: School, progress) -> tuple[float, list[dict]]:
+    """计算课表中每次课的进度，返回耗时与全部结果"""
+    began = time.perf_counter()
+    course_stats = school._calculate_course_stats()
+    results = []
+    for course in school.courses:
+        stats = course_stats[(course.name, course.teacher)]
+        for week in course.weeks:
+            results.append(progress(course, week, stats))
+    return time.perf_counter() - began, results
+
+
+def main():
+    school = build_school()
+    events = sum(len(course.weeks) for course in school.courses)
+    print(f"📋 合成课表：{len(school.courses)} 个时间段，{events} 次课")
+
+    legacy_time, legacy_results = run(school, lambda c, w, s: legacy_progress(school, c, w, s))
+    indexed_time, indexed_results = run(
+        school, lambda c, w, s: school._calculate_class_progress(c, w, s, WEEKDAY_NAMES))
+
+    assert legacy_results == indexed_results, "新旧实现的进度结果不一致"
+
+    print(f"🐢 旧版（逐次排序扫描）：{legacy_time * 1000:.1f} ms")
+    print(f"🚀 新版（有序索引二分）：{indexed_time * 1000:.1f} ms")
+    print(f"📈 加速比：{legacy_time / indexed_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+课表订阅服务压力测试
+模拟大量手机日历同时轮询订阅地址：每个客户端使用一个长连接连续请求若干次，
+首次请求完整下载，之后携带 If-None-Match（与日历应用的轮询方式相同），
+统计吞吐量、延迟分位数、状态码分布和传输字节数
+
+使用方式：
+python benchmarks/bench_serve.py exports/ -s 2025-09-01 -c 1000 -n 20   # 在子进程中启动服务后压测
+python benchmarks/bench_serve.py --url http://127.0.0.1:8080/a.ics -c 1000  # 压测已运行的服务
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import sys
+import time
+from collections import Counter
+from typing import Optional
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch import find_inputs, percentile
+from convert import parse_start_date
+from serve import SubscriptionServer
+
+
+def run_server(root: str, start: tuple[int, int, int], port: int, compact: bool):
+    """在子进程中运行订阅服务"""
+    server = SubscriptionServer(root, start, compact=compact)
+    asyncio.run(server.serve("127.0.0.1", port))
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def wait_for_port(host: str, port: int, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.05)
+
+
+async def request(reader, writer, host: str, path: str, gzip: bool, etag: Optional[str]):
+    """发送一个 GET 请求并读取完整响应，返回 (状态码, ETag, 响应体字节数)"""
+    lines = [f"GET {path} HTTP/1.1", f"Host: {host}"]
+    if gzip:
+        lines.append("Accept-Encoding: gzip")
+    if etag:
+        lines.append(f"If-None-Match: {etag}")
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+    await writer.drain()
+
+    head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+    status = int(head[0].split(" ")[1])
+    headers = {}
+    for line in head[1:]:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0))
+    if length:
+        await reader.readexactly(length)
+    return status, headers.get("etag"), length
+
+
+async def client(host: str, port: int, paths: list[str], offset: int, count: int, gzip: bool,
+                 conditional: bool, latencies: list[float], statuses: Counter, transferred: list[int]):
+    """一个客户端：一个长连接上依次请求 count 次，轮流订阅不同的课表"""
+    reader, writer = await asyncio.open_connection(host, port)
+    etags = {}
+    try:
+        for n in range(count):
+            path = paths[(offset + n) % len(paths)]
+            began = time.perf_counter()
+            status, etag, length = await request(reader, writer, host, path, gzip,
+                                                 etags.get(path) if conditional else None)
+            latencies.append(time.perf_counter() - began)
+            statuses[status] += 1
+            transferred[0] += length
+            if etag:
+                etags[path] = etag
+    finally:
+        writer.close()
+
+
+async def load_test(host: str, port: int, paths: list[str], clients: int, requests: int,
+                    gzip: bool, conditional: bool) -> dict:
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+    transferred = [0]
+    began = time.perf_counter()
+    results = await asyncio.gather(*(client(host, port, paths, i, requests, gzip, conditional,
+                                            latencies, statuses, transferred)
+                                     for i in range(clients)), return_exceptions=True)
+    wall_time = time.perf_counter() - began
+    errors = [r for r in results if isinstance(r, BaseException)]
+    return {
+        'clients': clients,
+        'requests': len(latencies),
+        'errors': len(errors),
+        'wall_time': wall_time,
+        'requests_per_sec': len(latencies) / wall_time if wall_time > 0 else 0.0,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'statuses': {str(status): count for status, count in sorted(statuses.items())},
+        'bytes': transferred[0],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="课表订阅服务压力测试")
+    parser.add_argument('input', nargs='?', help='课表 Excel 文件所在目录（在子进程中启动服务）')
+    parser.add_argument('-s', '--start', default='2025-09-01', help='开学日期 (默认: 2025-09-01)')
+    parser.add_argument('--url', help='压测已运行的服务，如 http://127.0.0.1:8080/a.ics')
+    parser.add_argument('-c', '--clients', type=int, default=200, help='并发客户端数 (默认: 200)')
+    parser.add_argument('-n', '--requests', type=int, default=10, help='每个客户端的请求数 (默认: 10)')
+    parser.add_argument('--compact', action='store_true', help='服务使用精简模式')
+    parser.add_argument('--no-gzip', action='store_true', help='不请求 gzip 压缩')
+    parser.add_argument('--no-etag', action='store_true', help='不携带 If-None-Match，每次都完整下载')
+    parser.add_argument('--json', action='store_true', help='以 JSON 输出结果')
+    args = parser.parse_args()
+
+    process = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port, paths = url.hostname, url.port or 80, [url.path]
+    elif args.input:
+        inputs = find_inputs(args.input)
+        if not inputs:
+            print("❌ 错误：未找到任何 Excel 课表文件")
+            return 1
+        host, port = "127.0.0.1", free_port()
+        paths = [SubscriptionServer(args.input, (2025, 9, 1)).subscription_path(path) for path in inputs]
+        process = multiprocessing.Process(target=run_server, daemon=True,
+                                          args=(args.input, parse_start_date(args.start), port, args.compact))
+        process.start()
+    else:
+        parser.error("请指定课表目录或 --url")
+
+    try:
+        asyncio.run(wait_for_port(host, port))
+        result = asyncio.run(load_test(host, port, paths, args.clients, args.requests,
+                                       not args.no_gzip, not args.no_etag))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.join()
+
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+        return 0
+
+    print(f"📋 {result['clients']} 个并发客户端，共 {result['requests']} 个请求（失败连接 {result['errors']}）")
+    print(f"🚀 吞吐量：{result['requests_per_sec']:.0f} 请求/秒，总耗时 {result['wall_time']:.2f} 秒")
+    print(f"⏳ 延迟：p50 {result['p50_ms']:.1f} ms，p99 {result['p99_ms']:.1f} ms")
+    print(f"📊 状态码：{result['statuses']}，传输 {result['bytes'] / 1024:.1f} KB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+启动耗时基准测试
+1. 使用 python -X importtime 统计各模块的累计导入耗时及最慢的依赖
+2. 测量 main.py 从启动到出现第一个输入提示的耗时（time-to-first-prompt）
+
+使用方式：
+  python benchmarks/bench_startup.py                       # 打印报告
+  python benchmarks/bench_startup.py --xls 课表.xls        # 额外测量解析课表后到开学日期提示的耗时
+  python benchmarks/bench_startup.py --json startup.json   # 同时写出 JSON 结果，便于跨版本对比
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = ["data", "course_parser", "excel_reader", "upload_and_qr", "xlrd", "openpyxl", "pandas", "requests", "qrcode"]
+
+
+def import_profile(module: str) -> dict:
+    """
+    在全新解释器中以 -X importtime 导入模块，
+    返回累计耗时（毫秒）和累计耗时最长的若干依赖
+    """
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        return {'module': module, 'available': False}
+
+    entries = []
+    for line in proc.stderr.splitlines():
+        # 格式：import time: self [us] | cumulative | imported package（包名按嵌套层级缩进）
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, raw_name = line.rsplit("|", 2)
+        name = raw_name.strip()
+        depth = (len(raw_name) - len(raw_name.lstrip()) - 1) // 2
+        entries.append((name, depth, int(cumulative_us)))
+
+    # 目标模块位于最后一个顶层条目，其前方缩进一级的条目即为它直接导入的依赖
+    total = 0
+    children = []
+    for index in range(len(entries) - 1, -1, -1):
+        if entries[index][0] == module and entries[index][1] == 0:
+            total = entries[index][2]
+            for name, depth, us in reversed(entries[:index]):
+                if depth == 0:
+                    break
+                if depth == 1:
+                    children.append((name, us))
+            break
+    top = sorted(children, key=lambda item: item[1], reverse=True)[:5]
+    return {
+        'module': module,
+        'available': True,
+        'cumulative_ms': total / 1000,
+        'top_ms': [(name, us / 1000) for name, us in top],
+    }
+
+
+def time_to_prompt(workdir: str, marker: str, args: tuple[str, ...] = (), timeout: float = 60) -> float:
+    """运行 main.py，返回从启动到标准输出中出现 marker 的耗时（秒）"""
+    began = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-u", os.path.join(ROOT, "main.py"), *args],
+                            cwd=workdir, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                            stderr=subprocess.DEVNULL)
+    try:
+        output = b""
+        needle = marker.encode()
+        while needle not in output:
+            chunk = proc.stdout.read1(4096)
+            if not chunk:
+                raise RuntimeError(f"main.py 已退出，未出现提示：{marker}")
+            output += chunk
+            if time.perf_counter() - began > timeout:
+                raise TimeoutError(f"等待提示超时：{marker}")
+        return time.perf_counter() - began
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="启动耗时基准测试")
+    parser.add_argument('--xls', help='用于测量解析阶段的课表 Excel 文件')
+    parser.add_argument('--rounds', type=int, default=5, help='time-to-first-prompt 重复次数 (默认: 5)')
+    parser.add_argument('--json', help='将结果写入 JSON 文件')
+    args = parser.parse_args()
+
+    results = {
+        'python': platform.python_version(),
+        'imports': [],
+        'time_to_first_prompt_ms': None,
+        'time_to_date_prompt_ms': None,
+    }
+
+    print("📦 模块导入耗时（-X importtime，累计）：")
+    for module in MODULES:
+        profile = import_profile(module)
+        results['imports'].append(profile)
+        if not profile['available']:
+            print(f"   {module:<14} 未安装")
+            continue
+        top = "，".join(f"{name} {ms:.1f}" for name, ms in profile['top_ms'][:3])
+        print(f"   {module:<14} {profile['cumulative_ms']:8.1f} ms   {top}")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        samples = [time_to_prompt(workdir, "💡") for _ in range(args.rounds)]
+        results['time_to_first_prompt_ms'] = min(samples) * 1000
+        print(f"⏱️  首个提示（未找到课表文件）：{results['time_to_first_prompt_ms']:.1f} ms")
+
+        if args.xls:
+            target = os.path.join(workdir, os.path.basename(args.xls))
+            shutil.copy2(args.xls, target)
+            samples = [time_to_prompt(workdir, "请输入开学日期", ("--no-upload", target))
+                       for _ in range(args.rounds)]
+            results['time_to_date_prompt_ms'] = min(samples) * 1000
+            print(f"⏱️  开学日期提示（含解析课表）：{results['time_to_date_prompt_ms']:.1f} ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as w:
+            json.dump(results, w, ensure_ascii=False, indent=2)
+        print(f"📝 结果已写入 {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
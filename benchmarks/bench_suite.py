@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+基准测试套件
+在合成课表（见 synthetic.py）上依次测量各阶段的耗时：
+单元格解析、Excel 解析、课程合并、日历生成、行折叠、二维码生成、上传（本地模拟的缓存服务）
+结果可写出为 JSON（包含提交号与运行环境），并可与之前的结果对比，发现性能回退
+
+使用方式：
+  python benchmarks/bench_suite.py --json results.json                 # 运行并保存结果
+  python benchmarks/bench_suite.py --compare results.json              # 与之前的结果对比
+  python benchmarks/bench_suite.py --only generate fold --rounds 10    # 只运行名称包含关键字的测试
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from course_parser import (SDUST_DURATION, SDUST_TIMETABLE, extract_courses_from_grid, merge_duplicate_courses,
+                           parse_course_info, parse_timetable_from_xls, parse_weeks)
+from data import School
+from event_cache import EventCache
+from ics_fold import FoldingWriter, fold_line
+from synthetic import generate_exports, synthetic_grid
+
+
+class CacheApiStub(BaseHTTPRequestHandler):
+    """本地模拟的缓存服务上传接口，总是返回上传成功"""
+    protocol_version = "HTTP/1.1"
+    # 响应头和响应体分两次写出，关闭 Nagle 算法以免与客户端的延迟确认叠加出 40ms 等待
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        payload = b'{"code":200,"uuid":"bench","expiredAt":0}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def measure(func: Callable[[], None], ops: int, rounds: int) -> dict:
+    """重复运行 rounds 次，记录最快和中位耗时，以及最快一次的单次操作耗时"""
+    func()  # 预热
+    samples = []
+    for _ in range(rounds):
+        began = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - began)
+    best = min(samples)
+    return {
+        'ops': ops,
+        'rounds': rounds,
+        'best_s': best,
+        'median_s': statistics.median(samples),
+        'per_op_us': best / ops * 1e6 if ops else 0.0,
+    }
+
+
+def make_school(courses, compact: bool = False, event_cache: Optional[EventCache] = None) -> School:
+    return School(duration=SDUST_DURATION, timetable=list(SDUST_TIMETABLE), start=(2025, 9, 1),
+                  courses=courses, compact=compact, stamp=datetime(2025, 9, 1), event_cache=event_cache)
+
+
+def build_benchmarks(workdir: str, timetables: int, uploads: int, qr_codes: int) -> dict[str, tuple]:
+    """准备测试数据，返回 {名称: (函数, 操作数)}"""
+    grids = [synthetic_grid(seed=seed) for seed in range(timetables)]
+    cells = [cell for grid in grids for row in grid[3:] for cell in row[1:] if cell]
+    raw_courses = [extract_courses_from_grid(grid) for grid in grids]
+    merged = [merge_duplicate_courses(courses) for courses in raw_courses]
+    lines = [line for courses in merged for line in make_school(courses).iter_content_lines()]
+
+    xlsx = generate_exports(os.path.join(workdir, "xlsx"), timetables, class_size=1, fmt="xlsx")
+    try:
+        xls = generate_exports(os.path.join(workdir, "xls"), timetables, class_size=1, fmt="xls")
+    except ImportError:
+        xls = []  # 未安装 xlwt 时跳过 .xls 解析测试
+
+    def parse_files(paths):
+        return lambda: [parse_timetable_from_xls(path, verbose=False, use_cache=False) for path in paths]
+
+    def parse_cold():
+        # 清空单元格解析缓存，测量实际解析的耗时
+        parse_course_info.cache_clear()
+        parse_weeks.cache_clear()
+        return [parse_course_info(cell) for cell in cells]
+
+    def write_schools(event_cache=None):
+        # 预热后事件均已缓存，相当于同一班级的其他学生或订阅服务的再次渲染
+        def run():
+            with open(os.devnull, "wb") as w:
+                for courses in merged:
+                    make_school(courses, event_cache=event_cache).write_to(w)
+        return run
+
+    def write_folded():
+        with open(os.devnull, "wb") as w:
+            writer = FoldingWriter(w)
+            writer.write_lines(lines)
+            writer.flush()
+
+    benchmarks = {
+        'parse_course_info': (parse_cold, len(cells)),
+        'parse_course_info[memo]': (lambda: [parse_course_info(cell) for cell in cells], len(cells)),
+        'parse_timetable_from_xls[xlsx]': (parse_files(xlsx), len(xlsx)),
+        'merge_duplicate_courses': (lambda: [merge_duplicate_courses(courses) for courses in raw_courses],
+                                    len(raw_courses)),
+        'School.generate': (lambda: [make_school(courses).generate() for courses in merged], len(merged)),
+        'School.generate[compact]': (lambda: [make_school(courses, True).generate() for courses in merged],
+                                     len(merged)),
+        'School.write_to': (write_schools(), len(merged)),
+        'School.write_to[event cache]': (write_schools(EventCache()), len(merged)),
+        'fold_line': (lambda: [fold_line(line) for line in lines], len(lines)),
+        'FoldingWriter': (write_folded, len(lines)),
+    }
+    if xls:
+        benchmarks['parse_timetable_from_xls[xls]'] = (parse_files(xls), len(xls))
+
+    try:
+        from qr_render import qr_matrix, render_png, render_svg
+        urls = [f"https://cache.ravelloh.top/file.ics?uuid={n:032x}" for n in range(qr_codes)]
+        matrices = [qr_matrix(url) for url in urls]
+        benchmarks['qr_matrix'] = (lambda: [qr_matrix(url) for url in urls], len(urls))
+        benchmarks['qr_render[png]'] = (lambda: [render_png(matrix) for matrix in matrices], len(matrices))
+        benchmarks['qr_render[svg]'] = (lambda: [render_svg(matrix) for matrix in matrices], len(matrices))
+    except ImportError:
+        pass
+
+    try:
+        from upload_and_qr import UploadClient
+        server = ThreadingHTTPServer(('127.0.0.1', 0), CacheApiStub)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        client = UploadClient(api_url=f"http://127.0.0.1:{server.server_address[1]}/api?mode=set", retries=0)
+        content = make_school(merged[0]).generate().encode("utf-8")
+        benchmarks['upload[local stub]'] = (lambda: [client.upload_bytes(content) for _ in range(uploads)], uploads)
+    except ImportError:
+        pass
+
+    return benchmarks
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """与之前的结果对比，打印每项的耗时比例，返回超过阈值的回退项"""
+    regressions = []
+    print(f"\n📊 与 {baseline.get('commit', '?')} 对比（单次操作耗时，比例 > {threshold:.2f} 视为回退）：")
+    for name, result in results.items():
+        old = baseline.get('results', {}).get(name)
+        if not old or not old['per_op_us']:
+            print(f"   {name:<32} 新增")
+            continue
+        ratio = result['per_op_us'] / old['per_op_us']
+        mark = "🔺" if ratio > threshold else ("🔻" if ratio < 1 / threshold else "  ")
+        print(f"   {name:<32} {old['per_op_us']:10.1f} → {result['per_op_us']:10.1f} µs  ×{ratio:.2f} {mark}")
+        if ratio > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="基准测试套件")
+    parser.add_argument('--timetables', type=int, default=20, help='合成课表数量 (默认: 20)')
+    parser.add_argument('--uploads', type=int, default=20, help='上传次数 (默认: 20)')
+    parser.add_argument('--qr', type=int, default=20, help='二维码数量 (默认: 20)')
+    parser.add_argument('--rounds', type=int, default=5, help='每项重复次数 (默认: 5)')
+    parser.add_argument('--only', nargs='+', help='只运行名称包含这些关键字的测试')
+    parser.add_argument('--json', help='将结果写入 JSON 文件')
+    parser.add_argument('--compare', help='与之前保存的 JSON 结果对比')
+    parser.add_argument('--threshold', type=float, default=1.10, help='判定为回退的耗时比例 (默认: 1.10)')
+    args = parser.parse_args()
+
+    output = {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {'timetables': args.timetables, 'uploads': args.uploads, 'qr': args.qr, 'rounds': args.rounds},
+        'results': {},
+    }
+
+    with tempfile.TemporaryDirectory() as workdir:
+        benchmarks = build_benchmarks(workdir, args.timetables, args.uploads, args.qr)
+        print(f"⏱️  基准测试（{output['commit']}，Python {output['python']}）：")
+        for name, (func, ops) in benchmarks.items():
+            if args.only and not any(keyword in name for keyword in args.only):
+                continue
+            result = measure(func, ops, args.rounds)
+            output['results'][name] = result
+            print(f"   {name:<32} {result['per_op_us']:10.1f} µs/次   （{ops} 次，最快 {result['best_s'] * 1000:.1f} ms）")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as w:
+            json.dump(output, w, ensure_ascii=False, indent=2)
+        print(f"📝 结果已写入 {args.json}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as r:
+            regressions = compare(output['results'], json.load(r), args.threshold)
+        if regressions:
+            print(f"❌ 性能回退：{', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
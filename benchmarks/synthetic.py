@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+合成课表生成器
+按强智教务系统“打印课表”导出的格式生成 .xls/.xlsx 课表：
+标题行、班级信息行、星期标题行，随后是第一~第五大节，每个单元格包含
+“课程名\\n教师(职称)\\n周次\\n教室”，部分单元格包含两门课程（如第 17-18 周换课）
+
+同一班级的学生课表相同，生成的文件按班级分组，便于测试解析缓存和批量转换
+
+使用方式：
+  python benchmarks/synthetic.py exports/ --students 300 --class-size 30 --format both
+"""
+
+import argparse
+import os
+import random
+import sys
+
+COURSE_NAMES = [
+    "高等数学（A）（2-1）", "大学英语（A）", "电路（2）", "线性代数", "程序设计基础(C语言)",
+    "大学物理 （实验）", "体育（1）", "概率论与数理统计", "数据结构", "离散数学",
+    "思想道德与法治", "中国近现代史纲要", "大学物理（B）", "工程制图", "形势与政策",
+]
+
+TEACHER_TITLES = ["教授", "副教授", "讲师", "助教"]
+
+CLASSROOMS = [
+    "J7-106室", "J7-302室", "J3-201室", "J14-405室", "Js1-305室", "S1-201室", "品学楼B107",
+    "实训6层-610室", "JB区乒乓球馆室", "线上虚拟教室",
+]
+
+WEEK_PATTERNS = [
+    "1-16[周]", "1-11,13-14[周]", "2-16[双周]", "1-15[单周]", "3,5,7[周]", "9-16[周]", "1-8[周]",
+]
+
+WEEKDAYS = ["星期一", "星期二", "星期三", "星期四", "星期五", "星期六", "星期日"]
+
+SLOTS = ["第一大节", "第二大节", "第三大节", "第四大节", "第五大节"]
+
+
+def course_cell(rng: random.Random, courses: int, week_patterns: list[str]) -> str:
+    """生成一门课程的单元格文本"""
+    n = rng.randrange(courses)
+    return (f"{COURSE_NAMES[n % len(COURSE_NAMES)]}\n"
+            f"教师{n}({TEACHER_TITLES[n % len(TEACHER_TITLES)]})\n"
+            f"{rng.choice(week_patterns)}\n"
+            f"{CLASSROOMS[n % len(CLASSROOMS)]}")
+
+
+def synthetic_grid(seed: int = 0, courses: int = 12, density: float = 0.45, weekend: bool = False,
+                   double_rate: float = 0.15, week_patterns: list[str] = WEEK_PATTERNS,
+                   class_name: str = "计算机2025-1") -> list[list[str]]:
+    """
+    生成一个班级的课表表格
+    courses: 课程种类数；density: 每个时间段有课的概率；double_rate: 单元格内包含两门课程的概率
+    """
+    rng = random.Random(seed)
+    days = 7 if weekend else 5
+    rows = [
+        ["山东科技大学 2025-2026-1 学期理论课表"] + [""] * 7,
+        [f"班级：{class_name}"] + [""] * 7,
+        [""] + WEEKDAYS,
+    ]
+    for slot in SLOTS:
+        row = [slot]
+        for day in range(7):
+            if day < days and rng.random() < density:
+                cell = course_cell(rng, courses, week_patterns)
+                if rng.random() < double_rate:
+                    cell += "\n" + course_cell(rng, courses, ["17-18[周]"])
+                row.append(cell)
+            else:
+                row.append("")
+        rows.append(row)
+    rows.append(["备注：实践课程请以教务通知为准"] + [""] * 7)
+    return rows
+
+
+def write_xlsx(rows: list[list[str]], path: str):
+    import openpyxl
+
+    book = openpyxl.Workbook()
+    sheet = book.active
+    for row_idx, row in enumerate(rows, 1):
+        for col_idx, value in enumerate(row, 1):
+            if value:
+                sheet.cell(row_idx, col_idx, value)
+    book.save(path)
+
+
+def write_xls(rows: list[list[str]], path: str):
+    """写出 .xls (BIFF8)，需要 xlwt（仅生成测试数据时使用，不是程序的运行依赖）"""
+    try:
+        import xlwt
+    except ImportError:
+        raise ImportError("生成 .xls 需要安装 xlwt：pip install xlwt") from None
+
+    book = xlwt.Workbook(encoding="utf-8")
+    sheet = book.add_sheet("Sheet1")
+    for row_idx, row in enumerate(rows):
+        for col_idx, value in enumerate(row):
+            if value:
+                sheet.write(row_idx, col_idx, value)
+    book.save(path)
+
+
+WRITERS = {
+    "xls": write_xls,
+    "xlsx": write_xlsx,
+}
+
+
+def generate_exports(output_dir: str, students: int = 30, class_size: int = 30, fmt: str = "xls",
+                     seed: int = 0, **grid_options) -> list[str]:
+    """
+    生成 students 个学生的课表文件，每 class_size 个学生一个班级（课表相同），
+    fmt 为 xls、xlsx 或 both（交替使用两种格式），返回生成的文件路径
+    """
+    formats = ["xls", "xlsx"] if fmt == "both" else [fmt]
+    paths = []
+    grids = {}
+    for student in range(students):
+        class_id = student // class_size
+        if class_id not in grids:
+            grids[class_id] = synthetic_grid(seed=seed * 100003 + class_id,
+                                             class_name=f"计算机2025-{class_id + 1}", **grid_options)
+        ext = formats[student % len(formats)]
+        directory = os.path.join(output_dir, f"class{class_id + 1:03d}")
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"student{student + 1:05d}.{ext}")
+        WRITERS[ext](grids[class_id], path)
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="合成课表生成器")
+    parser.add_argument('output', help='输出目录')
+    parser.add_argument('--students', type=int, default=30, help='学生数 (默认: 30)')
+    parser.add_argument('--class-size', type=int, default=30, help='每个班级的学生数 (默认: 30)')
+    parser.add_argument('--format', choices=['xls', 'xlsx', 'both'], default='xls', help='文件格式 (默认: xls)')
+    parser.add_argument('--courses', type=int, default=12, help='每个班级的课程种类数 (默认: 12)')
+    parser.add_argument('--density', type=float, default=0.45, help='每个时间段有课的概率 (默认: 0.45)')
+    parser.add_argument('--weekend', action='store_true', help='周末也排课')
+    parser.add_argument('--weeks', nargs='+', default=WEEK_PATTERNS, help='可选的周次表达式')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子 (默认: 0)')
+    args = parser.parse_args()
+
+    paths = generate_exports(args.output, args.students, args.class_size, args.format, args.seed,
+                             courses=args.courses, density=args.density, weekend=args.weekend,
+                             week_patterns=args.weeks)
+    print(f"✅ 已生成 {len(paths)} 个课表文件：{args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
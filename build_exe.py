@@ -44,6 +44,7 @@ a = Analysis(
     binaries=[],
     datas=[
         ('README.md', '.'),
+        ('buildings.json', '.'),
     ],
     hiddenimports=[
         'pandas',
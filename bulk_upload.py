@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+批量上传工具
+将批量转换生成的 .ics 文件并发上传到缓存服务，为每个学生生成下载链接：
+- 线程池限制并发数，令牌桶限制每秒请求数，所有线程共用一个上传客户端（连接池）
+- 每上传成功一个文件就向上传清单（JSON Lines）追加一行并立即写入磁盘，
+  中断后重新运行会跳过清单中仍未过期且内容未变化的记录，从中断处继续
+- 内容相同的日历（如同一班级的学生，忽略 DTSTAMP）只上传一次，共用同一个下载链接
+
+使用方式：python bulk_upload.py ics_output/ -j 8 --rate 10 [--qr-dir qr/ --qr-format svg]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Iterator, Optional
+
+from batch import percentile
+from ics_diff import CHANGES_SUFFIX
+from output_store import STORE_DIR, dedupe_ratio
+from qr_render import FORMATS, render_batch
+from upload_and_qr import UPLOAD_API, UploadClient
+from upload_ledger import calendar_digest
+
+MANIFEST_NAME = "upload_manifest.jsonl"
+
+# 距离过期不足该时间（秒）的记录视为需要重新上传
+RENEW_MARGIN = 3600
+
+
+class RateLimiter:
+    """令牌桶限速（线程安全）：平均每秒最多 rate 个请求，允许 burst 个突发请求；rate 为 0 时不限速"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class UploadManifest:
+    """上传清单：每行一个 JSON 记录，同一学生以最后一条记录为准"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+
+    def load(self) -> dict[str, dict]:
+        """读取已有记录；中断时可能写了一半的最后一行会被忽略"""
+        entries = {}
+        if not os.path.exists(self.path):
+            return entries
+        with open(self.path, encoding="utf-8") as r:
+            for line in r:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                entries[entry['student']] = entry
+        return entries
+
+    def record(self, entry: dict):
+        """追加一条记录并立即写入磁盘"""
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self.lock:
+            with open(self.path, "a", encoding="utf-8") as w:
+                w.write(line)
+                w.flush()
+                os.fsync(w.fileno())
+
+
+def find_calendars(input_dir: str) -> list[tuple[str, str]]:
+    """
+    递归查找目录下的 .ics 文件（忽略增量更新生成的 .changes.ics 和去重输出的存储目录），
+    返回 (学生, 文件路径) 列表
+    """
+    calendars = []
+    for path in sorted(Path(input_dir).rglob("*.ics")):
+        relative = path.relative_to(input_dir)
+        if path.name.endswith(CHANGES_SUFFIX) or STORE_DIR in relative.parts:
+            continue
+        student = relative.with_suffix("").as_posix()
+        calendars.append((student, str(path)))
+    return calendars
+
+
+def is_valid(entry: Optional[dict], now: float) -> bool:
+    """清单中的记录是否仍可使用（距离过期还有 RENEW_MARGIN 以上）"""
+    return entry is not None and entry.get('expires', 0) - RENEW_MARGIN > now
+
+
+def file_digest(path: str) -> str:
+    with open(path, "rb") as r:
+        return calendar_digest(r.read())
+
+
+def bulk_upload(calendars: list[tuple[str, str]], manifest_path: str, jobs: int = 8, rate: float = 10.0,
+                expired_hours: int = 168, client: Optional[UploadClient] = None,
+                dedupe: bool = True) -> Iterator[dict]:
+    """
+    并发上传多个日历文件，按完成顺序逐个产出结果字典
+    calendars: (学生, 文件路径) 列表，学生为上传清单中的键
+    rate: 每秒最多发起的上传请求数，0 表示不限速
+    client: 上传客户端，默认新建一个连接池大小为 jobs 的客户端
+    dedupe: 内容相同的日历只上传一次（见 upload_ledger.calendar_digest），
+            其余学生沿用同一链接，结果中 shared 为 True；清单中仍为每个学生各记录一条
+    清单中的每条记录都带有日历内容摘要，只有记录未过期且摘要与当前文件一致时才跳过该学生
+    """
+    manifest = UploadManifest(manifest_path)
+    done = manifest.load()
+    limiter = RateLimiter(rate, burst=jobs)
+    client = client or UploadClient(pool_size=jobs)
+
+    def upload(digest: str, members: list[tuple[str, str]]) -> list[dict]:
+        limiter.acquire()
+        started = time.time()
+        try:
+            result = client.upload_file(members[0][1], expired_hours)
+        except Exception as e:
+            result = {'success': False, 'error': f"上传过程中发生错误：{str(e)}"}
+        results = []
+        for i, (student, path) in enumerate(members):
+            member = {**result, 'student': student, 'input': path, 'skipped': False, 'shared': i > 0}
+            if i > 0:
+                member.pop('bytes_sent', None)
+            if result['success']:
+                entry = {
+                    'student': student,
+                    'input': path,
+                    'uuid': result['uuid'],
+                    'download_url': result['download_url'],
+                    'expired_at': result['expired_at'],
+                    'expires': int(started) + expired_hours * 3600,
+                    'digest': digest,
+                }
+                manifest.record(entry)
+            results.append(member)
+        return results
+
+    now = time.time()
+    # 清单中仍有效的链接按内容摘要索引，内容相同的其他学生可直接沿用
+    shared = {entry['digest']: entry for entry in done.values() if 'digest' in entry and is_valid(entry, now)}
+    groups: dict[str, list[tuple[str, str]]] = {}
+    digests: dict[str, str] = {}
+    for student, path in calendars:
+        try:
+            digest = file_digest(path)
+        except OSError as e:
+            yield {'success': False, 'skipped': False, 'student': student, 'input': path,
+                   'error': f"读取文件失败：{str(e)}"}
+            continue
+        entry = done.get(student)
+        # 课表重新生成且内容变化时，旧链接指向的是旧日历，需要重新上传
+        if is_valid(entry, now) and entry.get('digest') == digest:
+            yield {'success': True, 'skipped': True, 'student': student, 'input': path, **entry}
+            continue
+        if not dedupe:
+            groups[student] = [(student, path)]
+            digests[student] = digest
+            continue
+        if digest in shared:
+            entry = {**shared[digest], 'student': student, 'input': path}
+            manifest.record(entry)
+            yield {'success': True, 'skipped': True, 'shared': True, **entry}
+        else:
+            groups.setdefault(digest, []).append((student, path))
+            digests[digest] = digest
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(upload, digests[key], members) for key, members in groups.items()]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SDUST 课表批量上传工具")
+    parser.add_argument('input', help='.ics 文件所在目录（递归查找，如 batch.py 的输出目录）')
+    parser.add_argument('-m', '--manifest', help=f'上传清单路径 (默认: 输入目录下的 {MANIFEST_NAME})')
+    parser.add_argument('-j', '--jobs', type=int, default=8, help='并发上传数 (默认: 8)')
+    parser.add_argument('--rate', type=float, default=10.0, help='每秒最多上传请求数，0 表示不限速 (默认: 10)')
+    parser.add_argument('--hours', type=int, default=168, help='链接有效期，单位小时 (默认: 168)')
+    parser.add_argument('--api', default=UPLOAD_API, help='缓存服务上传接口地址')
+    parser.add_argument('--qr-dir', help='为每个学生的下载链接生成二维码，保存到该目录')
+    parser.add_argument('--qr-format', choices=FORMATS, default='png', help='二维码格式 (默认: png)')
+    parser.add_argument('--no-dedupe', action='store_true', help='不合并内容相同的日历，每个文件各上传一次')
+    parser.add_argument('--retries', type=int, default=3, help='单个文件失败重试次数 (默认: 3)')
+    args = parser.parse_args()
+
+    calendars = find_calendars(args.input)
+    if not calendars:
+        print("❌ 错误：未找到任何 .ics 文件")
+        return 1
+    manifest_path = args.manifest or os.path.join(args.input, MANIFEST_NAME)
+    print(f"📋 共 {len(calendars)} 个日历文件，上传清单：{manifest_path}")
+
+    results = []
+    failures = []
+    began = time.perf_counter()
+    with UploadClient(api_url=args.api, retries=args.retries, pool_size=args.jobs) as client:
+        for result in bulk_upload(calendars, manifest_path, args.jobs, args.rate, args.hours, client,
+                                  not args.no_dedupe):
+            results.append(result)
+            if not result['success']:
+                failures.append(result)
+            if len(results) % 100 == 0:
+                print(f"   已完成 {len(results)}/{len(calendars)}")
+    wall_time = time.perf_counter() - began
+
+    if args.qr_dir:
+        # 共用同一链接的学生只生成一次二维码，其余复制
+        items = []
+        copies = []
+        rendered = {}
+        for r in results:
+            if r['success']:
+                path = os.path.join(args.qr_dir, f"{r['student']}.{args.qr_format}")
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                if r['download_url'] in rendered:
+                    copies.append((rendered[r['download_url']], path))
+                else:
+                    rendered[r['download_url']] = path
+                    items.append((r['download_url'], path))
+        qr_failures = [r for r in render_batch(items, args.qr_format) if not r['success']]
+        failed = {r['output'] for r in qr_failures}
+        copies = [(source, path) for source, path in copies if source not in failed]
+        for source, path in copies:
+            shutil.copyfile(source, path)
+        print(f"🖼️  已生成 {len(items) + len(copies) - len(qr_failures)} 个二维码：{args.qr_dir}")
+        for r in qr_failures:
+            print(f"   - {r['output']}：{r['error']}")
+
+    uploaded = [r for r in results if r['success'] and not r['skipped']]
+    requests = [r for r in uploaded if not r.get('shared')]
+    reused = [r for r in results if r['success'] and r.get('shared')]
+    latencies = [r['latency'] for r in results if 'latency' in r and not r['skipped'] and not r.get('shared')]
+    print("\n" + "="*60)
+    print("📊 批量上传总结")
+    print("="*60)
+    print(f"📁 文件总数：{len(results)}（上传 {len(uploaded)}，沿用清单 {len(results) - len(uploaded) - len(failures)}，"
+          f"失败 {len(failures)}）")
+    if reused:
+        print(f"🗜️  去重：{len(requests) + len(reused)} 个日历实际上传 {len(requests)} 份"
+              f"（去重比例 {dedupe_ratio(len(requests) + len(reused), len(requests)):.1%}）")
+    print(f"⏱️  总耗时：{wall_time:.2f} 秒，吞吐量 {len(uploaded) / wall_time if wall_time > 0 else 0:.1f} 文件/秒")
+    print(f"⏳ 单文件耗时：p50 {percentile(latencies, 50) * 1000:.0f} ms，p99 {percentile(latencies, 99) * 1000:.0f} ms")
+    print(f"📤 发送：{sum(r.get('bytes_sent', 0) for r in requests) / 1024 / 1024:.1f} MB")
+    if failures:
+        print("\n❌ 失败的文件（重新运行即可只上传这些文件）：")
+        for r in failures:
+            print(f"   - {r['input']}：{r['error']}")
+    print("="*60)
+    return 0 if not failures else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""
+校园建筑登记表：
+从 buildings.json 读取建筑信息（名称、别名、经纬度、可选的 Apple Maps 结构化定位），
+按规范化后的建筑代号建立前缀树，教室名称只需从头扫描一遍即可找到最长匹配的建筑
+
+登记表中填写了经纬度的建筑会输出 GEO（安卓日历也能显示位置），
+填写了 X-APPLE-STRUCTURED-LOCATION 的建筑会额外输出 Apple Maps 定位；
+两者都未填写时只输出建筑名称，与未登记的建筑相同
+"""
+
+import hashlib
+import json
+import os
+import re
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, Optional, Union
+
+from data import Geo
+
+# 登记表路径，可通过环境变量 SDUST_BUILDINGS 修改
+BUILDINGS_PATH = os.environ.get("SDUST_BUILDINGS") or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "buildings.json")
+
+# 前缀树中标记“到此为一个完整别名”的键
+TERMINAL = ""
+
+# 每个登记表缓存的教室匹配结果数
+MATCH_CACHE_SIZE = 1024
+
+Location = Union[str, Geo, tuple[str, ...]]
+
+
+def normalize_code(text: str) -> str:
+    """规范化建筑代号：全角转半角、字母转大写、去掉空白"""
+    return "".join(unicodedata.normalize("NFKC", text).upper().split())
+
+
+@dataclass(frozen=True, slots=True)
+class Building:
+    """一栋建筑，lat/lon/apple/pattern 未登记时为 None"""
+    name: str
+    aliases: tuple[str, ...]
+    lat: Optional[float] = None
+    lon: Optional[float] = None
+    apple: Optional[str] = None  # 完整的 X-APPLE-STRUCTURED-LOCATION 内容行
+    pattern: Optional[str] = None  # 规范化后的教室名称须完整匹配该正则，用于限制过短的别名（如“实训”）
+
+    def accepts(self, code: str) -> bool:
+        return self.pattern is None or re.fullmatch(self.pattern, code) is not None
+
+    def location(self) -> Location:
+        """课程定位信息：Apple Maps 定位行、Geo 或建筑名称，见 Course.location_lines()"""
+        has_geo = self.lat is not None and self.lon is not None
+        if self.apple:
+            lines = [f"LOCATION:{self.name}", self.apple]
+            if has_geo:
+                lines.append(Geo(self.name, self.lat, self.lon).geo)
+            return tuple(lines)
+        if has_geo:
+            return Geo(self.name, self.lat, self.lon)
+        return self.name
+
+
+class BuildingRegistry:
+    """建筑登记表：别名前缀树 + 匹配结果缓存（LRU，最多 MATCH_CACHE_SIZE 个教室名称）"""
+
+    def __init__(self, buildings: Iterable[Building], digest: str = "") -> None:
+        self.buildings = tuple(buildings)
+        self.digest = digest
+        self._trie: dict = {}
+        self.match = lru_cache(maxsize=MATCH_CACHE_SIZE)(self._match)
+        for building in self.buildings:
+            for alias in building.aliases:
+                node = self._trie
+                for char in normalize_code(alias):
+                    node = node.setdefault(char, {})
+                node[TERMINAL] = building
+
+    @classmethod
+    def load(cls, path: str = BUILDINGS_PATH) -> "BuildingRegistry":
+        """读取登记表文件；文件不存在时返回空登记表"""
+        try:
+            with open(path, "rb") as r:
+                content = r.read()
+        except FileNotFoundError:
+            return cls(())
+        buildings = [Building(name=entry["name"], aliases=tuple(entry.get("aliases") or (entry["name"],)),
+                              lat=entry.get("lat"), lon=entry.get("lon"), apple=entry.get("apple"),
+                              pattern=entry.get("pattern"))
+                     for entry in json.loads(content)["buildings"]]
+        return cls(buildings, hashlib.sha256(content).hexdigest())
+
+    def _match(self, classroom: str) -> Optional[Building]:
+        """
+        查找教室所在建筑（通过 self.match 调用，结果按教室名称缓存）：
+        沿前缀树扫描教室名称，返回最长的完整别名匹配
+        以数字结尾的别名后面不能紧跟数字（J1 不匹配 J10-101），登记了 pattern 的建筑还须通过其检查
+        """
+        code = normalize_code(classroom)
+        node = self._trie
+        found = None
+        for position, char in enumerate(code):
+            node = node.get(char)
+            if node is None:
+                break
+            building = node.get(TERMINAL)
+            if (building is not None and not (char.isdigit() and code[position + 1:position + 2].isdigit())
+                    and building.accepts(code)):
+                found = building
+        return found
+
+    def match_all(self, classrooms: Iterable[str]) -> dict[str, Optional[Building]]:
+        """批量匹配：每个不同的教室名称只扫描一次，总耗时与教室名称的总长度成正比"""
+        return {classroom: self.match(classroom) for classroom in set(classrooms)}
+
+
+@lru_cache(maxsize=None)
+def default_registry() -> BuildingRegistry:
+    """进程内共享的默认登记表"""
+    return BuildingRegistry.load()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+库接口与非交互命令行：
+Excel 课表内容（bytes）→ Course 列表 → .ics 日历内容（bytes），全程在内存中完成，
+不读写当前目录，可在同一目录下并发运行，也可在管道中使用
+
+库调用：
+  from convert import convert_workbook
+  ics = convert_workbook(workbook_bytes, start=(2025, 9, 1))
+
+命令行：
+  python convert.py 课表.xls -s 2025-09-01 -o 课表.ics
+  cat 课表.xls | python convert.py -s 2025-09-01 > 课表.ics
+"""
+
+import argparse
+import os
+import re
+import sys
+import tempfile
+from datetime import datetime
+from io import BytesIO
+from typing import BinaryIO, Optional
+
+from course_parser import SDUST_DURATION, SDUST_TIMETABLE, parse_timetable_bytes
+from data import Course, School
+from event_cache import EventCache
+from excel_reader import BACKENDS
+
+# 表示标准输入/标准输出的路径
+STDIO = "-"
+
+
+def parse_start_date(text: str) -> tuple[int, int, int]:
+    """
+    解析开学日期，支持 2025-09-01、2025/9/1、2025.9.1 等格式
+    """
+    date_obj = datetime.strptime(re.sub(r'[/.]', '-', text.strip()), '%Y-%m-%d')
+    return (date_obj.year, date_obj.month, date_obj.day)
+
+
+def build_school(courses: list[Course], start: tuple[int, int, int], compact: bool = False,
+                 stamp: Optional[datetime] = None, event_cache: Optional[EventCache] = None) -> School:
+    """
+    按山东科技大学的作息时间创建日历，stamp 见 School.dtstamp()
+    event_cache: 事件渲染缓存，连续转换多个同班级学生的课表时可传入 event_cache.shared_cache()
+    """
+    return School(
+        duration=SDUST_DURATION,
+        timetable=list(SDUST_TIMETABLE),
+        start=start,
+        courses=courses,
+        compact=compact,
+        stamp=stamp,
+        event_cache=event_cache,
+    )
+
+
+def calendar_bytes(school: School) -> bytes:
+    """将日历编码为 .ics 文件内容"""
+    buffer = BytesIO()
+    school.write_to(buffer)
+    return buffer.getvalue()
+
+
+def convert_workbook(content: bytes, start: tuple[int, int, int], name: str = "", compact: bool = False,
+                     stamp: Optional[datetime] = None, backend: str = "auto", use_cache: bool = True,
+                     event_cache: Optional[EventCache] = None) -> bytes:
+    """
+    将 Excel 课表内容转换为 .ics 日历内容
+    name: 原文件名（仅用于判断格式），backend 与 use_cache 见 course_parser.parse_timetable_from_xls
+    event_cache 见 build_school
+    未能解析到任何课程时抛出 ValueError
+    """
+    courses = parse_timetable_bytes(content, name, backend, use_cache)
+    if not courses:
+        raise ValueError("未能解析到任何课程信息")
+    return calendar_bytes(build_school(courses, start, compact, stamp, event_cache))
+
+
+def write_atomic(path: str, school: School) -> int:
+    """先写入同目录下的临时文件再原子替换，并发运行时不会读到写了一半的文件"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as w:
+            size = school.write_to(w)
+        os.chmod(tmp_path, 0o644)  # mkstemp 创建的文件只有所有者可读写
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return size
+
+
+def read_input(path: str, stdin: BinaryIO) -> bytes:
+    if path == STDIO:
+        return stdin.read()
+    with open(path, "rb") as r:
+        return r.read()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="将课表 Excel 文件转换为 .ics 日历（非交互，可用于管道）",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+使用示例：
+  python convert.py 课表.xls -s 2025-09-01 -o 课表.ics
+  cat 课表.xls | python convert.py -s 2025-09-01 > 课表.ics
+        """
+    )
+    parser.add_argument('input', nargs='?', default=STDIO, help='课表 Excel 文件路径，- 表示标准输入 (默认: -)')
+    parser.add_argument('-s', '--start', required=True, help='开学日期，如 2025-09-01')
+    parser.add_argument('-o', '--output', default=STDIO, help='输出 .ics 文件路径，- 表示标准输出 (默认: -)')
+    parser.add_argument('--compact', action='store_true', help='精简模式：每个课程时间段只生成一个重复事件')
+    parser.add_argument('--no-cache', action='store_true', help='不使用解析缓存')
+    parser.add_argument('--backend', choices=BACKENDS, default='auto', help='Excel 读取后端 (默认: auto)')
+    args = parser.parse_args(argv)
+
+    # 提示信息输出到标准错误，标准输出只包含日历内容
+    try:
+        start = parse_start_date(args.start)
+    except ValueError:
+        print("❌ 日期格式错误，请使用正确格式（如：2025-09-01）", file=sys.stderr)
+        return 1
+
+    if args.input == STDIO and sys.stdin.isatty():
+        print("❌ 请指定课表文件路径，或通过标准输入传入文件内容", file=sys.stderr)
+        return 1
+
+    try:
+        content = read_input(args.input, sys.stdin.buffer)
+        courses = parse_timetable_bytes(content, "" if args.input == STDIO else args.input,
+                                        args.backend, not args.no_cache)
+        if not courses:
+            raise ValueError("未能解析到任何课程信息")
+        school = build_school(courses, start, args.compact)
+        if args.output == STDIO:
+            school.write_to(sys.stdout.buffer)
+            sys.stdout.buffer.flush()
+        else:
+            write_atomic(args.output, school)
+            print(f"✅ 已生成 {args.output}（{len(courses)} 个课程时间段）", file=sys.stderr)
+    except Exception as e:
+        print(f"❌ 转换失败：{type(e).__name__}: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
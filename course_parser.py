@@ -1,7 +1,42 @@
-import pandas as pd
 import re
+import sys
 import glob
-from data import Course, Weeks, OddWeeks, EvenWeeks, Geo
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+from data import Course, Weeks, OddWeeks, EvenWeeks, Geo, WeekSet
+from excel_reader import read_workbook_grid
+from campus import Location, default_registry
+import parse_cache
+import profiling
+
+# 解析器版本号：修改解析逻辑或 Course 结构后需要递增，使旧的解析缓存失效
+PARSER_VERSION = 3
+
+# 山东科技大学作息时间：每节课时长（分钟）
+SDUST_DURATION = 110
+
+# 山东科技大学作息时间：每节课开始时间（时, 分）
+# School 会在列表头部插入占位元素，传入前请先复制一份
+SDUST_TIMETABLE = [
+    (8, 0),     # 第1节课开始时间
+    (8, 0),     # 第2节课开始时间（第一大节的第二节）
+    (10, 10),   # 第3节课开始时间
+    (10, 10),   # 第4节课开始时间（第二大节的第二节）
+    (14, 0),    # 第5节课开始时间
+    (14, 0),    # 第6节课开始时间（第三大节的第二节）
+    (16, 10),   # 第7节课开始时间
+    (16, 10),   # 第8节课开始时间（第四大节的第二节）
+    (19, 0),    # 第9节课开始时间
+    (19, 0),    # 第10节课开始时间（第五大节的第二节）
+]
+
+def intern_text(text: str) -> str:
+    """
+    将字符串放入共享字符串池：
+    同一班级的大量学生拥有完全相同的课程名、教师、教室和地点，池化后内存中只保留一份
+    """
+    return sys.intern(text) if isinstance(text, str) else text
 
 def normalize_course_name(course_name: str) -> str:
     """
@@ -41,6 +76,7 @@ def normalize_classroom_name(classroom: str) -> str:
     
     return classroom
 
+@lru_cache(maxsize=1024)
 def classroom_to_location(classroom: str, course_name: str = "") -> str:
     """
     将教室名转换为地图位置格式
@@ -49,6 +85,7 @@ def classroom_to_location(classroom: str, course_name: str = "") -> str:
          线上虚拟教室 -> 返回空字符串（不设置位置）
          体育课程 -> 返回空字符串（不设置位置）
          未知教室 -> 返回空字符串（不设置位置）
+    相同的教室名称和课程名称只转换一次
     """
     if not classroom or classroom.strip() == "":
         return ""
@@ -92,10 +129,38 @@ def classroom_to_location(classroom: str, course_name: str = "") -> str:
     # 如果没有匹配到特定格式，添加默认前缀
     return f"山东科技大学{classroom}"
 
-def parse_course_info(course_text):
-    """解析课程信息文本，提取课程名、教师、周次、教室等信息"""
-    if pd.isna(course_text) or not course_text.strip():
-        return []
+@lru_cache(maxsize=4096)
+def _resolve_location(classroom: str, physical_education: bool) -> Location:
+    text = classroom_to_location(classroom, "体育" if physical_education else "")
+    if not text:
+        return ""
+    building = default_registry().match(normalize_classroom_name(classroom.strip()))
+    return building.location() if building else intern_text(text)
+
+def resolve_location(classroom: str, course_name: str = "") -> Location:
+    """
+    教室对应的课程定位信息：
+    在建筑登记表（campus.py / buildings.json）中登记过的建筑返回其定位（可能带有经纬度），
+    未登记的建筑返回 classroom_to_location() 推断的地点名称；同一教室只解析一次
+    """
+    return _resolve_location(classroom or "", "体育" in (course_name or ""))
+
+@dataclass(frozen=True, slots=True)
+class CellCourse:
+    """单元格中的一门课程（课程名和教室已规范化）"""
+    name: str
+    teacher: str
+    weeks: WeekSet
+    classroom: str
+
+@lru_cache(maxsize=4096)
+def parse_course_info(course_text) -> tuple[CellCourse, ...]:
+    """
+    解析课程信息文本，提取课程名、教师、周次、教室等信息
+    同一班级的学生课表单元格完全相同，相同的文本只解析一次，结果不可变，可安全共享
+    """
+    if not isinstance(course_text, str) or not course_text.strip():
+        return ()
     
     courses = []
     # 按换行符分割课程信息
@@ -119,7 +184,7 @@ def parse_course_info(course_text):
             week_info = lines[i + 2]
             weeks = parse_weeks(week_info)
         else:
-            weeks = []
+            weeks = WeekSet()
             
         if i + 3 < len(lines):
             # 教室信息
@@ -128,68 +193,86 @@ def parse_course_info(course_text):
             classroom = "未知教室"
             
         if course_name and weeks:  # 只有有效的课程名和周次才添加
-            courses.append({
-                'name': normalize_course_name(course_name),  # 使用规范化的课程名
-                'teacher': teacher,
-                'weeks': weeks,
-                'classroom': normalize_classroom_name(classroom)  # 使用规范化的教室名
-            })
+            courses.append(CellCourse(
+                name=intern_text(normalize_course_name(course_name)),  # 使用规范化的课程名
+                teacher=intern_text(teacher),
+                weeks=weeks,
+                classroom=intern_text(normalize_classroom_name(classroom))  # 使用规范化的教室名
+            ))
         
         i += 4  # 跳过已处理的4行
     
-    return courses
+    return tuple(courses)
 
+# 周次表达式中的记号：周次范围（如 1-12）或单独周次（如 5），以及 [周]/[单周]/[双周] 标记
+WEEK_TOKEN_PATTERN = re.compile(r'(\d+)\s*(?:-\s*(\d+))?|\[(单|双)?周\]')
+
+@lru_cache(maxsize=1024)
 def parse_weeks(week_text):
-    """解析周次信息"""
+    """
+    解析周次表达式，返回 WeekSet：
+    如 1-11,13-14[周] -> 第1~11、13~14周
+       1-15[单周] -> 第1~15周中的单周
+       1-8[周],10-16[双周] -> 标记作用于其前方、上一个标记之后的所有周次
+    相同的表达式只解析一次，结果不可变，可安全共享
+    """
     if not week_text:
-        return []
-    
-    # 移除[周]或[单周]或[双周]标记
-    week_text = re.sub(r'\[(单|双)?周\]', '', week_text)
-    
-    weeks = []
-    
-    # 处理复杂的周次表达式，如 "1-11,13-14"
-    parts = week_text.split(',')
-    for part in parts:
-        part = part.strip()
-        if '-' in part:
-            # 处理范围，如 1-12
-            range_match = re.match(r'(\d+)-(\d+)', part)
-            if range_match:
-                start, end = range_match.groups()
-                weeks.extend(range(int(start), int(end) + 1))
-        else:
-            # 处理单独的数字
-            number_match = re.match(r'(\d+)', part)
-            if number_match:
-                weeks.append(int(number_match.group(1)))
+        return WeekSet()
+    
+    mask = 0
+    pending = []  # 尚未遇到 [周] 标记的周次范围
     
-    return sorted(list(set(weeks)))  # 去重并排序
+    for match in WEEK_TOKEN_PATTERN.finditer(week_text):
+        start, end, parity = match.groups()
+        if start:
+            pending.append((int(start), int(end or start)))
+            continue
+        # 遇到 [周]/[单周]/[双周] 标记，按单双周筛选前方的周次范围
+        for first, last in pending:
+            mask |= week_range_mask(first, last, parity)
+        pending.clear()
+    
+    for first, last in pending:
+        mask |= week_range_mask(first, last, None)
+    
+    return WeekSet.from_mask(mask)
+
+def week_range_mask(first: int, last: int, parity: Optional[str]) -> int:
+    """第 first 到 last 周的位掩码，parity 为 单/双 时只保留单周/双周"""
+    mask = 0
+    for week in range(first, last + 1):
+        if parity == '单' and not week % 2 or parity == '双' and week % 2:
+            continue
+        mask |= 1 << week
+    return mask
+
+# 大节名称 -> 节次索引
+SLOT_INDEXES = {
+    '第一大节': (1, 2),
+    '第二大节': (3, 4),
+    '第三大节': (5, 6),
+    '第四大节': (7, 8),
+    '第五大节': (9, 10),
+}
+
+# 星期名称 -> 星期几
+WEEKDAY_NUMBERS = {
+    '星期一': 1,
+    '星期二': 2,
+    '星期三': 3,
+    '星期四': 4,
+    '星期五': 5,
+    '星期六': 6,
+    '星期日': 7,
+}
 
 def time_slot_to_index(slot_name):
     """将时间段名称转换为索引"""
-    slot_mapping = {
-        '第一大节': [1, 2],
-        '第二大节': [3, 4], 
-        '第三大节': [5, 6],
-        '第四大节': [7, 8],
-        '第五大节': [9, 10]
-    }
-    return slot_mapping.get(slot_name, [])
+    return SLOT_INDEXES.get(slot_name, ())
 
 def weekday_name_to_number(weekday_name):
     """将星期名称转换为数字"""
-    weekday_mapping = {
-        '星期一': 1,
-        '星期二': 2,
-        '星期三': 3,
-        '星期四': 4,
-        '星期五': 5,
-        '星期六': 6,
-        '星期日': 7
-    }
-    return weekday_mapping.get(weekday_name, 0)
+    return WEEKDAY_NUMBERS.get(weekday_name, 0)
 
 def merge_duplicate_courses(courses):
     """合并相同课程的不同时间段"""
@@ -224,10 +307,10 @@ def merge_duplicate_courses(courses):
     for course_info in merged.values():
         for schedule in course_info['schedules']:
             result.append(Course(
-                name=course_info['name'],
-                teacher=course_info['teacher'],
-                classroom=course_info['classroom'],
-                location=classroom_to_location(course_info['classroom'], course_info['name']),  # 传入课程名用于判断
+                name=intern_text(course_info['name']),
+                teacher=intern_text(course_info['teacher']),
+                classroom=intern_text(course_info['classroom']),
+                location=resolve_location(course_info['classroom'], course_info['name']),  # 传入课程名用于判断
                 weekday=schedule['weekday'],
                 weeks=schedule['weeks'],
                 indexes=schedule['indexes']
@@ -235,70 +318,112 @@ def merge_duplicate_courses(courses):
     
     return result
 
-def parse_timetable_from_xls():
-    """从xls文件解析课表并返回Course对象列表"""
-    xls_files = glob.glob("*.xls") + glob.glob("*.xlsx")
-    if not xls_files:
-        print("未找到Excel文件")
-        return []
-    
-    file_path = xls_files[0]
-    print(f"正在解析文件: {file_path}")
-    
-    df = pd.read_excel(file_path, sheet_name=0)
-    
-    courses = []
-    
-    # 从第2行开始（索引1），第1行是星期标题
-    weekdays = []
-    for col in range(1, len(df.columns)):
-        cell_value = df.iloc[1, col]
-        if pd.notna(cell_value) and '星期' in str(cell_value):
-            weekdays.append((col, str(cell_value)))
+def cache_stats() -> dict[str, dict]:
+    """
+    各解析缓存的命中统计（当前进程内累计）：
+    {函数名: {'hits': 命中次数, 'misses': 未命中次数, 'maxsize': 容量, 'currsize': 当前条目数}}
+    """
+    return {func.__name__: func.cache_info()._asdict()
+            for func in (parse_course_info, parse_weeks, classroom_to_location, _resolve_location)}
+
+def find_weekday_header(grid: list[list[str]]) -> tuple[int, list[tuple[int, str]]]:
+    """查找星期标题行，返回 (行号, [(列号, 星期名称), ...])，未找到时行号为 -1"""
+    for row_idx, row in enumerate(grid):
+        weekdays = [(col, cell) for col, cell in enumerate(row) if col >= 1 and '星期' in cell]
+        if weekdays:
+            return row_idx, weekdays
+    return -1, []
+
+def extract_courses_from_grid(grid: list[list[str]], verbose: bool = False) -> list[dict]:
+    """
+    从二维字符串表格中提取课程时间段（尚未合并）：
+    星期列和大节行各只解析一次，随后一次取出所有非空的课程单元格，
+    相同的单元格文本（如同一课程的连续大节）只解析一次
+    """
+    # 星期标题行，其下方为各大节的课程
+    header_row, weekdays = find_weekday_header(grid)
+    
+    if verbose:
+        print(f"发现的星期列: {weekdays}")
+    
+    columns = [(col, WEEKDAY_NUMBERS[name]) for col, name in weekdays if name in WEEKDAY_NUMBERS]
+    slots = [(row, SLOT_INDEXES[row[0]]) for row in grid[header_row + 1:]
+             if columns and row and row[0] in SLOT_INDEXES]
+    
+    # 按行、列顺序取出非空单元格：(单元格文本, 星期几, 节次索引)
+    cells = [(row[col], weekday, indexes) for row, indexes in slots
+             for col, weekday in columns if col < len(row) and row[col]]
+    parsed = {text: parse_course_info(text) for text in {cell[0] for cell in cells}}
+    
+    return [{
+        'name': course_info.name,
+        'teacher': course_info.teacher,
+        'classroom': course_info.classroom,
+        'weekday': weekday,
+        'weeks': course_info.weeks,
+        'indexes': indexes,
+    } for text, weekday, indexes in cells for course_info in parsed[text]]
+
+def parse_timetable_bytes(content: bytes, name: str = "", backend: str = "auto", use_cache: bool = True,
+                          verbose: bool = False) -> list[Course]:
+    """
+    从内存中的 Excel 文件内容解析课表并返回合并后的 Course 对象列表，不读写当前目录
+    name: 原文件名（仅用于判断格式），backend 与 use_cache 见 parse_timetable_from_xls
+    """
+    merged_courses = None
+    if use_cache:
+        with profiling.stage("cache.load") as stage:
+            key = parse_cache.cache_key(content, PARSER_VERSION, default_registry().digest)
+            merged_courses = parse_cache.load(key)
+            stage.count(hits=int(merged_courses is not None))
+        if verbose and merged_courses is not None:
+            print("⚡ 已从缓存读取解析结果")
+    
+    if merged_courses is None:
+        with profiling.stage("excel.read") as stage:
+            grid = read_workbook_grid(content, backend, name)
+            stage.count(rows=len(grid))
+        with profiling.stage("extract") as stage:
+            courses = extract_courses_from_grid(grid, verbose)
+            if profiling.enabled():
+                stage.count(cells=sum(1 for row in grid for cell in row if cell), entries=len(courses))
+        
+        # 合并重复课程并转换为Course对象
+        with profiling.stage("merge") as stage:
+            merged_courses = merge_duplicate_courses(courses)
+            stage.count(courses=len(merged_courses))
+        
+        if use_cache:
+            with profiling.stage("cache.store"):
+                parse_cache.store(key, merged_courses)
+    return merged_courses
+
+def parse_timetable_from_xls(file_path: Optional[str] = None, verbose: bool = True, backend: str = "auto",
+                             use_cache: bool = True):
+    """
+    从xls文件解析课表并返回Course对象列表
+    file_path: Excel 文件路径，不提供时使用当前目录下找到的第一个文件
+    verbose: 是否打印解析过程和课程总结（批量转换时关闭）
+    backend: Excel 读取后端，见 excel_reader.read_workbook_grid
+    use_cache: 是否使用解析缓存，相同内容的文件直接读取上次的解析结果，见 parse_cache
+    """
+    if file_path is None:
+        xls_files = glob.glob("*.xls") + glob.glob("*.xlsx")
+        if not xls_files:
+            print("未找到Excel文件")
+            return []
+        file_path = xls_files[0]
+
+    if verbose:
+        print(f"正在解析文件: {file_path}")
     
-    print(f"发现的星期列: {weekdays}")
+    with open(file_path, "rb") as r:
+        content = r.read()
+    merged_courses = parse_timetable_bytes(content, file_path, backend, use_cache, verbose)
     
-    # 从第3行开始解析课程（索引2），因为第1行是标题，第2行是星期
-    for row_idx in range(2, len(df)):
-        time_slot = df.iloc[row_idx, 0]
-        if pd.isna(time_slot) or '第' not in str(time_slot):
-            continue
-            
-        time_indexes = time_slot_to_index(str(time_slot))
-        if not time_indexes:
-            continue
-        
-        # 遍历每个星期列
-        for col_idx, weekday_name in weekdays:
-            if col_idx >= len(df.columns):
-                continue
-                
-            cell_content = df.iloc[row_idx, col_idx]
-            if pd.isna(cell_content):
-                continue
-                
-            weekday_num = weekday_name_to_number(weekday_name)
-            if weekday_num == 0:
-                continue
-                
-            # 解析该单元格中的课程信息
-            course_infos = parse_course_info(str(cell_content))
-            
-            for course_info in course_infos:
-                courses.append({
-                    'name': course_info['name'],
-                    'teacher': course_info['teacher'],
-                    'classroom': course_info['classroom'],
-                    'weekday': weekday_num,
-                    'weeks': course_info['weeks'],
-                    'indexes': time_indexes
-                })
-    
-    # 合并重复课程并转换为Course对象
-    merged_courses = merge_duplicate_courses(courses)
-    
-    print(f"总共解析到 {len(merged_courses)} 门课程")
-    print_course_summary(merged_courses)
+    if verbose:
+        print(f"总共解析到 {len(merged_courses)} 门课程")
+        print_course_summary(merged_courses)
     return merged_courses
 
 def print_course_summary(courses):
@@ -318,14 +443,14 @@ def print_course_summary(courses):
                 'total_classes': 0,
                 'weekdays': set(),
                 'classrooms': set(),
-                'weeks_range': set()
+                'weeks_range': WeekSet()
             }
         
         # 计算每个时间段的总课时数
         course_stats[key]['total_classes'] += len(course.weeks)
         course_stats[key]['weekdays'].add(course.weekday)
         course_stats[key]['classrooms'].add(course.classroom)
-        course_stats[key]['weeks_range'].update(course.weeks)
+        course_stats[key]['weeks_range'] |= course.weeks
     
     weekday_names = {1: '周一', 2: '周二', 3: '周三', 4: '周四', 5: '周五', 6: '周六', 7: '周日'}
     
@@ -340,8 +465,8 @@ def print_course_summary(courses):
     for i, (key, stats) in enumerate(sorted(course_stats.items()), 1):
         name, teacher = key
         weekdays_str = '、'.join(sorted([weekday_names[wd] for wd in stats['weekdays']]))
-        weeks_list = sorted(stats['weeks_range'])
-        weeks_str = f"{min(weeks_list)}-{max(weeks_list)}周" if weeks_list else "无"
+        weeks_range = stats['weeks_range']
+        weeks_str = f"{weeks_range.first}-{weeks_range.last}周" if weeks_range else "无"
         classrooms_str = '、'.join(sorted(stats['classrooms']))
         
         print(f"{i:2d}. 📖 {name}")
@@ -1,40 +1,189 @@
+import os
 import re
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from hashlib import md5
-from typing import Any, Optional
+from typing import Any, BinaryIO, Iterable, Iterator, Optional
 
+from ics_diff import PreviousEvent, event_digest, event_uid
+from event_cache import EventCache
+from ics_fold import FoldingWriter, fold_bytes, fold_line, iter_events
+import location_index
 
-def EvenWeeks(start: int, end: int) -> list[int]:
+
+class WeekSet:
+    """
+    以整数位掩码表示的周次集合，第 n 周对应第 n 位：
+    不可变、可哈希，支持 | & - 运算、len()、in 和按周次升序迭代
+    如 WeekSet([1, 3, 5]) -> 掩码 0b101010
     """
-    返回偶数周列表
+
+    __slots__ = ("mask",)
+
+    def __init__(self, weeks: Iterable[int] = ()) -> None:
+        mask = 0
+        for week in weeks:
+            assert week > 0, "周次必须为正整数"
+            mask |= 1 << week
+        object.__setattr__(self, "mask", mask)
+
+    @classmethod
+    def from_mask(cls, mask: int) -> "WeekSet":
+        weeks = cls.__new__(cls)
+        object.__setattr__(weeks, "mask", mask & ~1)
+        return weeks
+
+    @classmethod
+    def range(cls, start: int, end: int, step: int = 1) -> "WeekSet":
+        """第 start 周到第 end 周（含），每隔 step 周一次"""
+        mask = 0
+        for week in range(start, end + 1, step):
+            mask |= 1 << week
+        return cls.from_mask(mask)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("WeekSet 不可修改")
+
+    def __iter__(self) -> Iterator[int]:
+        mask = self.mask
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    def __len__(self) -> int:
+        return self.mask.bit_count()
+
+    def __bool__(self) -> bool:
+        return bool(self.mask)
+
+    def __contains__(self, week: object) -> bool:
+        return isinstance(week, int) and week > 0 and bool(self.mask >> week & 1)
+
+    def __or__(self, other: "WeekSet") -> "WeekSet":
+        return WeekSet.from_mask(self.mask | other.mask)
+
+    def __and__(self, other: "WeekSet") -> "WeekSet":
+        return WeekSet.from_mask(self.mask & other.mask)
+
+    def __sub__(self, other: "WeekSet") -> "WeekSet":
+        return WeekSet.from_mask(self.mask & ~other.mask)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, WeekSet) and self.mask == other.mask
+
+    def __hash__(self) -> int:
+        return hash(self.mask)
+
+    def __reduce__(self):
+        return (WeekSet.from_mask, (self.mask,))
+
+    def __repr__(self) -> str:
+        return f"WeekSet({list(self)})"
+
+    def expression(self) -> str:
+        """
+        以连续区间表示的周次表达式：
+        如 WeekSet([1, 2, 3, 5, 7, 8]) -> "1-3,5,7-8"
+        """
+        parts = []
+        start = prev = None
+        for week in self:
+            if prev is not None and week == prev + 1:
+                prev = week
+                continue
+            if start is not None:
+                parts.append(f"{start}-{prev}" if prev != start else f"{start}")
+            start = prev = week
+        if start is not None:
+            parts.append(f"{start}-{prev}" if prev != start else f"{start}")
+        return ",".join(parts)
+
+    def recurrence(self) -> tuple[int, int, int, "WeekSet", "WeekSet"]:
+        """
+        将周次集合表示为每周（或隔周）重复的规则：
+        返回 (首周, 间隔周数, 重复次数, 需排除的周次, 需额外添加的周次)，
+        在间隔 1 周与 2 周中选择例外周次最少的一种，如 1-15[单周] -> (1, 2, 8, 空, 空)
+        """
+        best = None
+        for interval in (1, 2):
+            series = WeekSet.range(self.first, self.last, interval)
+            # 间隔 2 周时，与首周奇偶性不同的周次只能通过额外添加补齐
+            count = len(series)
+            excluded = series - self
+            added = self - series
+            cost = len(excluded) + len(added)
+            if best is None or cost < best[0]:
+                best = (cost, (self.first, interval, count, excluded, added))
+        return best[1]
+
+    @property
+    def first(self) -> int:
+        """最早的周次，空集合时为 0"""
+        return (self.mask & -self.mask).bit_length() - 1 if self.mask else 0
+
+    @property
+    def last(self) -> int:
+        """最晚的周次，空集合时为 0"""
+        return self.mask.bit_length() - 1 if self.mask else 0
+
+
+def EvenWeeks(start: int, end: int) -> WeekSet:
+    """
+    返回偶数周集合
     如 even_week(1, 4) -> [2, 4]
     """
-    return [i for i in range(start, end + 1) if not i % 2]
+    return WeekSet.range(start + start % 2, end, 2)
 
-def OddWeeks(start: int, end: int) -> list[int]:
+def OddWeeks(start: int, end: int) -> WeekSet:
     """
-    返回奇数周列表：
+    返回奇数周集合：
     如 odd_week(1, 4) -> [1, 3]
     """
-    return [i for i in range(start, end + 1) if i % 2]
+    return WeekSet.range(start + 1 - start % 2, end, 2)
 
-def Weeks(start: int, end: int) -> list[int]:
+def Weeks(start: int, end: int) -> WeekSet:
     """
-    返回周数列表：
+    返回周数集合：
     如 week(1, 3) -> [1, 2, 3]
     """
-    return list(range(start, end + 1))
+    return WeekSet.range(start, end)
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Course:
+    """
+    一个课程时间段：
+    不可变且不带 __dict__，批量解析时大量实例常驻内存也较为紧凑；
+    location 可以是地点名称字符串、Geo 实例或 ics 行列表（如 AppleMaps 的查询结果）
+    """
     name: str
     teacher: str
     classroom: str
     location: Any
     weekday: int
-    weeks: list[int]
-    indexes: list[int]
+    weeks: WeekSet
+    indexes: tuple[int, ...]
+
+    def __post_init__(self) -> None:
+        # 兼容直接传入周次列表、节次列表和 ics 行列表的写法
+        if not isinstance(self.weeks, WeekSet):
+            object.__setattr__(self, "weeks", WeekSet(self.weeks))
+        if not isinstance(self.indexes, tuple):
+            object.__setattr__(self, "indexes", tuple(self.indexes))
+        if isinstance(self.location, list):
+            object.__setattr__(self, "location", tuple(self.location))
+
+    def location_lines(self) -> list[str]:
+        """课程定位信息对应的 ics 行"""
+        if not self.location:
+            return []
+        if isinstance(self.location, str):
+            return [f"LOCATION:{self.location}"]
+        if isinstance(self.location, Geo):
+            return self.location.result()
+        assert isinstance(self.location, tuple), "课程定位信息类型不正确"
+        return list(self.location)
 
     def title(self) -> str:
         """
@@ -87,6 +236,11 @@ class School:
     timetable: list[tuple[int, int]]
     start: tuple[int, int, int]
     courses: list[Course]
+    compact: bool = False
+    stamp: Optional[datetime] = None
+    previous: Optional[dict[str, PreviousEvent]] = None
+    only_changed: bool = False
+    event_cache: Optional[EventCache] = None
 
     HEADERS = [
         "BEGIN:VCALENDAR",
@@ -99,6 +253,7 @@ class School:
         "TZID:Asia/Shanghai",
         "END:VTIMEZONE"]
     FOOTERS = ["END:VCALENDAR"]
+    WEEKDAY_NAMES = {1: '周一', 2: '周二', 3: '周三', 4: '周四', 5: '周五', 6: '周六', 7: '周日'}
 
     def __post_init__(self) -> None:
         assert self.timetable, "请设置每节课的上课时间，以 24 小时制两元素元组方式输入小时、分钟"
@@ -119,131 +274,282 @@ class School:
         ) + timedelta(minutes=self.duration if plus else 0)
 
     def generate(self) -> str:
-        runtime = datetime.now()
-        texts = []
+        return "\n".join(self.iter_lines())
+
+    def iter_lines(self) -> Iterator[str]:
+        """逐行生成折叠后的日历文本，见 ics_fold"""
+        for line in self.iter_content_lines():
+            yield from fold_line(line)
+
+    def iter_content_lines(self) -> Iterator[str]:
+        """
+        逐行生成未折叠的日历内容行：
+        每次只渲染一个课程事件，不在内存中保留整个日历；
+        compact 为 True 时每个课程时间段只生成一个重复事件，见 _recurring_event_lines()；
+        提供 previous 时按上一版本为事件编排 SEQUENCE，见 _sequenced()
+        """
+        runtime = self.dtstamp()
+        seen = set()
         
+        for line in self.HEADERS:
+            yield line
+        
+        for event in self._iter_events(runtime):
+            if self.previous is not None:
+                event = self._sequenced(event, seen)
+            yield from event
+        
+        if self.previous is not None and self.only_changed:
+            yield from self._cancelled_events(seen, runtime)
+        
+        for line in self.FOOTERS:
+            yield line
+
+    def _iter_events(self, runtime: datetime) -> Iterator[list[str]]:
+        """逐个生成事件的内容行"""
         # 计算每门课程的总体进度信息
         course_stats = self._calculate_course_stats()
         
         for course in self.courses:
-            if not course.location:
-                course.location = []
-            elif isinstance(course.location, str):
-                course.location = [f"LOCATION:{course.location}"]
-            elif isinstance(course.location, Geo):
-                course.location = course.location.result()
-            assert isinstance(course.location, list), "课程定位信息类型不正确"
+            yield from self._course_events(course, course_stats.get((course.name, course.teacher), {}), runtime)
+
+    def _course_events(self, course: Course, stats: dict, runtime: datetime) -> Iterator[list[str]]:
+        """一个课程时间段的所有事件，stats 为该课程的统计信息，见 _calculate_course_stats()"""
+        location = course.location_lines()
+        
+        if self.compact:
+            if course.weeks:
+                yield self._recurring_event_lines(course, location, runtime)
+            return
+        
+        for week in course.weeks:
+            # 计算当前课程的进度信息
+            progress = self._calculate_class_progress(course, week, stats, self.WEEKDAY_NAMES)
             
-        weekday_names = {1: '周一', 2: '周二', 3: '周三', 4: '周四', 5: '周五', 6: '周六', 7: '周日'}
+            yield [
+                "BEGIN:VEVENT",
+                f"SUMMARY:{course.title()}",
+                f"DESCRIPTION:{course.description(week, progress)}",
+                f"DTSTART;TZID=Asia/Shanghai:{
+                    self.time(week, course.weekday, course.indexes[0]):%Y%m%dT%H%M%S}",
+                f"DTEND;TZID=Asia/Shanghai:{
+                    self.time(week, course.weekday, course.indexes[-1], True):%Y%m%dT%H%M%S}",
+                f"DTSTAMP:{runtime:%Y%m%dT%H%M%SZ}",
+                f"UID:{self.uid(course, week)}",
+                f"URL;VALUE=URI:",
+                *location,
+                "END:VEVENT",
+            ]
+
+    @staticmethod
+    def uid(course: Course, week: Optional[int] = None) -> str:
+        """
+        事件 UID：由课程名、教师、星期、首节次和周次确定，每次生成都相同；
+        教室、时间等信息变化时 UID 不变，客户端可按 SEQUENCE 更新原事件
+        week 为空时表示精简模式下整个课程时间段的重复事件，以其首周区分
+        """
+        occurrence = week if week is not None else f"weekly-{course.weeks.first}"
+        key = "\x1f".join(map(str, (course.name, course.teacher, course.weekday, course.indexes[0], occurrence)))
+        return md5(key.encode("utf-8")).hexdigest()
+
+    def dtstamp(self) -> datetime:
+        """
+        DTSTAMP 使用的 UTC 时间：
+        优先使用 stamp，其次是环境变量 SOURCE_DATE_EPOCH（可复现构建的通用约定），否则为当前时间；
+        固定该时间后，相同的课表总是生成逐字节相同的日历
+        """
+        if self.stamp is not None:
+            return self.stamp.astimezone(timezone.utc) if self.stamp.tzinfo else self.stamp
+        epoch = os.environ.get("SOURCE_DATE_EPOCH")
+        if epoch:
+            return datetime.fromtimestamp(int(epoch), timezone.utc)
+        return datetime.now(timezone.utc)
+
+    def _sequenced(self, event: list[str], seen: set) -> list[str]:
+        """
+        对比上一版本中的同一事件：内容未变时沿用原 SEQUENCE，变化或新增时 SEQUENCE 加一；
+        only_changed 为 True 时未变化的事件返回空列表
+        """
+        uid = event_uid(event)
+        seen.add(uid)
+        previous = self.previous.get(uid)
+        if previous is not None and previous.digest == event_digest(event):
+            if self.only_changed:
+                return []
+            sequence = previous.sequence
+        else:
+            sequence = previous.sequence + 1 if previous is not None else 0
+        position = event.index(f"UID:{uid}") + 1
+        return event[:position] + [f"SEQUENCE:{sequence}"] + event[position:]
+
+    def _cancelled_events(self, seen: set, runtime: datetime) -> Iterator[str]:
+        """上一版本中存在、本次已不存在的事件，以 STATUS:CANCELLED 通知客户端删除"""
+        for uid, previous in self.previous.items():
+            if uid in seen:
+                continue
+            yield from [
+                "BEGIN:VEVENT",
+                *previous.lines,
+                f"DTSTAMP:{runtime:%Y%m%dT%H%M%SZ}",
+                f"UID:{uid}",
+                f"SEQUENCE:{previous.sequence + 1}",
+                "STATUS:CANCELLED",
+                "END:VEVENT",
+            ]
+
+    def _recurring_event_lines(self, course: Course, location: list[str], runtime: datetime) -> list[str]:
+        """
+        精简模式：一个课程时间段只生成一个按周重复的事件（单双周课程隔周重复），
+        不规则的周次通过 EXDATE/RDATE 排除或补充；由于所有周次共用一个事件，不包含逐次的课程进度
+        """
+        if not course.weeks:
+            return []
+        first, interval, count, excluded, added = course.weeks.recurrence()
+        start = lambda week: f"{self.time(week, course.weekday, course.indexes[0]):%Y%m%dT%H%M%S}"
+        if interval == 2 and count > 1 and not excluded and not added:
+            weeks_text = f"{first}-{course.weeks.last}{'单' if first % 2 else '双'}周"
+        else:
+            weeks_text = f"{course.weeks.expression()}周"
+        
+        lines = [
+            "BEGIN:VEVENT",
+            f"SUMMARY:{course.title()}",
+            f"DESCRIPTION:{course.description()}\\n上课周次：第{weeks_text}，共{len(course.weeks)}次课",
+            f"DTSTART;TZID=Asia/Shanghai:{start(first)}",
+            f"DTEND;TZID=Asia/Shanghai:{
+                self.time(first, course.weekday, course.indexes[-1], True):%Y%m%dT%H%M%S}",
+        ]
+        if count > 1:
+            lines.append(f"RRULE:FREQ=WEEKLY;INTERVAL={interval};COUNT={count}" if interval > 1
+                         else f"RRULE:FREQ=WEEKLY;COUNT={count}")
+        if excluded:
+            lines.append(f"EXDATE;TZID=Asia/Shanghai:{','.join(start(week) for week in excluded)}")
+        if added:
+            lines.append(f"RDATE;TZID=Asia/Shanghai:{','.join(start(week) for week in added)}")
+        lines += [
+            f"DTSTAMP:{runtime:%Y%m%dT%H%M%SZ}",
+            f"UID:{self.uid(course)}",
+            f"URL;VALUE=URI:",
+            *location,
+            "END:VEVENT",
+        ]
+        return lines
+
+    def write_to(self, fp: BinaryIO, buffer_size: int = 64 * 1024) -> int:
+        """
+        将日历以 UTF-8 编码流式写入二进制文件或套接字（如 socket.makefile("wb")）：
+        内容行直接按字节折叠进固定大小的缓冲区，返回写入的总字节数
+        输出内容与 generate() 的编码结果完全一致
+        设置了 event_cache 且不需要编排 SEQUENCE 时，各课程时间段的事件直接拼接缓存的字节，见 _cached_event_blocks()
+        """
+        writer = FoldingWriter(fp, buffer_size=buffer_size)
+        if self.event_cache is not None and self.previous is None:
+            writer.write_lines(self.HEADERS)
+            for block in self._cached_event_blocks(self.dtstamp()):
+                writer.write_block(block)
+            writer.write_lines(self.FOOTERS)
+        else:
+            writer.write_lines(self.iter_content_lines())
+        writer.flush()
+        return writer.written
+
+    def _cached_event_blocks(self, runtime: datetime) -> Iterator[bytes]:
+        """
+        逐个课程时间段产出其所有事件折叠并编码后的字节：
+        缓存键包含作息配置、课程时间段本身和该课程的全部上课事件（课程进度由它们决定），
+        缓存值为去掉 DTSTAMP 行后的片段，以本次的 DTSTAMP 行拼接
+        """
+        stamp = f"DTSTAMP:{runtime:%Y%m%dT%H%M%SZ}"
+        separator = b"\n" + stamp.encode("ascii") + b"\n"
+        config = (self.start_dt, tuple(self.timetable), self.duration, self.compact)
+        course_stats = self._calculate_course_stats()
         
-        coures = []
         for course in self.courses:
-            course_key = (course.name, course.teacher)
-            stats = course_stats.get(course_key, {})
-            
-            for week in course.weeks:
-                # 计算当前课程的进度信息
-                progress = self._calculate_class_progress(course, week, stats, weekday_names)
-                
-                coures.append([
-                    "BEGIN:VEVENT",
-                    f"SUMMARY:{course.title()}",
-                    f"DESCRIPTION:{course.description(week, progress)}",
-                    f"DTSTART;TZID=Asia/Shanghai:{
-                        self.time(week, course.weekday, course.indexes[0]):%Y%m%dT%H%M%S}",
-                    f"DTEND;TZID=Asia/Shanghai:{
-                        self.time(week, course.weekday, course.indexes[-1], True):%Y%m%dT%H%M%S}",
-                    f"DTSTAMP:{runtime:%Y%m%dT%H%M%SZ}",
-                    f"UID:{md5(str((course.title, week, course.weekday,
-                                   course.indexes[0])).encode()).hexdigest()}",
-                    f"URL;VALUE=URI:",
-                    *course.location,
-                    "END:VEVENT",
-                ])
-                
-        items = [i for j in coures for i in j]
-        for line in self.HEADERS + items + self.FOOTERS:
-            first = True
-            while line:
-                texts.append((" " if not first else "") + line[:72])
-                line = line[72:]
-                first = False
-        return "\n".join(texts)
-    
+            stats = course_stats.get((course.name, course.teacher), {})
+            # 精简模式的事件不包含课程进度，与同课程的其他时间段无关
+            key = (config, course, () if self.compact else tuple(stats.get('events', ())))
+            segments = self.event_cache.get(key)
+            if segments is None:
+                segments = self._event_segments(self._course_events(course, stats, runtime), stamp)
+                self.event_cache.put(key, segments)
+            if segments:
+                yield separator.join(segments)
+
+    @staticmethod
+    def _event_segments(events: Iterable[list[str]], stamp: str) -> tuple[bytes, ...]:
+        """将事件折叠编码后在 DTSTAMP 行处切开：separator.join(片段) 即为全部事件的字节"""
+        segments = []
+        current: list[bytes] = []
+        for event in events:
+            for line in event:
+                if line == stamp:
+                    segments.append(b"\n".join(current))
+                    current = []
+                else:
+                    current.append(fold_bytes(line))
+        if current:
+            segments.append(b"\n".join(current))
+        return tuple(segments)
+
     def _calculate_course_stats(self) -> dict:
-        """计算每门课程的统计信息"""
+        """
+        计算每门课程的统计信息：
+        events 为该课程所有上课事件 (周次, 星期) 的有序索引，供进度查询二分使用
+        """
         course_stats = {}
         
         for course in self.courses:
             key = (course.name, course.teacher)
             if key not in course_stats:
                 course_stats[key] = {
-                    'all_weeks': set(),
+                    'all_weeks': WeekSet(),
                     'weekdays': set(),
-                    'schedules': []
+                    'schedules': [],
+                    'events': []
                 }
             
-            course_stats[key]['all_weeks'].update(course.weeks)
+            course_stats[key]['all_weeks'] |= course.weeks
             course_stats[key]['weekdays'].add(course.weekday)
             course_stats[key]['schedules'].append({
                 'weekday': course.weekday,
                 'weeks': course.weeks,
                 'indexes': course.indexes
             })
+            course_stats[key]['events'].extend((week, course.weekday) for week in course.weeks)
+        
+        # 按周次和星期排序，每门课程只排序一次
+        for stats in course_stats.values():
+            stats['events'].sort()
         
         return course_stats
     
     def _calculate_class_progress(self, course, current_week: int, stats: dict, weekday_names: dict) -> dict:
         """计算具体某次课的进度信息"""
-        course_key = (course.name, course.teacher)
-        
-        # 获取这门课程在当前时间段的所有周次
-        current_schedule_weeks = sorted(course.weeks)
-        
-        # 获取这门课程的所有时间段的所有周次和时间安排
-        all_course_events = []
-        for schedule in stats.get('schedules', []):
-            for week in schedule['weeks']:
-                all_course_events.append((week, schedule['weekday']))
-        
-        # 按周次和星期排序
-        all_course_events.sort()
+        # 这门课程所有时间段的上课事件，已按周次和星期排序
+        all_course_events = stats.get('events', [])
         total_classes = len(all_course_events)
         
-        # 计算当前是第几次课（在整门课程中）
-        current_class_num = 0
-        for week, weekday in all_course_events:
-            if week < current_week or (week == current_week and weekday <= course.weekday):
-                current_class_num += 1
-            else:
-                break
-        
-        # 计算本周的课程进度（考虑本周所有的课程时间段）
-        week_total = 0
-        week_current = 0
+        # 当前是第几次课（在整门课程中）：不晚于本次课的事件数
+        current_class_num = bisect_right(all_course_events, (current_week, course.weekday))
         
-        # 统计本周这门课的所有时间段
-        this_week_events = [(week, weekday) for week, weekday in all_course_events if week == current_week]
-        week_total = len(this_week_events)
+        # 本周这门课的所有时间段位于 [week_start, week_end) 区间
+        week_start = bisect_left(all_course_events, (current_week, 0))
+        week_end = bisect_left(all_course_events, (current_week + 1, 0))
+        week_total = week_end - week_start
         
-        # 计算本周已上的课程数（到当前星期为止）
-        for week, weekday in this_week_events:
-            if weekday <= course.weekday:
-                week_current += 1
+        # 本周已上的课程数（到当前星期为止）
+        week_current = current_class_num - week_start
         
         if week_total == 0:
             week_total = 1
             week_current = 0
         
-        # 查找下次上课时间
+        # 下次上课即紧随本次课之后的事件
         next_class_info = ""
-        next_event = None
-        
-        # 在所有事件中查找下次上课
-        for week, weekday in all_course_events:
-            if week > current_week or (week == current_week and weekday > course.weekday):
-                next_event = (week, weekday)
-                break
+        if current_class_num < total_classes:
+            next_event = all_course_events[current_class_num]
+        else:
+            next_event = None
         
         if next_event:
             next_week, next_weekday = next_event
@@ -277,7 +583,7 @@ class School:
         }
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Geo:
     """
     仅提供坐标和地点名称的地点信息：
@@ -299,27 +605,23 @@ class AppleMaps:
     """
     Apple Maps 地点信息：
     传入预先准备好的 ics 文件地址，自动分析
+    单次遍历流式解析日历，解析结果保存在地点索引缓存中（见 location_index），文件未变化时直接读取
     """
 
     KEYS = ["SUMMARY", "LOCATION", "X-APPLE-STRUCTURED-LOCATION"]
 
-    def __init__(self, calendar: str) -> None:
-        self.locations: dict[str, dict[str, str]] = {}
+    def __init__(self, calendar: str, use_cache: bool = True) -> None:
+        self.locations: dict[str, tuple[str, ...]] = (location_index.load(calendar) if use_cache else None) or {}
+        if self.locations:
+            return
         with open(calendar, encoding = "utf-8") as r:
-            c = r.read()
-        for i in re.findall(r"(?<=BEGIN:VEVENT)[\s\S]*?(?=END:VEVENT)", c):
-            self.generate(i)
-
-    def generate(self, event: str) -> None:
-        lines = event.split("\n")
-        for i, e in enumerate(lines):
-            if not e.startswith(" "):
-                continue
-            d = i - 1
-            while not lines[d]:
-                d -= 1
-            lines[d] += e.removeprefix(" ")
-            lines[i] = ""
+            for lines in iter_events(r):
+                self.generate(lines)
+        if use_cache:
+            location_index.store(calendar, self.locations)
+
+    def generate(self, lines: list[str]) -> None:
+        """从一个事件展开后的内容行中提取地点名称和定位信息"""
         data = {k: next((i for i in lines if i.startswith(k)), "")
                 for k in self.KEYS}
         if not all(data.values()):
@@ -329,11 +631,11 @@ class AppleMaps:
                          data["X-APPLE-STRUCTURED-LOCATION"])
         if geo:
             data["GEO"] = Geo(title, geo[0][0], geo[0][1]).geo
-        self.locations[title] = data
+        self.locations[title] = tuple(data.values())
 
-    def __getitem__(self, key: str) -> list[str]:
+    def __getitem__(self, key: str) -> tuple[str, ...]:
         try:
-            return list(self.locations[key].values())
+            return self.locations[key]
         except KeyError:
             ke = KeyError(f"没有找到 {key!r} 的 Apple Maps 信息")
             try:
@@ -1,7 +1,8 @@
+import sys
 from course_parser import parse_timetable_from_xls
 
 # 测试解析的课程
-courses = parse_timetable_from_xls()
+courses = parse_timetable_from_xls(use_cache="--no-cache" not in sys.argv)
 
 print("解析的课程详情:")
 for i, course in enumerate(courses[:5], 1):  # 只显示前5个课程
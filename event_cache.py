@@ -0,0 +1,81 @@
+"""
+事件渲染缓存：
+同一班级的学生拥有完全相同的课程时间段，批量转换或订阅服务中同一时间段的事件会被反复渲染；
+缓存以「学校作息配置 + 课程时间段 + 该课程的全部上课事件（决定课程进度）」为键，
+保存该时间段所有 VEVENT 折叠并编码后的字节，组装日历时只需拼接
+
+DTSTAMP 每次生成都可能不同，不存入缓存：缓存值为以 DTSTAMP 行为分隔的字节片段，见 School.write_to()
+"""
+
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Hashable, Optional
+
+# 缓存总字节数与条目数上限，超出后按最近使用顺序淘汰
+MAX_BYTES = 32 * 1024 * 1024
+MAX_ENTRIES = 16384
+
+
+class EventCache:
+    """按总字节数和条目数淘汰的 LRU 缓存：值为字节片段元组，可在多个线程中共用（如订阅服务的渲染线程池）"""
+
+    def __init__(self, max_bytes: int = MAX_BYTES, max_entries: int = MAX_ENTRIES) -> None:
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.total = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, tuple[bytes, ...]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[tuple[bytes, ...]]:
+        with self._lock:
+            segments = self._entries.get(key)
+            if segments is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return segments
+
+    def put(self, key: Hashable, segments: tuple[bytes, ...]) -> None:
+        size = sum(map(len, segments))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total -= sum(map(len, old))
+            self._entries[key] = segments
+            self.total += size
+            while self.total > self.max_bytes or len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                self.total -= sum(map(len, evicted))
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.total = 0
+
+    def cache_info(self) -> dict:
+        """命中统计，字段与 functools.lru_cache 的 cache_info() 一致，另有淘汰次数和总字节数"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'maxsize': self.max_entries,
+            'currsize': len(self._entries),
+            'evictions': self.evictions,
+            'bytes': self.total,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+@lru_cache(maxsize=None)
+def shared_cache() -> EventCache:
+    """进程内共享的事件渲染缓存（批量转换的每个工作进程各有一份）"""
+    return EventCache()
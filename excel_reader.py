@@ -0,0 +1,113 @@
+"""
+轻量 Excel 读取：
+将课表工作表的第一个 sheet 读取为二维字符串表格，空单元格为空字符串
+.xls 直接使用 xlrd，.xlsx 使用 openpyxl 只读模式，均不依赖 pandas；
+仅当对应库不可用或显式指定时才回退到 pandas
+"""
+
+import os
+from io import BytesIO
+
+BACKENDS = ("auto", "xlrd", "openpyxl", "pandas")
+
+# 文件头魔数：.xls 为 OLE2 复合文档，.xlsx 为 zip 压缩包
+OLE2_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+ZIP_MAGIC = b"PK\x03\x04"
+
+
+def cell_to_str(value) -> str:
+    """将单元格值转换为字符串，空值转换为空字符串，整数值的浮点数去掉小数部分"""
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        if value != value:  # NaN
+            return ""
+        if value.is_integer():
+            return str(int(value))
+    return str(value)
+
+
+def detect_format(content: bytes, name: str = "") -> str:
+    """根据文件头（其次是文件名的扩展名）选择读取后端"""
+    if content.startswith(OLE2_MAGIC):
+        return "xlrd"
+    if content.startswith(ZIP_MAGIC):
+        return "openpyxl"
+    return "openpyxl" if name.lower().endswith(".xlsx") else "xlrd"
+
+
+def detect_backend(file_path: str) -> str:
+    """根据文件头（其次是扩展名）选择读取后端"""
+    with open(file_path, "rb") as r:
+        head = r.read(8)
+    return detect_format(head, file_path)
+
+
+def read_with_xlrd(content: bytes) -> list[list[str]]:
+    """使用 xlrd 读取 .xls (BIFF) 文件内容"""
+    import xlrd
+
+    book = xlrd.open_workbook(file_contents=content, on_demand=True)
+    try:
+        sheet = book.sheet_by_index(0)
+        return [[cell_to_str(v) for v in sheet.row_values(row)] for row in range(sheet.nrows)]
+    finally:
+        book.release_resources()
+
+
+def read_with_openpyxl(content: bytes) -> list[list[str]]:
+    """使用 openpyxl 只读模式读取 .xlsx 文件内容"""
+    import openpyxl
+
+    book = openpyxl.load_workbook(BytesIO(content), read_only=True, data_only=True)
+    try:
+        sheet = book.worksheets[0]
+        return [[cell_to_str(v) for v in row] for row in sheet.iter_rows(values_only=True)]
+    finally:
+        book.close()
+
+
+def read_with_pandas(content: bytes) -> list[list[str]]:
+    """使用 pandas 读取（兼容回退路径）"""
+    import pandas as pd
+
+    df = pd.read_excel(BytesIO(content), sheet_name=0, header=None)
+    return [[cell_to_str(v) for v in row] for row in df.to_numpy(dtype=object).tolist()]
+
+
+READERS = {
+    "xlrd": read_with_xlrd,
+    "openpyxl": read_with_openpyxl,
+    "pandas": read_with_pandas,
+}
+
+
+def read_workbook_grid(content: bytes, backend: str = "auto", name: str = "") -> list[list[str]]:
+    """
+    将内存中的 Excel 文件内容的第一个工作表读取为二维字符串表格，不经过磁盘
+    backend: auto（按文件格式选择 xlrd/openpyxl，库不可用时回退到 pandas）、xlrd、openpyxl 或 pandas
+    name: 原文件名，文件头无法识别格式时按扩展名判断
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"不支持的 Excel 读取后端：{backend}，可选：{', '.join(BACKENDS)}")
+    if not content:
+        raise ValueError("Excel 文件内容为空")
+
+    if backend != "auto":
+        return READERS[backend](content)
+
+    try:
+        return READERS[detect_format(content, name)](content)
+    except ImportError:
+        return read_with_pandas(content)
+
+
+def read_sheet_grid(file_path: str, backend: str = "auto") -> list[list[str]]:
+    """读取 Excel 文件第一个工作表为二维字符串表格，backend 见 read_workbook_grid"""
+    if backend not in BACKENDS:
+        raise ValueError(f"不支持的 Excel 读取后端：{backend}，可选：{', '.join(BACKENDS)}")
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"找不到文件：{file_path}")
+
+    with open(file_path, "rb") as r:
+        return read_workbook_grid(r.read(), backend, file_path)
@@ -0,0 +1,70 @@
+"""
+增量更新：
+读取上一次生成的 .ics 文件，记录每个事件的 UID、SEQUENCE 和内容摘要；
+重新生成时内容未变的事件沿用原 SEQUENCE，内容变化的事件 SEQUENCE 加一，
+日历客户端据此只更新发生变化的事件（如教室调整）
+"""
+
+import os
+from dataclasses import dataclass
+from hashlib import md5
+from typing import Iterable, Optional
+
+from ics_fold import iter_events
+
+# 不参与内容比较的属性：每次生成都会变化，或由本模块维护
+VOLATILE_PROPERTIES = ("DTSTAMP", "SEQUENCE")
+
+# 只包含变化事件的日历文件后缀，如 课表.ics -> 课表.changes.ics
+CHANGES_SUFFIX = ".changes.ics"
+
+# 取消事件时需要从上一版本中保留的属性
+CANCEL_PROPERTIES = ("SUMMARY", "DTSTART", "DTEND")
+
+
+@dataclass(frozen=True, slots=True)
+class PreviousEvent:
+    """上一版本日历中的一个事件"""
+    sequence: int
+    digest: str
+    lines: tuple[str, ...]  # 取消该事件时需要保留的内容行
+
+
+def property_name(line: str) -> str:
+    """内容行的属性名，如 DTSTART;TZID=Asia/Shanghai:... -> DTSTART"""
+    return line.split(":", 1)[0].split(";", 1)[0].upper()
+
+
+def event_digest(lines: Iterable[str]) -> str:
+    """事件内容摘要（忽略 DTSTAMP、SEQUENCE 等易变属性）"""
+    content = "\n".join(line for line in lines if property_name(line) not in VOLATILE_PROPERTIES)
+    return md5(content.encode("utf-8")).hexdigest()
+
+
+def event_uid(lines: Iterable[str]) -> Optional[str]:
+    return next((line[4:] for line in lines if line.startswith("UID:")), None)
+
+
+def read_event_index(physical_lines: Iterable[str]) -> dict[str, PreviousEvent]:
+    """从 .ics 文件的物理行中读取事件索引：UID -> PreviousEvent"""
+    index = {}
+    for lines in iter_events(physical_lines):
+        uid = event_uid(lines)
+        if not uid:
+            continue
+        sequence = next((int(line[9:]) for line in lines
+                         if line.startswith("SEQUENCE:") and line[9:].isdigit()), 0)
+        keep = tuple(line for line in lines if property_name(line) in CANCEL_PROPERTIES)
+        index[uid] = PreviousEvent(sequence, event_digest(["BEGIN:VEVENT", *lines, "END:VEVENT"]), keep)
+    return index
+
+
+def load_event_index(path: str) -> dict[str, PreviousEvent]:
+    """读取上一次生成的 .ics 文件的事件索引"""
+    with open(path, encoding="utf-8") as r:
+        return read_event_index(r)
+
+
+def changes_path(path: str) -> str:
+    """只包含变化事件的日历文件路径"""
+    return os.path.splitext(path)[0] + CHANGES_SUFFIX
@@ -0,0 +1,148 @@
+"""
+RFC 5545 行折叠与展开、事件切分：
+内容行按 UTF-8 编码后的字节数折叠，每个物理行不超过 75 个字节（不含换行符），
+续行以一个空格开头，且不会在多字节 UTF-8 字符中间断开
+"""
+
+from typing import BinaryIO, Iterable, Iterator, Optional
+
+# 每个物理行允许的最大字节数（不含换行符）
+FOLD_LIMIT = 75
+
+
+def fold_points(data: bytes, limit: int = FOLD_LIMIT) -> Iterator[tuple[int, int]]:
+    """
+    计算折叠位置，逐个产出每个物理行内容在 data 中的 [start, end) 区间：
+    首行最多 limit 字节，续行因开头的空格最多 limit - 1 字节
+    """
+    start = 0
+    width = limit
+    size = len(data)
+    while size - start > width:
+        end = start + width
+        # 回退到 UTF-8 字符边界（续字节形如 0b10xxxxxx）
+        while data[end] & 0xC0 == 0x80:
+            end -= 1
+        yield start, end
+        start = end
+        width = limit - 1
+    yield start, size
+
+
+def fold_line(line: str) -> list[str]:
+    """将一个内容行折叠为若干物理行，续行以空格开头"""
+    if line.isascii() and len(line) <= FOLD_LIMIT:
+        return [line]
+    data = line.encode("utf-8")
+    if len(data) <= FOLD_LIMIT:
+        return [line]
+    return [(" " if start else "") + data[start:end].decode("utf-8")
+            for start, end in fold_points(data)]
+
+
+def fold_bytes(line: str, newline: bytes = b"\n") -> bytes:
+    """将一个内容行编码并折叠为物理行字节（与 FoldingWriter 的输出一致）"""
+    data = line.encode("utf-8")
+    if len(data) > FOLD_LIMIT:
+        data = (newline + b" ").join([data[start:end] for start, end in fold_points(data)])
+    return data
+
+
+def unfold_lines(physical_lines: Iterable[str]) -> Iterator[str]:
+    """
+    展开折叠行：逐行读取物理行（可以直接传入打开的文件），
+    将以空格或制表符开头的续行拼接到上一个内容行，单次遍历产出完整的内容行
+    """
+    parts: list[str] = []
+    for line in physical_lines:
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t"):
+            parts.append(line[1:])
+            continue
+        if parts:
+            yield "".join(parts)
+        parts = [line]
+    if parts:
+        yield "".join(parts)
+
+
+def iter_events(physical_lines: Iterable[str], component: str = "VEVENT") -> Iterator[list[str]]:
+    """
+    流式切分日历组件：单次遍历展开后的内容行，
+    逐个产出 BEGIN:<component> 与 END:<component> 之间的内容行（不含这两行）
+    """
+    begin, end = f"BEGIN:{component}", f"END:{component}"
+    lines: Optional[list[str]] = None
+    for line in unfold_lines(physical_lines):
+        if line == begin:
+            lines = []
+        elif line == end:
+            if lines is not None:
+                yield lines
+            lines = None
+        elif lines is not None:
+            lines.append(line)
+
+
+class FoldingWriter:
+    """
+    折叠并写入内容行：
+    内容行编码后按字节区间折叠（不会像按字符切片那样反复复制剩余内容），
+    暂存的物理行累计达到 buffer_size 字节时一次性写入 fp，内存占用有上限
+    """
+
+    def __init__(self, fp: BinaryIO, newline: bytes = b"\n", buffer_size: int = 64 * 1024) -> None:
+        self.fp = fp
+        self.newline = newline
+        self.continuation = newline + b" "
+        self.buffer_size = buffer_size
+        self.written = 0
+        self._pending: list[bytes] = []
+        self._pending_size = 0
+        self._first = True
+
+    def write_line(self, line: str) -> None:
+        """写入一个内容行（行与行之间以 newline 分隔，末尾不追加换行）"""
+        self.write_lines((line,))
+
+    def write_lines(self, lines: Iterable[str]) -> None:
+        """依次写入多个内容行，循环内只使用局部变量，适合整份日历的批量写入"""
+        pending = self._pending
+        append = pending.append
+        continuation = self.continuation
+        separator = len(self.newline)
+        buffer_size = self.buffer_size
+        size = self._pending_size
+
+        for line in lines:
+            data = line.encode("utf-8")
+            if len(data) > FOLD_LIMIT:
+                data = continuation.join([data[start:end] for start, end in fold_points(data)])
+            append(data)
+            size += len(data) + separator
+            if size >= buffer_size:
+                self._pending_size = size
+                self.flush()
+                size = 0
+
+        self._pending_size = size
+
+    def write_block(self, data: bytes) -> None:
+        """写入已折叠并编码的若干物理行（行间以 newline 分隔，首尾不含换行），如缓存的事件"""
+        self._pending.append(data)
+        self._pending_size += len(data) + len(self.newline)
+        if self._pending_size >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """将暂存的物理行写入 fp"""
+        if not self._pending:
+            return
+        chunk = self.newline.join(self._pending)
+        if not self._first:
+            chunk = self.newline + chunk
+        self._first = False
+        self.fp.write(chunk)
+        self.written += len(chunk)
+        self._pending.clear()
+        self._pending_size = 0
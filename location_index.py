@@ -0,0 +1,70 @@
+"""
+地点索引缓存：
+将从 Apple Maps 日历导出文件中解析出的地点表（地点名 -> 定位信息行）保存为 JSON，
+以源文件的修改时间、大小和 SHA-256 为版本；源文件未变化时直接读取，无需重新解析日历
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Optional
+
+INDEX_SUFFIX = ".locations"
+
+
+def file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as r:
+        for block in iter(lambda: r.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def index_path(source: str, cache_dir: Optional[str] = None) -> str:
+    """索引文件路径：按源文件的绝对路径区分"""
+    if cache_dir is None:
+        from parse_cache import CACHE_DIR
+        cache_dir = CACHE_DIR
+    name = hashlib.sha256(os.path.abspath(source).encode("utf-8")).hexdigest()[:32]
+    return os.path.join(cache_dir, name + INDEX_SUFFIX)
+
+
+def load(source: str, cache_dir: Optional[str] = None) -> Optional[dict[str, tuple[str, ...]]]:
+    """
+    读取地点索引，源文件已变化或索引不存在时返回 None
+    修改时间和大小一致时直接使用；只有修改时间变化时再比较内容摘要（如文件被复制或 touch）
+    """
+    path = index_path(source, cache_dir)
+    try:
+        with open(path, encoding="utf-8") as r:
+            index = json.load(r)
+        stat = os.stat(source)
+        if (index["mtime_ns"], index["size"]) != (stat.st_mtime_ns, stat.st_size):
+            if index["size"] != stat.st_size or index["sha256"] != file_digest(source):
+                return None
+            store(source, index["locations"], cache_dir, index["sha256"])
+        return {title: tuple(lines) for title, lines in index["locations"].items()}
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def store(source: str, locations: dict[str, tuple[str, ...]], cache_dir: Optional[str] = None,
+          sha256: Optional[str] = None) -> None:
+    """写入地点索引（先写临时文件再原子替换），写入失败时忽略"""
+    path = index_path(source, cache_dir)
+    try:
+        stat = os.stat(source)
+        index = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": sha256 or file_digest(source),
+            "locations": locations,
+        }
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as w:
+            json.dump(index, w, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
@@ -2,17 +2,43 @@
 ## 山东科技大学版
 ## 使用方式：在强制教育系统中，选择打印课表，将下载的xls文件放在此文件夹中，运行start.cmd即可
 
-from data import AppleMaps, Course, EvenWeeks, Geo, OddWeeks, School, Weeks
+# 注意：requests、qrcode 等较重的依赖只在需要它们的阶段导入，
+# 以缩短首次出现提示前的等待时间（见 benchmarks/bench_startup.py）
+
 from course_parser import parse_timetable_from_xls
-from upload_and_qr import upload_and_generate_qr, display_results
+from convert import build_school, calendar_bytes
+from ics_diff import changes_path, load_event_index
+import profiling
+import argparse
 import glob
 import os
-import shutil
 import re
 from datetime import datetime
 
+parser = argparse.ArgumentParser(description="SDUST 课表生成器")
+parser.add_argument('file', nargs='?', help='课表 Excel 文件路径（也可直接将文件拖到程序上）')
+parser.add_argument('--no-upload', action='store_true', help='只生成 .ics 文件，不上传也不生成二维码')
+parser.add_argument('--force-upload', action='store_true', help='即使课表内容未变化也重新上传（默认沿用之前仍有效的链接）')
+parser.add_argument('--no-cache', action='store_true', help='不使用解析缓存，强制重新解析课表文件')
+parser.add_argument('--compact', action='store_true', help='精简模式：每个课程时间段只生成一个重复事件，文件更小但不含逐次课程进度')
+parser.add_argument('-o', '--output', default='课表.ics', help='生成的 .ics 文件路径 (默认: 课表.ics)')
+parser.add_argument('--incremental', action='store_true', help='增量更新：沿用上次生成的 .ics 文件中事件的 SEQUENCE，并另存只含变化事件的 .changes.ics')
+parser.add_argument('--profile', nargs='?', const=profiling.DEFAULT_REPORT, metavar='REPORT',
+                    help=f'记录各阶段耗时与内存峰值并写出 JSON 报告（默认: {profiling.DEFAULT_REPORT}，也可设置环境变量 {profiling.PROFILE_ENV}）')
+parser.add_argument('--profiler', choices=profiling.HOOKS,
+                    help=f'同时使用 cProfile 或 pyinstrument 分析（也可设置环境变量 {profiling.PROFILER_ENV}）')
+args = parser.parse_args()
+
+# 性能分析（默认关闭）
+profile_session = profiling.session_from(args.profile, args.profiler)
+if profile_session:
+    profile_session.start()
+
 # 检查是否存在xls文件
-xls_files = glob.glob("*.xls") + glob.glob("*.xlsx")
+if args.file:
+    xls_files = [args.file]
+else:
+    xls_files = glob.glob("*.xls") + glob.glob("*.xlsx")
 print(f"SDUST 课表生成器")
 print(f"https://github.com/RavelloH/sdust-ical-timetable")
 print("")
@@ -46,17 +72,9 @@ def show_help_and_get_file():
         # 移除可能的引号
         file_path = file_path.strip('"\'')
         
-        # 检查文件是否存在
+        # 检查文件是否存在（直接读取原文件，不复制到当前目录）
         if os.path.exists(file_path) and (file_path.endswith('.xls') or file_path.endswith('.xlsx')):
-            # 复制文件到当前目录
-            filename = os.path.basename(file_path)
-            try:
-                shutil.copy2(file_path, filename)
-                print(f"✅ 文件已复制到当前目录：{filename}")
-                return filename
-            except Exception as e:
-                print(f"❌ 文件复制失败：{e}")
-                continue
+            return file_path
         else:
             print("❌ 文件不存在或格式不正确，请确保文件是.xls或.xlsx格式")
             continue
@@ -69,7 +87,8 @@ print(f"找到课表文件: {xls_files[0]}")
 print("正在解析课表...")
 
 # 自动解析课程
-auto_courses = parse_timetable_from_xls()
+with profiling.stage("parse"):
+    auto_courses = parse_timetable_from_xls(xls_files[0], use_cache=not args.no_cache)
 
 if not auto_courses:
     print("错误：未能解析到任何课程信息！")
@@ -126,42 +145,49 @@ print()
 
 # 定位靠IOS了，安卓不支持
 
-school = School(
-    duration=110,   # 每节课时间为 110 分钟
-    timetable=[
-        (8, 0),     # 第1节课开始时间
-        (8, 0),     # 第2节课开始时间（第一大节的第二节）
-        (10, 10),   # 第3节课开始时间  
-        (10, 10),   # 第4节课开始时间（第二大节的第二节）
-        (14, 0),    # 第5节课开始时间
-        (14, 0),    # 第6节课开始时间（第三大节的第二节）
-        (16, 10),   # 第7节课开始时间
-        (16, 10),   # 第8节课开始时间（第四大节的第二节）
-        (19, 0),    # 第9节课开始时间
-        (19, 0),    # 第10节课开始时间（第五大节的第二节）
-    ],
-    start=start_date,  # 使用用户输入的开学时间
-    courses=auto_courses  # 使用自动解析的课程列表
-)
-
-with open("课表.ics", "w", encoding = "utf-8") as w:
-    w.write(school.generate())
-
-print("✅ 课表.ics 文件生成成功！")
+# 按山东科技大学作息时间（见 course_parser.SDUST_TIMETABLE）生成日历，--compact 时使用 RRULE 重复事件
+school = build_school(auto_courses, start_date, compact=args.compact)
+
+if args.incremental and os.path.exists(args.output):
+    # 增量更新：未变化的课程沿用原 SEQUENCE，变化的课程 SEQUENCE 加一
+    with profiling.stage("generate.changes") as stage:
+        school.previous = load_event_index(args.output)
+        school.only_changed = True
+        with open(changes_path(args.output), "wb") as w:
+            stage.count(bytes=school.write_to(w))
+        school.only_changed = False
+    print(f"🔄 已生成只包含变化课程的 {changes_path(args.output)}")
+
+# 日历内容只生成一次：写入文件，上传时直接使用内存中的内容
+with profiling.stage("generate") as stage:
+    calendar = calendar_bytes(school)
+    with open(args.output, "wb") as w:
+        w.write(calendar)
+    stage.count(bytes=len(calendar), courses=len(auto_courses),
+                events=len(auto_courses) if args.compact else sum(len(course.weeks) for course in auto_courses))
+
+print(f"✅ {args.output} 文件生成成功！")
 print("📅 现在可以将此文件导入到你的日历应用中（如手机日历、Outlook等）")
 print("📚 课程信息已按照实际的上课时间和周次安排好")
 print("📱 IOS用户请勿使用相机直接扫码，这样会自动订阅此地址，无法自己修改课程信息。")
 print("📱 请在主屏幕下滑，搜索“扫码器”，添加到日历即可")
 
-# 自动上传并生成二维码
-print("\n🚀 正在上传课表并生成二维码...")
-upload_result = upload_and_generate_qr("课表.ics", expired_hours=168)  # 7天后过期
-display_results(upload_result)
+if not args.no_upload:
+    # 自动上传并生成二维码（此时才导入 requests、qrcode）
+    from upload_and_qr import upload_and_generate_qr, display_results
+
+    print("\n🚀 正在上传课表并生成二维码...")
+    upload_result = upload_and_generate_qr(args.output, expired_hours=168, use_ledger=not args.force_upload,
+                                           content=calendar)  # 7天后过期
+    display_results(upload_result)
 
 print("\n" + "="*60)
 print("🎉 所有任务完成！")
 print("📁 生成的文件：")
-print("   - 课表.ics：可导入日历的课表文件")
-print("   - 课表二维码.png：扫码导入用的二维码图片")
+print(f"   - {args.output}：可导入日历的课表文件")
+if not args.no_upload:
+    print("   - 课表二维码.png：扫码导入用的二维码图片")
 print("="*60)
+if profile_session:
+    profile_session.finish()
 input("\n📱 按回车键退出程序...")
@@ -0,0 +1,122 @@
+"""
+内容寻址的日历输出存储：
+同一班级的学生课表完全相同，批量转换时逐个渲染、逐个上传是重复劳动。
+渲染前先对「排序后的课程时间段 + 学校作息配置」计算摘要，
+每个不同的日历只渲染一次，保存为 <输出目录>/.store/<摘要前两位>/<摘要>.ics，
+学生的输出文件以硬链接指向该文件（不支持硬链接时复制），
+并在 store_manifest.json 中记录每个输出文件对应的摘要，供上传等后续步骤按摘要去重
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from typing import Callable, Iterable
+
+from data import Course
+from parse_cache import encode_location
+
+STORE_DIR = ".store"
+MANIFEST_NAME = "store_manifest.json"
+
+# 日历渲染方式变化时递增，使已有的存储对象失效
+STORE_VERSION = 1
+
+
+def course_key(course: Course) -> list:
+    """课程时间段的规范化表示（可 JSON 序列化），周次使用位掩码"""
+    return [course.name, course.teacher, course.classroom, encode_location(course.location),
+            course.weekday, course.weeks.mask, list(course.indexes)]
+
+
+def canonical_courses(courses: Iterable[Course]) -> list[Course]:
+    """
+    按规范化表示排序：课程相同、仅顺序不同的课表得到相同的摘要，
+    渲染时也使用排序后的列表，保证同一摘要的日历内容相同
+    """
+    return sorted(courses, key=lambda course: json.dumps(course_key(course), ensure_ascii=False))
+
+
+def timetable_digest(courses: list[Course], duration: int, timetable: list[tuple[int, int]],
+                     start: tuple[int, int, int], compact: bool = False) -> str:
+    """课表摘要：courses 应为 canonical_courses() 的结果，其余参数与 School 的同名字段一致"""
+    payload = {
+        'version': STORE_VERSION,
+        'config': [duration, [list(t) for t in timetable], list(start[:3]), compact],
+        'courses': [course_key(course) for course in courses],
+    }
+    encoded = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class OutputStore:
+    """按摘要保存渲染好的日历文件；多个进程可同时写入（先写临时文件再原子替换）"""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def object_path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest + ".ics")
+
+    def put(self, digest: str, render: Callable[[object], int]) -> bool:
+        """
+        摘要对应的文件不存在时调用 render(文件对象) 渲染并保存，如 School.write_to
+        返回是否进行了渲染
+        """
+        path = self.object_path(digest)
+        if os.path.exists(path):
+            return False
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as w:
+                render(w)
+            os.chmod(tmp_path, 0o644)  # mkstemp 创建的文件只有所有者可读写
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return True
+
+    def link(self, digest: str, target: str) -> bool:
+        """
+        将 target 指向摘要对应的文件：优先创建硬链接，跨文件系统等无法链接时复制
+        返回是否为硬链接
+        """
+        source = self.object_path(digest)
+        os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+        if os.path.lexists(target):
+            if os.path.exists(target) and os.path.samefile(source, target):
+                return True
+            os.unlink(target)
+        try:
+            os.link(source, target)
+            return True
+        except OSError:
+            shutil.copyfile(source, target)
+            return False
+
+
+def write_manifest(path: str, outputs: dict[str, str]):
+    """写出 {输出文件相对路径: 摘要} 清单"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as w:
+        json.dump(dict(sorted(outputs.items())), w, ensure_ascii=False, indent=1)
+    os.chmod(tmp_path, 0o644)
+    os.replace(tmp_path, path)
+
+
+def load_manifest(path: str) -> dict[str, str]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as r:
+        return json.load(r)
+
+
+def dedupe_ratio(total: int, distinct: int) -> float:
+    """去重比例：因内容相同而省去的渲染（或上传）次数占总数的比例"""
+    return 1 - distinct / total if total else 0.0
@@ -0,0 +1,152 @@
+"""
+课表解析结果缓存：
+以 Excel 文件内容的 SHA-256 与解析器版本号为键，将合并后的 Course 列表
+以压缩 JSON 形式保存在本地缓存目录，重复转换同一文件时无需再次解析 Excel
+缓存按总大小上限进行 LRU 淘汰（以文件修改时间记录最近使用时间）
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import zlib
+from typing import Optional
+
+from data import Course, Geo, WeekSet
+
+# 缓存目录，可通过环境变量 SDUST_CACHE_DIR 修改
+CACHE_DIR = os.environ.get("SDUST_CACHE_DIR") or os.path.join(
+    os.path.expanduser("~"), ".cache", "sdust-ical-timetable")
+
+# 缓存总大小上限（字节），超出后按最近使用时间淘汰
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+CACHE_SUFFIX = ".courses"
+
+# 每写入若干次缓存才扫描一次缓存目录进行淘汰，避免批量转换时反复扫描
+EVICT_INTERVAL = 64
+
+_stores_since_evict = 0
+
+
+def cache_key(workbook: bytes, parser_version: int, registry_digest: str = "") -> str:
+    """根据 Excel 文件内容、解析器版本和建筑登记表摘要计算缓存键（登记表修改后缓存随之失效）"""
+    digest = hashlib.sha256(f"parser-v{parser_version}\0{registry_digest}\0".encode())
+    digest.update(workbook)
+    return digest.hexdigest()
+
+
+def encode_location(location):
+    """定位信息转换为 JSON 值：字符串原样保存，Geo 保存为对象，多行定位保存为数组"""
+    if isinstance(location, Geo):
+        return {"name": location.name, "lat": location.lat, "lon": location.lon}
+    if isinstance(location, tuple):
+        return list(location)
+    return location
+
+
+def decode_location(value):
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, dict):
+        return Geo(sys.intern(value["name"]), value["lat"], value["lon"])
+    return tuple(value)
+
+
+def serialize_courses(courses: list[Course]) -> bytes:
+    """将 Course 列表序列化为压缩的 JSON 数组，周次保存为位掩码"""
+    rows = [[c.name, c.teacher, c.classroom, encode_location(c.location), c.weekday, c.weeks.mask, list(c.indexes)]
+            for c in courses]
+    return zlib.compress(json.dumps(rows, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+def deserialize_courses(payload: bytes) -> list[Course]:
+    """从压缩的 JSON 数组还原 Course 列表，字符串放入共享字符串池"""
+    rows = json.loads(zlib.decompress(payload).decode("utf-8"))
+    return [Course(name=sys.intern(name), teacher=sys.intern(teacher), classroom=sys.intern(classroom),
+                   location=decode_location(location),
+                   weekday=weekday, weeks=WeekSet.from_mask(weeks), indexes=indexes)
+            for name, teacher, classroom, location, weekday, weeks, indexes in rows]
+
+
+def cache_path(key: str, cache_dir: Optional[str] = None) -> str:
+    return os.path.join(cache_dir or CACHE_DIR, key + CACHE_SUFFIX)
+
+
+def load(key: str, cache_dir: Optional[str] = None) -> Optional[list[Course]]:
+    """读取缓存，未命中或缓存损坏时返回 None；命中时刷新其最近使用时间"""
+    path = cache_path(key, cache_dir)
+    try:
+        with open(path, "rb") as r:
+            courses = deserialize_courses(r.read())
+        os.utime(path)
+        return courses
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, zlib.error):
+        # 缓存文件损坏，删除后重新解析
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return None
+
+
+def store(key: str, courses: list[Course], cache_dir: Optional[str] = None,
+          max_bytes: int = MAX_CACHE_BYTES) -> None:
+    """写入缓存（先写临时文件再原子替换，多个进程同时写入也不会损坏），随后按大小上限淘汰"""
+    global _stores_since_evict
+    cache_dir = cache_dir or CACHE_DIR
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as w:
+                w.write(serialize_courses(courses))
+            os.replace(tmp_path, cache_path(key, cache_dir))
+        except BaseException:
+            # 写入失败时不在缓存目录中留下临时文件
+            os.unlink(tmp_path)
+            raise
+        if _stores_since_evict % EVICT_INTERVAL == 0:
+            evict(cache_dir, max_bytes)
+        _stores_since_evict += 1
+    except OSError:
+        # 缓存只是加速手段，写入失败不影响正常解析
+        pass
+
+
+def evict(cache_dir: Optional[str] = None, max_bytes: int = MAX_CACHE_BYTES) -> int:
+    """按最近使用时间淘汰缓存文件，直到总大小不超过上限，返回删除的文件数"""
+    cache_dir = cache_dir or CACHE_DIR
+    if not os.path.isdir(cache_dir):
+        return 0
+    entries = []
+    total = 0
+    for entry in os.scandir(cache_dir):
+        if not entry.name.endswith(CACHE_SUFFIX):
+            continue
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total += stat.st_size
+
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            removed += 1
+        except FileNotFoundError:
+            pass
+        total -= size
+    return removed
+
+
+def clear(cache_dir: Optional[str] = None) -> None:
+    """清空缓存目录中的所有缓存文件"""
+    evict(cache_dir, 0)
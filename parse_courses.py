@@ -67,29 +67,33 @@ def parse_weeks(week_text):
     
     return sorted(list(set(weeks)))  # 去重并排序
 
+# 大节名称 -> 节次索引
+SLOT_MAPPING = {
+    '第一大节': [1, 2],
+    '第二大节': [3, 4],
+    '第三大节': [5, 6],
+    '第四大节': [7, 8],
+    '第五大节': [9, 10]
+}
+
+# 星期名称 -> 星期几
+WEEKDAY_MAPPING = {
+    '星期一': 1,
+    '星期二': 2,
+    '星期三': 3,
+    '星期四': 4,
+    '星期五': 5,
+    '星期六': 6,
+    '星期日': 7
+}
+
 def time_slot_to_index(slot_name):
     """将时间段名称转换为索引"""
-    slot_mapping = {
-        '第一大节': [1, 2],
-        '第二大节': [3, 4], 
-        '第三大节': [5, 6],
-        '第四大节': [7, 8],
-        '第五大节': [9, 10]
-    }
-    return slot_mapping.get(slot_name, [])
+    return SLOT_MAPPING.get(slot_name, [])
 
 def weekday_name_to_number(weekday_name):
     """将星期名称转换为数字"""
-    weekday_mapping = {
-        '星期一': 1,
-        '星期二': 2,
-        '星期三': 3,
-        '星期四': 4,
-        '星期五': 5,
-        '星期六': 6,
-        '星期日': 7
-    }
-    return weekday_mapping.get(weekday_name, 0)
+    return WEEKDAY_MAPPING.get(weekday_name, 0)
 
 def parse_timetable_from_xls():
     """从xls文件解析课表"""
@@ -105,19 +109,25 @@ def parse_timetable_from_xls():
     
     courses = []
     
-    # 从第2行开始（索引1），第1行是星期标题
-    weekdays = []
-    for col in range(1, len(df.columns)):
-        cell_value = df.iloc[1, col]
-        if pd.notna(cell_value) and '星期' in str(cell_value):
-            weekdays.append((col, str(cell_value)))
+    # 一次性取出整个表格，避免逐个单元格调用 df.iloc
+    grid = df.to_numpy(dtype=object)
+    filled = pd.notna(grid)
+    if len(grid) < 2:
+        return courses
+    
+    # 第2行（索引1）是星期标题，星期列只解析一次
+    weekdays = [(col, str(grid[1, col])) for col in range(1, grid.shape[1])
+                if filled[1, col] and '星期' in str(grid[1, col])]
     
     print(f"发现的星期列: {weekdays}")
     
-    # 从第3行开始解析课程（索引2），因为第1行是标题，第2行是星期
-    for row_idx in range(2, len(df)):
-        time_slot = df.iloc[row_idx, 0]
-        if pd.isna(time_slot) or '第' not in str(time_slot):
+    columns = [(col_idx, weekday_name_to_number(weekday_name)) for col_idx, weekday_name in weekdays]
+    columns = [(col_idx, weekday_num) for col_idx, weekday_num in columns if weekday_num]
+    
+    # 从第3行开始解析课程（索引2），大节行只解析一次
+    for row_idx in range(2, len(grid)):
+        time_slot = grid[row_idx, 0]
+        if not filled[row_idx, 0] or '第' not in str(time_slot):
             continue
             
         time_indexes = time_slot_to_index(str(time_slot))
@@ -126,21 +136,13 @@ def parse_timetable_from_xls():
             
         print(f"处理时间段: {time_slot} -> 索引: {time_indexes}")
         
-        # 遍历每个星期列
-        for col_idx, weekday_name in weekdays:
-            if col_idx >= len(df.columns):
-                continue
-                
-            cell_content = df.iloc[row_idx, col_idx]
-            if pd.isna(cell_content):
-                continue
-                
-            weekday_num = weekday_name_to_number(weekday_name)
-            if weekday_num == 0:
+        # 该行所有非空的星期列
+        for col_idx, weekday_num in columns:
+            if not filled[row_idx, col_idx]:
                 continue
                 
             # 解析该单元格中的课程信息
-            course_infos = parse_course_info(str(cell_content))
+            course_infos = parse_course_info(str(grid[row_idx, col_idx]))
             
             for course_info in course_infos:
                 print(f"解析到课程: {course_info}")
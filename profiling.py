@@ -0,0 +1,301 @@
+"""
+分阶段性能分析（默认关闭）：
+通过 --profile 参数或环境变量 SDUST_PROFILE 开启后，记录每个阶段（读取 Excel、解析单元格、合并课程、
+生成日历、上传、二维码等）的耗时、CPU 时间、tracemalloc 峰值内存和计数（单元格、课程、事件、写入字节），
+程序结束时写出 JSON 报告
+还可通过 --profiler 参数或环境变量 SDUST_PROFILER 同时开启 cProfile 或 pyinstrument，无需修改代码
+
+各模块用 profiling.stage() 标记阶段，未开启时 stage() 返回空操作对象，几乎没有开销：
+
+    with profiling.stage("excel.read") as stage:
+        grid = read_sheet_grid(path)
+        stage.count(rows=len(grid))
+"""
+
+import atexit
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Optional
+
+PROFILE_ENV = "SDUST_PROFILE"
+PROFILER_ENV = "SDUST_PROFILER"
+DEFAULT_REPORT = "profile.json"
+HOOKS = ("cprofile", "pyinstrument")
+
+
+class Stage:
+    """一个正在进行的阶段，嵌套阶段的名称以 / 连接（如 parse/excel.read）"""
+    __slots__ = ("profiler", "name", "path", "counts", "wall", "cpu", "start_memory", "peak", "record")
+
+    def __init__(self, profiler: "Profiler", name: str) -> None:
+        self.profiler = profiler
+        self.name = name
+        self.path = name
+        self.counts: dict[str, int] = {}
+        self.wall = self.cpu = 0.0
+        self.start_memory = self.peak = 0
+        self.record: dict = {}
+
+    def count(self, **counts: int) -> None:
+        """累加计数，如 stage.count(courses=12, bytes=4096)"""
+        for key, value in counts.items():
+            self.counts[key] = self.counts.get(key, 0) + value
+
+    def __enter__(self) -> "Stage":
+        self.profiler._enter(self)
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        self.profiler._exit(self)
+        return False
+
+
+class NullStage:
+    """未开启性能分析时使用的空操作阶段"""
+    __slots__ = ()
+
+    def count(self, **counts: int) -> None:
+        pass
+
+    def __enter__(self) -> "NullStage":
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+
+NULL_STAGE = NullStage()
+
+
+class Profiler:
+    """
+    记录各阶段的耗时、CPU 时间和内存峰值
+    memory 为 True 时使用 tracemalloc 统计峰值（会明显拖慢运行，但各阶段的相对耗时仍可比较）
+    """
+
+    def __init__(self, memory: bool = True) -> None:
+        self.memory = memory
+        self.records: list[dict] = []
+        self._stack: list[Stage] = []
+        self._owns_tracemalloc = False
+
+    def start(self) -> None:
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+
+    def stop(self) -> None:
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+
+    def stage(self, name: str, **counts: int) -> Stage:
+        stage = Stage(self, name)
+        stage.count(**counts)
+        return stage
+
+    def _tracing(self) -> bool:
+        return self.memory and tracemalloc.is_tracing()
+
+    def _enter(self, stage: Stage) -> None:
+        if self._stack:
+            stage.path = f"{self._stack[-1].path}/{stage.name}"
+        if self._tracing():
+            # 子阶段会重置峰值，重置前先把目前的峰值记到父阶段上
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                self._stack[-1].peak = max(self._stack[-1].peak, peak)
+            tracemalloc.reset_peak()
+            stage.start_memory = stage.peak = current
+        self._stack.append(stage)
+        # 记录按阶段开始的顺序排列（父阶段在子阶段之前），结束时再填入结果
+        stage.record = {'stage': stage.path}
+        self.records.append(stage.record)
+        stage.wall = time.perf_counter()
+        stage.cpu = time.process_time()
+
+    def _exit(self, stage: Stage) -> None:
+        wall = time.perf_counter() - stage.wall
+        cpu = time.process_time() - stage.cpu
+        self._stack.pop()
+        if self._tracing():
+            stage.peak = max(stage.peak, tracemalloc.get_traced_memory()[1])
+            if self._stack:
+                self._stack[-1].peak = max(self._stack[-1].peak, stage.peak)
+        stage.record.update({
+            'wall_s': wall,
+            'cpu_s': cpu,
+            'peak_bytes': stage.peak,
+            'peak_delta_bytes': max(0, stage.peak - stage.start_memory),
+            'counts': stage.counts,
+        })
+
+
+# 当前进程中生效的 Profiler，为 None 时 stage() 为空操作
+_active: Optional[Profiler] = None
+
+
+def activate(profiler: Optional[Profiler]) -> Optional[Profiler]:
+    """设置当前生效的 Profiler，返回之前的 Profiler（便于恢复）"""
+    global _active
+    previous, _active = _active, profiler
+    return previous
+
+
+def enabled() -> bool:
+    return _active is not None
+
+
+def stage(name: str, **counts: int):
+    """标记一个阶段，未开启性能分析时返回空操作对象"""
+    if _active is None:
+        return NULL_STAGE
+    return _active.stage(name, **counts)
+
+
+def summarize_records(records: list[dict]) -> list[dict]:
+    """按阶段名称汇总记录（批量转换时同一阶段会出现多次），按首次出现的顺序排列"""
+    stages: dict[str, dict] = {}
+    for record in records:
+        total = stages.get(record['stage'])
+        if total is None:
+            total = stages[record['stage']] = {
+                'stage': record['stage'], 'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0,
+                'peak_bytes': 0, 'peak_delta_bytes': 0, 'counts': {},
+            }
+        total['calls'] += 1
+        total['wall_s'] += record['wall_s']
+        total['cpu_s'] += record['cpu_s']
+        total['peak_bytes'] = max(total['peak_bytes'], record['peak_bytes'])
+        total['peak_delta_bytes'] = max(total['peak_delta_bytes'], record['peak_delta_bytes'])
+        for key, value in record['counts'].items():
+            total['counts'][key] = total['counts'].get(key, 0) + value
+    return list(stages.values())
+
+
+class ProfileSession:
+    """
+    一次运行的性能分析：开启 Profiler 和可选的 cProfile/pyinstrument，
+    finish() 时（或进程退出时）写出 JSON 报告，cProfile 结果另存为 <报告名>.prof，
+    pyinstrument 结果另存为 <报告名>.html
+    """
+
+    def __init__(self, report_path: str = DEFAULT_REPORT, hook: Optional[str] = None, memory: bool = True) -> None:
+        if hook is not None and hook not in HOOKS:
+            raise ValueError(f"不支持的分析器：{hook}，可选：{', '.join(HOOKS)}")
+        self.report_path = report_path
+        self.hook = hook
+        self.profiler = Profiler(memory)
+        self.extra_records: list[dict] = []
+        self._hook_profiler = None
+        self._hook_output: Optional[str] = None
+        self._started = 0.0
+        self._cpu = 0.0
+        self._finished = False
+
+    def start(self) -> "ProfileSession":
+        self.profiler.start()
+        activate(self.profiler)
+        if self.hook == "cprofile":
+            import cProfile
+            self._hook_profiler = cProfile.Profile()
+            self._hook_profiler.enable()
+        elif self.hook == "pyinstrument":
+            try:
+                from pyinstrument import Profiler as Instrument
+            except ImportError:
+                print("⚠️  未安装 pyinstrument（pip install pyinstrument），只记录阶段耗时")
+            else:
+                self._hook_profiler = Instrument()
+                self._hook_profiler.start()
+        self._started = time.perf_counter()
+        self._cpu = time.process_time()
+        atexit.register(self.finish)
+        return self
+
+    def add_records(self, records: list[dict]) -> None:
+        """加入其他进程（如批量转换的工作进程）的阶段记录"""
+        self.extra_records.extend(records)
+
+    def _stop_hook(self) -> None:
+        if self._hook_profiler is None:
+            return
+        base = os.path.splitext(self.report_path)[0]
+        if self.hook == "cprofile":
+            self._hook_profiler.disable()
+            self._hook_output = base + ".prof"
+            self._hook_profiler.dump_stats(self._hook_output)
+        else:
+            self._hook_profiler.stop()
+            self._hook_output = base + ".html"
+            with open(self._hook_output, "w", encoding="utf-8") as w:
+                w.write(self._hook_profiler.output_html())
+        self._hook_profiler = None
+
+    def report(self, **extra) -> dict:
+        stages = summarize_records([record for record in self.profiler.records + self.extra_records
+                                    if 'wall_s' in record])
+        return {
+            'command': sys.argv,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'created': datetime.now().isoformat(timespec="seconds"),
+            'wall_s': time.perf_counter() - self._started,
+            'cpu_s': time.process_time() - self._cpu,
+            'peak_bytes': max((s['peak_bytes'] for s in stages), default=0),
+            'memory': self.profiler.memory,
+            'hook': {'name': self.hook, 'output': self._hook_output} if self.hook else None,
+            'stages': stages,
+            **extra,
+        }
+
+    def finish(self, **extra) -> Optional[str]:
+        """结束分析并写出报告，返回报告路径；重复调用时不做任何事"""
+        if self._finished:
+            return None
+        self._finished = True
+        self._stop_hook()
+        report = self.report(**extra)
+        activate(None)
+        self.profiler.stop()
+        with open(self.report_path, "w", encoding="utf-8") as w:
+            json.dump(report, w, ensure_ascii=False, indent=2)
+        print_report(report)
+        print(f"📝 性能报告已写入 {self.report_path}")
+        if self._hook_output:
+            print(f"📝 {self.hook} 结果已写入 {self._hook_output}")
+        return self.report_path
+
+
+def print_report(report: dict) -> None:
+    print("\n" + "="*60)
+    print(f"📊 性能分析（总耗时 {report['wall_s']:.3f} 秒，CPU {report['cpu_s']:.3f} 秒）")
+    print("="*60)
+    print(f"   {'stage':<32}{'calls':>6}{'wall ms':>11}{'cpu ms':>10}{'mem KiB':>10}")
+    for s in report['stages']:
+        counts = "，".join(f"{key} {value}" for key, value in s['counts'].items())
+        print(f"   {s['stage']:<32}{s['calls']:>6}{s['wall_s'] * 1000:>11.1f}{s['cpu_s'] * 1000:>10.1f}"
+              f"{s['peak_delta_bytes'] / 1024:>10.1f}  {counts}")
+    print("   mem：阶段内相对阶段开始时的 tracemalloc 内存峰值增量")
+    print("="*60)
+
+
+def session_from(profile: Optional[str] = None, hook: Optional[str] = None) -> Optional[ProfileSession]:
+    """
+    按命令行参数或环境变量创建性能分析会话，两者都未指定时返回 None
+    profile: 报告路径（--profile），未指定时读取 SDUST_PROFILE（值为 1 时使用默认路径）
+    hook: cprofile 或 pyinstrument（--profiler），未指定时读取 SDUST_PROFILER
+    """
+    hook = hook or os.environ.get(PROFILER_ENV) or None
+    if profile is None:
+        profile = os.environ.get(PROFILE_ENV) or None
+        if profile in ("1", "true", "yes"):
+            profile = DEFAULT_REPORT
+    if profile is None and hook is None:
+        return None
+    return ProfileSession(profile or DEFAULT_REPORT, hook)
@@ -0,0 +1,174 @@
+"""
+二维码生成与渲染：
+每个链接只编码一次二维码矩阵，再从同一个矩阵渲染为 PNG、SVG、PBM 或终端字符画；
+PNG/SVG/PBM 均直接按格式写出字节，不依赖 PIL
+批量生成时在进程池中并行编码和渲染
+"""
+
+import os
+import struct
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+# 图片中每个模块的像素数和四周留白的模块数
+BOX_SIZE = 10
+BORDER = 4
+
+# 终端字符画的留白
+TERMINAL_BORDER = 1
+
+FORMATS = ("png", "svg", "pbm")
+
+
+@dataclass(frozen=True, slots=True)
+class QRMatrix:
+    """二维码模块矩阵（不含留白），True 为深色模块"""
+    modules: tuple[tuple[bool, ...], ...]
+
+    @property
+    def size(self) -> int:
+        return len(self.modules)
+
+    def padded_rows(self, border: int) -> Iterator[tuple[bool, ...]]:
+        """逐行产出加上留白后的模块行"""
+        blank = (False,) * (self.size + 2 * border)
+        side = (False,) * border
+        for _ in range(border):
+            yield blank
+        for row in self.modules:
+            yield side + row + side
+        for _ in range(border):
+            yield blank
+
+
+def qr_matrix(data: str) -> QRMatrix:
+    """编码二维码矩阵（纠错等级 L，自动选择最小版本）"""
+    import qrcode
+
+    qr = qrcode.QRCode(error_correction=qrcode.ERROR_CORRECT_L, border=0)
+    qr.add_data(data)
+    qr.make(fit=True)
+    return QRMatrix(tuple(tuple(bool(module) for module in row) for row in qr.modules))
+
+
+def pack_row(row: tuple[bool, ...], box_size: int, dark_bit: str) -> bytes:
+    """将一行模块放大 box_size 倍后按位打包（每行补齐到整字节）"""
+    light_bit = "1" if dark_bit == "0" else "0"
+    bits = "".join((dark_bit if module else light_bit) * box_size for module in row)
+    bits += light_bit * (-len(bits) % 8)
+    return int(bits, 2).to_bytes(len(bits) // 8, "big")
+
+
+def png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def render_png(matrix: QRMatrix, box_size: int = BOX_SIZE, border: int = BORDER) -> bytes:
+    """渲染为 1 位灰度 PNG"""
+    width = (matrix.size + 2 * border) * box_size
+    raw = bytearray()
+    for row in matrix.padded_rows(border):
+        line = b"\x00" + pack_row(row, box_size, "0")  # 每行以滤波类型 0 开头，深色为 0
+        raw += line * box_size
+    return b"".join([
+        b"\x89PNG\r\n\x1a\n",
+        png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, width, 1, 0, 0, 0, 0)),
+        png_chunk(b"IDAT", zlib.compress(bytes(raw), 9)),
+        png_chunk(b"IEND", b""),
+    ])
+
+
+def render_pbm(matrix: QRMatrix, box_size: int = BOX_SIZE, border: int = BORDER) -> bytes:
+    """渲染为二进制 PBM (P4)，深色为 1"""
+    width = (matrix.size + 2 * border) * box_size
+    rows = b"".join(pack_row(row, box_size, "1") * box_size for row in matrix.padded_rows(border))
+    return f"P4\n{width} {width}\n".encode("ascii") + rows
+
+
+def render_svg(matrix: QRMatrix, box_size: int = BOX_SIZE, border: int = BORDER) -> bytes:
+    """渲染为 SVG：每一行连续的深色模块合并为一个矩形路径"""
+    count = matrix.size + 2 * border
+    path = []
+    for y, row in enumerate(matrix.modules, border):
+        x = 0
+        while x < matrix.size:
+            if not row[x]:
+                x += 1
+                continue
+            start = x
+            while x < matrix.size and row[x]:
+                x += 1
+            path.append(f"M{start + border} {y}h{x - start}v1h-{x - start}z")
+    return (f'<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{count * box_size}" height="{count * box_size}" '
+            f'viewBox="0 0 {count} {count}" shape-rendering="crispEdges">'
+            f'<rect width="{count}" height="{count}" fill="#fff"/>'
+            f'<path fill="#000" d="{"".join(path)}"/></svg>\n').encode("utf-8")
+
+
+def render_terminal(matrix: QRMatrix, border: int = TERMINAL_BORDER, invert: bool = True) -> str:
+    """
+    渲染为终端字符画：每个字符表示上下两个模块
+    invert 为 True 时适用于深色背景的终端（深色模块显示为空白）
+    """
+    codes = ("\xa0", "▀", "▄", "█")
+    if invert:
+        codes = codes[::-1]
+    rows = list(matrix.padded_rows(border))
+    if len(rows) % 2:
+        # 补齐最后半行，显示为浅色
+        rows.append((invert,) * len(rows[0]))
+    lines = []
+    for top, bottom in zip(rows[::2], rows[1::2]):
+        lines.append("".join(codes[upper + (lower << 1)] for upper, lower in zip(top, bottom)))
+    return "\n".join(lines)
+
+
+RENDERERS = {
+    "png": render_png,
+    "svg": render_svg,
+    "pbm": render_pbm,
+}
+
+
+def format_for(path: str) -> str:
+    """按文件扩展名确定输出格式，未知扩展名时使用 PNG"""
+    suffix = os.path.splitext(path)[1].lower().lstrip(".")
+    return suffix if suffix in RENDERERS else "png"
+
+
+def write_qr(matrix: QRMatrix, path: str, fmt: Optional[str] = None) -> str:
+    """将二维码直接写入指定路径，格式默认按扩展名确定"""
+    with open(path, "wb") as w:
+        w.write(RENDERERS[fmt or format_for(path)](matrix))
+    return path
+
+
+def render_one(task: tuple[str, str, Optional[str]]) -> dict:
+    """编码并写出一个二维码（在工作进程中执行），task: (链接, 输出路径, 格式)"""
+    data, path, fmt = task
+    try:
+        write_qr(qr_matrix(data), path, fmt)
+        return {'success': True, 'data': data, 'output': path}
+    except Exception as e:
+        return {'success': False, 'data': data, 'output': path, 'error': f"{type(e).__name__}: {e}"}
+
+
+def render_batch(items: list[tuple[str, str]], fmt: Optional[str] = None, jobs: Optional[int] = None,
+                 chunksize: int = 64) -> Iterator[dict]:
+    """
+    批量生成二维码，按输入顺序逐个产出结果字典
+    items: (链接, 输出路径) 列表
+    fmt: png、svg 或 pbm，默认按各输出路径的扩展名确定
+    jobs: 进程数，默认为 CPU 核心数；为 1 时在当前进程内顺序执行
+    """
+    if fmt is not None and fmt not in RENDERERS:
+        raise ValueError(f"不支持的二维码格式：{fmt}，可选：{', '.join(FORMATS)}")
+    tasks = [(data, path, fmt) for data, path in items]
+    if jobs == 1:
+        yield from map(render_one, tasks)
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(render_one, tasks, chunksize=chunksize)
@@ -38,7 +38,7 @@ def main():
     parser.add_argument(
         '-o', '--output',
         default='课表二维码.png',
-        help='二维码输出文件名 (默认: 课表二维码.png)'
+        help='二维码输出文件名，支持 .png/.svg/.pbm (默认: 课表二维码.png)'
     )
     
     args = parser.parse_args()
@@ -64,13 +64,7 @@ def main():
     
     # 执行上传和二维码生成
     try:
-        result = upload_and_generate_qr(args.file, expired_hours=args.time)
-        
-        # 如果指定了自定义输出文件名，重命名二维码文件
-        if result['success'] and args.output != '课表二维码.png':
-            if os.path.exists('课表二维码.png'):
-                os.rename('课表二维码.png', args.output)
-                result['qr_code_path'] = args.output
+        result = upload_and_generate_qr(args.file, expired_hours=args.time, qr_path=args.output)
         
         display_results(result)
         return 0 if result['success'] else 1
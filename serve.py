@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本地课表订阅服务：
+基于 asyncio 的轻量 HTTP 服务，直接从目录中的课表 Excel 文件渲染日历，
+手机日历通过 webcal://主机:端口/<文件名>.ics 订阅，无需上传到会过期的第三方缓存
+
+- 渲染结果以 (文件路径, 修改时间, 大小) 为版本放入 LRU 缓存，并预先 gzip 压缩
+- DTSTAMP 固定为课表文件的修改时间，同一版本的课表总是渲染出相同的内容，
+  ETag 取内容摘要，支持 If-None-Match / If-Modified-Since，未变化时返回 304
+- 渲染（解析 Excel、生成日历）在线程池中执行，同一文件的并发请求只渲染一次
+
+使用方式：python serve.py exports/ -s 2025-09-01 --port 8080
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import io
+import os
+import socket
+import sys
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional
+from urllib.parse import quote, unquote, urlsplit
+
+from batch import EXCEL_SUFFIXES, find_inputs
+from convert import parse_start_date
+from course_parser import SDUST_DURATION, SDUST_TIMETABLE, parse_timetable_from_xls
+from data import School
+from event_cache import shared_cache
+
+# 渲染缓存的总大小上限（字节，含 gzip 压缩后的内容）
+CACHE_MAX_BYTES = 128 * 1024 * 1024
+
+# 请求头最大长度，超出时返回 431
+MAX_HEADER_BYTES = 16 * 1024
+
+# 订阅服务不使用请求体：不超过该长度的请求体读取后丢弃，以便继续处理同一连接上的下一个请求，
+# 更长的请求体（或使用 Transfer-Encoding 的请求）响应后直接关闭连接
+MAX_BODY_BYTES = 64 * 1024
+
+# 长连接空闲超时（秒）
+KEEPALIVE_TIMEOUT = 15
+
+# 客户端可缓存日历的时间（秒），日历应用通常按小时级别轮询订阅
+MAX_AGE = 3600
+
+REASONS = {
+    200: "OK",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    431: "Request Header Fields Too Large",
+    500: "Internal Server Error",
+}
+
+
+@dataclass(frozen=True, slots=True)
+class RenderedCalendar:
+    """一份渲染好的日历"""
+    body: bytes
+    gzip_body: bytes
+    etag: str
+    last_modified: str  # HTTP 日期格式
+    mtime: int  # 课表文件修改时间（秒）
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + len(self.gzip_body)
+
+
+class RenderCache:
+    """按总字节数淘汰的 LRU 渲染缓存：键为文件路径，值为 (版本, 日历)"""
+
+    def __init__(self, max_bytes: int = CACHE_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.total = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[tuple, RenderedCalendar]] = OrderedDict()
+
+    def get(self, path: str, version: tuple) -> Optional[RenderedCalendar]:
+        entry = self._entries.get(path)
+        if entry is None or entry[0] != version:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(path)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, path: str, version: tuple, calendar: RenderedCalendar) -> None:
+        old = self._entries.pop(path, None)
+        if old is not None:
+            self.total -= old[1].size
+        self._entries[path] = (version, calendar)
+        self.total += calendar.size
+        while self.total > self.max_bytes and len(self._entries) > 1:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.total -= evicted.size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def render_calendar(path: str, mtime: float, start: tuple[int, int, int], compact: bool = False,
+                    use_cache: bool = True) -> RenderedCalendar:
+    """解析课表文件并渲染日历（在线程池中执行）"""
+    courses = parse_timetable_from_xls(path, verbose=False, use_cache=use_cache)
+    if not courses:
+        raise ValueError("未能解析到任何课程信息")
+    school = School(
+        duration=SDUST_DURATION,
+        timetable=list(SDUST_TIMETABLE),
+        start=start,
+        courses=courses,
+        compact=compact,
+        stamp=datetime.fromtimestamp(int(mtime), timezone.utc),
+        event_cache=shared_cache(),  # 课表文件更新后，未变化的课程时间段直接使用已渲染的事件
+    )
+    out = io.BytesIO()
+    school.write_to(out)
+    body = out.getvalue()
+    return RenderedCalendar(
+        body=body,
+        gzip_body=gzip.compress(body, compresslevel=6, mtime=0),
+        etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+        last_modified=formatdate(int(mtime), usegmt=True),
+        mtime=int(mtime),
+    )
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Accept-Encoding 是否允许 gzip（q=0 表示不接受）"""
+    for token in accept_encoding.split(","):
+        coding, _, params = token.strip().partition(";")
+        if coding.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def is_not_modified(headers: dict[str, str], calendar: RenderedCalendar) -> bool:
+    """按 If-None-Match（优先）或 If-Modified-Since 判断客户端缓存是否仍然有效"""
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or calendar.etag in tags
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return parsedate_to_datetime(if_modified_since).timestamp() >= calendar.mtime
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+class SubscriptionServer:
+    """课表订阅服务：root 目录下的 a/b.xls 对应订阅地址 /a/b.ics"""
+
+    def __init__(self, root: str, start: tuple[int, int, int], compact: bool = False,
+                 use_cache: bool = True, cache_bytes: int = CACHE_MAX_BYTES, max_age: int = MAX_AGE) -> None:
+        self.root = os.path.realpath(root)
+        self.start = start
+        self.compact = compact
+        self.use_cache = use_cache
+        self.max_age = max_age
+        self.cache = RenderCache(cache_bytes)
+        self.requests = 0
+        self.not_modified = 0
+        self._rendering: dict[tuple, asyncio.Future] = {}
+
+    def resolve(self, url_path: str) -> Optional[str]:
+        """将订阅地址映射到课表文件，不允许访问 root 之外的文件"""
+        name = unquote(url_path).lstrip("/")
+        if not name.endswith(".ics"):
+            return None
+        stem = os.path.realpath(os.path.join(self.root, name[:-len(".ics")]))
+        if os.path.commonpath([self.root, stem]) != self.root:
+            return None
+        for suffix in EXCEL_SUFFIXES:
+            if os.path.isfile(stem + suffix):
+                return stem + suffix
+        return None
+
+    def subscription_path(self, excel_path: str) -> str:
+        """课表文件对应的订阅地址路径"""
+        relative = os.path.splitext(os.path.relpath(os.path.realpath(excel_path), self.root))[0]
+        return "/" + quote(relative.replace(os.sep, "/")) + ".ics"
+
+    async def calendar(self, path: str) -> RenderedCalendar:
+        """获取日历：命中缓存直接返回，否则在线程池中渲染；同一版本的并发请求共用一次渲染"""
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        calendar = self.cache.get(path, version)
+        if calendar is not None:
+            return calendar
+
+        key = (path, version)
+        pending = self._rendering.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        loop = asyncio.get_running_loop()
+        pending = loop.run_in_executor(None, render_calendar, path, stat.st_mtime, self.start,
+                                       self.compact, self.use_cache)
+        self._rendering[key] = pending
+        try:
+            calendar = await asyncio.shield(pending)
+        finally:
+            self._rendering.pop(key, None)
+        self.cache.put(path, version, calendar)
+        return calendar
+
+    async def respond(self, method: str, target: str, headers: dict[str, str]) -> tuple[int, dict, bytes]:
+        """处理一个请求，返回 (状态码, 响应头, 响应体)"""
+        if method not in ("GET", "HEAD"):
+            return 405, {"Allow": "GET, HEAD"}, b""
+        path = self.resolve(urlsplit(target).path)
+        if path is None:
+            return 404, {}, "找不到该课表\n".encode("utf-8")
+        try:
+            calendar = await self.calendar(path)
+        except Exception as e:
+            return 500, {}, f"课表渲染失败：{type(e).__name__}: {e}\n".encode("utf-8")
+
+        response_headers = {
+            "ETag": calendar.etag,
+            "Last-Modified": calendar.last_modified,
+            "Cache-Control": f"max-age={self.max_age}",
+            "Vary": "Accept-Encoding",
+        }
+        if is_not_modified(headers, calendar):
+            self.not_modified += 1
+            return 304, response_headers, b""
+
+        response_headers["Content-Type"] = "text/calendar; charset=utf-8"
+        if accepts_gzip(headers.get("accept-encoding", "")):
+            response_headers["Content-Encoding"] = "gzip"
+            return 200, response_headers, calendar.gzip_body
+        return 200, response_headers, calendar.body
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """处理一个连接，支持 HTTP/1.1 长连接"""
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEPALIVE_TIMEOUT)
+                except asyncio.LimitOverrunError:
+                    await self.send(writer, 431, {}, b"", "GET", keep_alive=False)
+                    return
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    return
+
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ")
+                except ValueError:
+                    await self.send(writer, 400, {}, b"", "GET", keep_alive=False)
+                    return
+                headers = {}
+                for line in lines[1:]:
+                    name, sep, value = line.partition(":")
+                    if sep:
+                        headers[name.strip().lower()] = value.strip()
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+                if "transfer-encoding" in headers:
+                    keep_alive = False
+                elif "content-length" in headers:
+                    try:
+                        length = int(headers["content-length"])
+                    except ValueError:
+                        length = -1
+                    if 0 <= length <= MAX_BODY_BYTES:
+                        try:
+                            await asyncio.wait_for(reader.readexactly(length), KEEPALIVE_TIMEOUT)
+                        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                            return
+                    else:
+                        keep_alive = False
+
+                self.requests += 1
+                status, response_headers, body = await self.respond(method, target, headers)
+                await self.send(writer, status, response_headers, body, method, keep_alive)
+                if not keep_alive:
+                    return
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def send(writer: asyncio.StreamWriter, status: int, headers: dict, body: bytes,
+                   method: str, keep_alive: bool) -> None:
+        """写出响应；HEAD 请求只发送响应头"""
+        lines = [f"HTTP/1.1 {status} {REASONS[status]}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        lines.append(f"Content-Length: {len(body)}")
+        lines.append("Connection: keep-alive" if keep_alive else "Connection: close")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        if method != "HEAD" and body:
+            writer.write(body)
+        await writer.drain()
+
+    async def serve(self, host: str = "0.0.0.0", port: int = 8080,
+                    ready: Optional[asyncio.Future] = None) -> None:
+        """启动服务并一直运行；ready 不为空时在开始监听后设置为实际监听的端口"""
+        server = await asyncio.start_server(self.handle, host, port, limit=MAX_HEADER_BYTES, backlog=1024)
+        if ready is not None:
+            ready.set_result(server.sockets[0].getsockname()[1])
+        async with server:
+            await server.serve_forever()
+
+
+def local_address() -> str:
+    """本机局域网地址，用于打印订阅链接"""
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.connect(("10.255.255.255", 1))
+            return s.getsockname()[0]
+    except OSError:
+        return "127.0.0.1"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SDUST 课表订阅服务")
+    parser.add_argument('input', help='课表 Excel 文件所在目录')
+    parser.add_argument('-s', '--start', required=True, help='开学日期，如 2025-09-01')
+    parser.add_argument('--host', default='0.0.0.0', help='监听地址 (默认: 0.0.0.0)')
+    parser.add_argument('--port', type=int, default=8080, help='监听端口 (默认: 8080)')
+    parser.add_argument('--compact', action='store_true', help='精简模式：每个课程时间段只生成一个重复事件')
+    parser.add_argument('--no-cache', action='store_true', help='不使用解析缓存')
+    parser.add_argument('--cache-size', type=int, default=CACHE_MAX_BYTES // (1024 * 1024),
+                        help=f'渲染缓存大小上限，单位 MB (默认: {CACHE_MAX_BYTES // (1024 * 1024)})')
+    parser.add_argument('--max-age', type=int, default=MAX_AGE, help=f'客户端缓存时间，单位秒 (默认: {MAX_AGE})')
+    args = parser.parse_args()
+
+    try:
+        start = parse_start_date(args.start)
+    except ValueError:
+        print("❌ 日期格式错误，请使用正确格式（如：2025-09-01）")
+        return 1
+    if not os.path.isdir(args.input):
+        print(f"❌ 错误：目录不存在：{args.input}")
+        return 1
+
+    server = SubscriptionServer(args.input, start, compact=args.compact, use_cache=not args.no_cache,
+                                cache_bytes=args.cache_size * 1024 * 1024, max_age=args.max_age)
+    inputs = find_inputs(args.input)
+    host = local_address() if args.host == "0.0.0.0" else args.host
+    print(f"📡 课表订阅服务已启动：http://{host}:{args.port}/")
+    print(f"📋 共 {len(inputs)} 个课表文件，订阅地址示例：")
+    for path in inputs[:5]:
+        print(f"   webcal://{host}:{args.port}{server.subscription_path(path)}")
+    print("⏹️  按 Ctrl+C 停止服务")
+
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    cache = server.cache
+    print(f"\n📊 共处理 {server.requests} 个请求（304：{server.not_modified}），"
+          f"渲染缓存命中 {cache.hits}，未命中 {cache.misses}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
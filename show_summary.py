@@ -1,3 +1,4 @@
+import sys
 from course_parser import parse_timetable_from_xls
 from collections import defaultdict
 
@@ -5,7 +6,7 @@ print("=== 课表解析完成 ===")
 print()
 
 # 解析课程
-courses = parse_timetable_from_xls()
+courses = parse_timetable_from_xls(use_cache="--no-cache" not in sys.argv)
 
 # 按课程名统计
 course_stats = defaultdict(list)
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# 测试 Apple Maps 地点解析（折叠行展开）与地点索引缓存
+import sys
+import os
+import tempfile
+
+# 添加当前目录到Python路径
+sys.path.append(os.getcwd())
+
+import location_index
+import parse_cache
+from data import AppleMaps
+
+CALENDAR = """BEGIN:VCALENDAR\r
+BEGIN:VEVENT\r
+SUMMARY:山东科技大学J7\r
+LOCATION:山东科技大学J7\\n山东省青岛市黄岛区前湾港路579\r
+ 号\r
+X-APPLE-STRUCTURED-LOCATION;VALUE=URI;X-TITLE=山东科技大学J7:geo:35.99\r
+ 9,120.12\r
+END:VEVENT\r
+BEGIN:VEVENT\r
+SUMMARY:没有定位的事件\r
+END:VEVENT\r
+END:VCALENDAR\r
+"""
+
+def test_apple_maps():
+    """测试展开续行、跳过缺少定位的事件，以及源文件变化后重新解析"""
+    cache_dir = parse_cache.CACHE_DIR
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            parse_cache.CACHE_DIR = tmp
+            calendar = os.path.join(tmp, "maps.ics")
+            with open(calendar, "w", encoding="utf-8", newline="") as w:
+                w.write(CALENDAR)
+        
+            maps = AppleMaps(calendar)
+            assert list(maps.locations) == ["山东科技大学J7"]
+            assert maps["山东科技大学J7"] == (
+                "LOCATION:山东科技大学J7\\n山东省青岛市黄岛区前湾港路579号",
+                "X-APPLE-STRUCTURED-LOCATION;VALUE=URI;X-TITLE=山东科技大学J7:geo:35.999,120.12",
+                "GEO:35.999;120.12",
+            )
+            assert location_index.load(calendar) == maps.locations
+        
+            # 只修改时间变化时沿用索引，内容变化时索引失效
+            os.utime(calendar, ns=(0, 0))
+            assert location_index.load(calendar) == maps.locations
+            with open(calendar, "w", encoding="utf-8", newline="") as w:
+                w.write(CALENDAR.replace("J7", "J8"))
+            assert location_index.load(calendar) is None
+            assert list(AppleMaps(calendar).locations) == ["山东科技大学J8"]
+    finally:
+        parse_cache.CACHE_DIR = cache_dir
+
+if __name__ == "__main__":
+    test_apple_maps()
+    print("🎉 所有测试通过！")
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# 测试批量上传的并发上传与中断续传（使用本地 HTTP 服务模拟缓存服务）
+import json
+import sys
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 添加当前目录到Python路径
+sys.path.append(os.getcwd())
+
+from bulk_upload import UploadManifest, bulk_upload, find_calendars
+from upload_and_qr import UploadClient
+
+class CacheApiStub(BaseHTTPRequestHandler):
+    """模拟缓存服务的上传接口：内容为 FAIL 时返回错误，否则返回递增的 uuid"""
+    lock = threading.Lock()
+    uploads = 0
+
+    def do_POST(self):
+        data = json.loads(self.rfile.read(int(self.headers['Content-Length'])))['data']
+        with CacheApiStub.lock:
+            CacheApiStub.uploads += 1
+            uuid = f"uuid-{CacheApiStub.uploads}"
+        result = {'code': 500, 'message': '存储失败'} if data == "FAIL" else {'code': 200, 'uuid': uuid, 'expiredAt': 0}
+        payload = json.dumps(result).encode()
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+def test_bulk_upload_resume():
+    """测试失败的文件不写入清单，重新运行时只上传未完成的文件"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), CacheApiStub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/api?mode=set"
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            os.makedirs(os.path.join(tmp, "a"))
+            for name in ("a/张三", "a/李四", "王五"):
+                with open(os.path.join(tmp, name + ".ics"), "w", encoding="utf-8") as w:
+                    w.write("FAIL" if name == "王五" else f"BEGIN:VCALENDAR\n{name}")
+            with open(os.path.join(tmp, "a/张三.changes.ics"), "w", encoding="utf-8") as w:
+                w.write("BEGIN:VCALENDAR")
+            
+            calendars = find_calendars(tmp)
+            assert [student for student, _ in calendars] == ["a/张三", "a/李四", "王五"]
+            
+            manifest = os.path.join(tmp, "upload_manifest.jsonl")
+            client = UploadClient(api_url=url, retries=0)
+            results = list(bulk_upload(calendars, manifest, jobs=3, rate=0, client=client))
+            assert sorted(r['student'] for r in results if r['success']) == ["a/张三", "a/李四"]
+            assert set(UploadManifest(manifest).load()) == {"a/张三", "a/李四"}
+            
+            # 修复失败的文件后重新运行：已上传的文件沿用清单记录
+            with open(os.path.join(tmp, "王五.ics"), "w", encoding="utf-8") as w:
+                w.write("BEGIN:VCALENDAR")
+            uploads = CacheApiStub.uploads
+            results = list(bulk_upload(calendars, manifest, jobs=3, rate=0, client=client))
+            assert all(r['success'] for r in results)
+            assert sum(not r['skipped'] for r in results) == 1
+            assert CacheApiStub.uploads == uploads + 1
+            assert len(UploadManifest(manifest).load()) == 3
+    finally:
+        server.shutdown()
+
+def test_bulk_upload_changed():
+    """链接未过期但课表内容变化时重新上传，并更新清单中的链接"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), CacheApiStub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/api?mode=set"
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ("张三", "李四"):
+                with open(os.path.join(tmp, name + ".ics"), "w", encoding="utf-8") as w:
+                    w.write(f"BEGIN:VCALENDAR\n{name}")
+            manifest = os.path.join(tmp, "upload_manifest.jsonl")
+            client = UploadClient(api_url=url, retries=0)
+            list(bulk_upload(find_calendars(tmp), manifest, jobs=2, rate=0, client=client))
+            before = UploadManifest(manifest).load()
+            
+            # 只改动张三的课表（DTSTAMP 的变化不算内容变化）
+            with open(os.path.join(tmp, "张三.ics"), "w", encoding="utf-8") as w:
+                w.write("BEGIN:VCALENDAR\nDTSTAMP:20251001T000000Z\n张三 换教室")
+            with open(os.path.join(tmp, "李四.ics"), "w", encoding="utf-8") as w:
+                w.write("BEGIN:VCALENDAR\nDTSTAMP:20251001T000000Z\n李四")
+            uploads = CacheApiStub.uploads
+            results = {r['student']: r for r in bulk_upload(find_calendars(tmp), manifest, jobs=2, rate=0, client=client)}
+            assert CacheApiStub.uploads == uploads + 1
+            assert not results["张三"]['skipped'] and results["李四"]['skipped']
+            after = UploadManifest(manifest).load()
+            assert after["张三"]['uuid'] != before["张三"]['uuid']
+            assert after["张三"]['digest'] != before["张三"]['digest']
+            assert after["李四"] == before["李四"]
+    finally:
+        server.shutdown()
+
+def test_bulk_upload_dedupe():
+    """内容相同（仅 DTSTAMP 不同）的日历只上传一次，每个学生都有清单记录"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), CacheApiStub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/api?mode=set"
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for i, name in enumerate(("张三", "李四", "王五")):
+                with open(os.path.join(tmp, name + ".ics"), "w", encoding="utf-8") as w:
+                    w.write(f"BEGIN:VCALENDAR\nDTSTAMP:2025090{i}T000000Z\n{'B' if name == '王五' else 'A'}")
+            os.makedirs(os.path.join(tmp, ".store", "ab"))
+            with open(os.path.join(tmp, ".store", "ab", "ab.ics"), "w", encoding="utf-8") as w:
+                w.write("BEGIN:VCALENDAR")
+            calendars = find_calendars(tmp)
+            assert [student for student, _ in calendars] == ["张三", "李四", "王五"]
+
+            manifest = os.path.join(tmp, "upload_manifest.jsonl")
+            client = UploadClient(api_url=url, retries=0)
+            uploads = CacheApiStub.uploads
+            results = list(bulk_upload(calendars, manifest, jobs=3, rate=0, client=client))
+            assert all(r['success'] for r in results)
+            assert CacheApiStub.uploads == uploads + 2
+            entries = UploadManifest(manifest).load()
+            assert entries["张三"]['uuid'] == entries["李四"]['uuid'] != entries["王五"]['uuid']
+
+            # 新增内容相同的学生：直接沿用清单中的链接
+            with open(os.path.join(tmp, "赵六.ics"), "w", encoding="utf-8") as w:
+                w.write("BEGIN:VCALENDAR\nDTSTAMP:20251001T000000Z\nA")
+            results = list(bulk_upload(find_calendars(tmp), manifest, jobs=3, rate=0, client=client))
+            assert CacheApiStub.uploads == uploads + 2
+            assert UploadManifest(manifest).load()["赵六"]['uuid'] == entries["张三"]['uuid']
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    test_bulk_upload_resume()
+    test_bulk_upload_changed()
+    test_bulk_upload_dedupe()
+    print("🎉 所有测试通过！")
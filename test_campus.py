@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# 测试建筑登记表的前缀匹配、定位输出与解析缓存序列化
+import sys
+import os
+
+# 添加当前目录到Python路径
+sys.path.append(os.getcwd())
+
+from campus import MATCH_CACHE_SIZE, Building, BuildingRegistry, default_registry
+from course_parser import resolve_location
+from data import Course, Geo, Weeks
+from parse_cache import deserialize_courses, serialize_courses
+
+def test_building_match():
+    """测试最长匹配、数字边界和全角字符"""
+    registry = BuildingRegistry([
+        Building("山东科技大学J1", ("J1",)),
+        Building("山东科技大学J10", ("J10",)),
+        Building("山东科技大学JB区乒乓球馆", ("JB区乒乓球馆",)),
+    ])
+    assert registry.match("J1-101室").name == "山东科技大学J1"
+    assert registry.match("J10-101室").name == "山东科技大学J10"
+    assert registry.match("Ｊ１０－１０１室").name == "山东科技大学J10"
+    assert registry.match("J11-101室") is None
+    assert registry.match("JB区乒乓球馆室").name == "山东科技大学JB区乒乓球馆"
+    assert registry.match("品学楼B107") is None
+    assert set(registry.match_all(["J1-101室", "J1-101室", "J2-101室"])) == {"J1-101室", "J2-101室"}
+
+def test_building_pattern():
+    """测试 pattern 限制过短的别名：不符合时回退到其他匹配或未登记"""
+    registry = BuildingRegistry([
+        Building("山东科技大学工程实训大楼", ("工程实训大楼", "实训"), pattern=r"工程实训大楼.*|实训.+-\d+室?"),
+    ])
+    assert registry.match("实训6层-610室").name == "山东科技大学工程实训大楼"
+    assert registry.match("工程实训大楼101").name == "山东科技大学工程实训大楼"
+    assert registry.match("实训中心B101") is None
+    assert registry.match("实训室") is None
+    assert resolve_location("实训中心B101") == "山东科技大学实训中心"
+
+def test_match_cache():
+    """测试匹配结果按教室名称缓存，且缓存大小有上限"""
+    registry = BuildingRegistry([Building("山东科技大学J7", ("J7",))])
+    for _ in range(3):
+        registry.match("J7-106室")
+    info = registry.match.cache_info()
+    assert info.hits == 2 and info.misses == 1
+    assert info.maxsize == MATCH_CACHE_SIZE
+    for i in range(MATCH_CACHE_SIZE + 10):
+        registry.match(f"J7-{i}室")
+    assert registry.match.cache_info().currsize == MATCH_CACHE_SIZE
+
+def test_building_location():
+    """测试未登记坐标时只输出名称，登记坐标后输出 Geo 或 Apple Maps 定位"""
+    assert Building("山东科技大学J7", ("J7",)).location() == "山东科技大学J7"
+    assert Building("山东科技大学J7", ("J7",), 35.99, 120.12).location() == Geo("山东科技大学J7", 35.99, 120.12)
+    assert Building("山东科技大学J7", ("J7",), 35.99, 120.12, "X-APPLE-STRUCTURED-LOCATION:geo:35.99,120.12").location() == (
+        "LOCATION:山东科技大学J7", "X-APPLE-STRUCTURED-LOCATION:geo:35.99,120.12", "GEO:35.99;120.12")
+
+def test_resolve_location():
+    """测试默认登记表与未登记建筑的回退"""
+    assert default_registry().buildings
+    assert resolve_location("J7-106室") == "山东科技大学J7"
+    assert resolve_location("实训6层-610室") == "山东科技大学工程实训大楼"
+    assert resolve_location("J3-201室") == "山东科技大学J3"
+    assert resolve_location("J7-106室", "体育(1)") == ""
+    assert resolve_location("线上虚拟教室") == ""
+
+def test_cache_location_roundtrip():
+    """测试解析缓存可以保存 Geo 和多行定位"""
+    courses = [Course(name="电路", teacher="张三", classroom="J7-106室", location=location,
+                      weekday=1, weeks=Weeks(1, 4), indexes=[1])
+               for location in ("山东科技大学J7", Geo("山东科技大学J7", 35.99, 120.12), ("LOCATION:J7", "GEO:1;2"), "")]
+    assert deserialize_courses(serialize_courses(courses)) == courses
+
+if __name__ == "__main__":
+    test_building_match()
+    test_building_pattern()
+    test_match_cache()
+    test_building_location()
+    test_resolve_location()
+    test_cache_location_roundtrip()
+    print("🎉 所有测试通过！")
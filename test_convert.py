@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# 测试库接口：Excel 内容直接在内存中转换为日历，命令行不在当前目录留下文件
+import sys
+import os
+import tempfile
+from datetime import datetime
+from io import BytesIO
+
+# 添加当前目录到Python路径
+sys.path.append(os.getcwd())
+
+from convert import convert_workbook, main
+from course_parser import parse_timetable_bytes
+
+def make_workbook() -> bytes:
+    import openpyxl
+
+    book = openpyxl.Workbook()
+    sheet = book.active
+    sheet.append(["山东科技大学 2025-2026-1 学期理论课表"])
+    sheet.append(["", "星期一", "星期二", "星期三", "星期四", "星期五"])
+    sheet.append(["第一大节", "线性代数\n张三(讲师)\n1-16[周]\nJ7-106室", None, "电路（2）\n李四(教授)\n2-16[双周]\nS1-201室"])
+    buffer = BytesIO()
+    book.save(buffer)
+    return buffer.getvalue()
+
+def test_parse_bytes():
+    courses = parse_timetable_bytes(make_workbook(), use_cache=False)
+    assert sorted(course.name for course in courses) == ["电路", "线性代数"]
+
+def test_convert_workbook():
+    stamp = datetime(2025, 9, 1)
+    ics = convert_workbook(make_workbook(), (2025, 9, 1), stamp=stamp, use_cache=False)
+    assert ics.startswith(b"BEGIN:VCALENDAR")
+    assert ics.count(b"BEGIN:VEVENT") == 16 + 8
+    assert "SUMMARY:线性代数".encode("utf-8") in ics
+    assert convert_workbook(make_workbook(), (2025, 9, 1), stamp=stamp, use_cache=False) == ics
+
+    try:
+        convert_workbook(b"", (2025, 9, 1), use_cache=False)
+        assert False, "空内容应抛出 ValueError"
+    except ValueError:
+        pass
+
+def test_cli_paths():
+    """命令行读写指定路径，不在当前目录创建任何文件"""
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "课表.xlsx")
+        target = os.path.join(tmp, "out.ics")
+        with open(source, "wb") as w:
+            w.write(make_workbook())
+        before = set(os.listdir("."))
+        assert main([source, "-s", "2025-09-01", "-o", target, "--compact", "--no-cache"]) == 0
+        assert set(os.listdir(".")) == before
+        with open(target, "rb") as r:
+            assert r.read().count(b"RRULE:") == 2
+        assert sorted(os.listdir(tmp)) == ["out.ics", "课表.xlsx"]
+        assert main([source, "-s", "2025-13-01", "-o", target]) == 1
+
+if __name__ == "__main__":
+    test_parse_bytes()
+    test_convert_workbook()
+    test_cli_paths()
+    print("🎉 所有测试通过！")
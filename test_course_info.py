@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# 测试单元格解析缓存：相同文本只解析一次，结果不可变，命中统计可按进程汇总
+import sys
+import os
+import dataclasses
+
+# 添加当前目录到Python路径
+sys.path.append(os.getcwd())
+
+from batch import merge_cache_stats
+from course_parser import CellCourse, cache_stats, classroom_to_location, parse_course_info
+
+CELL = "高等数学（A）\n张三(教授)\n1-16[周]\nJs1-305室\n体育（1）\n李四(讲师)\n17-18[周]\n操场"
+
+def test_parse_course_info():
+    first = parse_course_info(CELL)
+    assert first == (
+        CellCourse("高等数学", "张三", first[0].weeks, "S1-305室"),
+        CellCourse("体育", "李四", first[1].weeks, "操场"),
+    )
+    assert list(first[0].weeks) == list(range(1, 17))
+    assert parse_course_info("") == ()
+
+    before = cache_stats()['parse_course_info']
+    assert parse_course_info(CELL) is first
+    after = cache_stats()['parse_course_info']
+    assert after['hits'] == before['hits'] + 1
+    assert after['misses'] == before['misses']
+
+    try:
+        first[0].name = "线性代数"
+        assert False, "解析结果应不可修改"
+    except dataclasses.FrozenInstanceError:
+        pass
+
+def test_classroom_to_location_memo():
+    before = cache_stats()['classroom_to_location']
+    assert classroom_to_location("J7-106室", "电路") == "山东科技大学J7"
+    assert classroom_to_location("J7-106室", "电路") == "山东科技大学J7"
+    after = cache_stats()['classroom_to_location']
+    assert after['hits'] >= before['hits'] + 1
+
+def test_merge_cache_stats():
+    """同一进程取最新的累计值，不同进程相加"""
+    results = [
+        {'pid': 1, 'cache': {'parse_course_info': {'hits': 2, 'misses': 3}}},
+        {'pid': 1, 'cache': {'parse_course_info': {'hits': 10, 'misses': 4}}},
+        {'pid': 2, 'cache': {'parse_course_info': {'hits': 5, 'misses': 1}}},
+        {'pid': 3, 'success': False},
+    ]
+    totals = merge_cache_stats(results)['parse_course_info']
+    assert (totals['hits'], totals['misses']) == (15, 5)
+    assert totals['hit_rate'] == 0.75
+
+if __name__ == "__main__":
+    test_parse_course_info()
+    test_classroom_to_location_memo()
+    test_merge_cache_stats()
+    print("🎉 所有测试通过！")
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# 测试事件渲染缓存：拼接缓存的字节与逐行生成的日历完全一致，课程进度变化时不会误用缓存
+import io
+import sys
+import os
+from datetime import datetime
+
+# 添加当前目录到Python路径
+sys.path.append(os.getcwd())
+
+from data import Course, Geo, School, Weeks
+from event_cache import EventCache
+
+def make_school(courses, stamp=datetime(2025, 9, 1), **kwargs):
+    timetable = [(8, 0), (10, 10), (14, 0), (16, 0), (19, 0)]
+    return School(duration=110, timetable=timetable, start=(2025, 9, 1), courses=courses,
+                  stamp=stamp, **kwargs)
+
+def render(school):
+    out = io.BytesIO()
+    assert school.write_to(out, buffer_size=256) == len(out.getvalue())
+    return out.getvalue()
+
+MATH = Course(name="高等数学", teacher="李四", classroom="J7-101", location="山东科技大学J7" * 8,
+              weekday=2, weeks=Weeks(1, 4), indexes=[1, 2])
+MATH_FRIDAY = Course(name="高等数学", teacher="李四", classroom="J7-101", location="山东科技大学J7",
+                     weekday=5, weeks=Weeks(1, 2), indexes=[3])
+PHYSICS = Course(name="大学物理", teacher="王五", classroom="S1-201", location=Geo("S1", 36.0, 120.1),
+                 weekday=3, weeks=Weeks(1, 2), indexes=[3])
+
+def test_cached_output():
+    cache = EventCache()
+    for compact in (False, True):
+        for courses in ([MATH, PHYSICS], [MATH, MATH_FRIDAY, PHYSICS], [PHYSICS, MATH]):
+            for stamp in (datetime(2025, 9, 1), datetime(2025, 9, 2, 8, 30)):
+                expected = make_school(courses, stamp, compact=compact).generate().encode("utf-8")
+                assert render(make_school(courses, stamp, compact=compact, event_cache=cache)) == expected
+    # 同一课程时间段在其他课程组合下课程进度不同，不共用缓存
+    info = cache.cache_info()
+    assert info['misses'] == 7 and info['hits'] == 2 * 2 * 7 - 7
+    assert info['currsize'] == 7
+
+def test_eviction():
+    cache = EventCache(max_entries=1)
+    render(make_school([MATH, PHYSICS], event_cache=cache))
+    assert len(cache) == 1 and cache.evictions == 1
+
+    cache = EventCache(max_bytes=1)
+    assert render(make_school([MATH], event_cache=cache)) == make_school([MATH]).generate().encode("utf-8")
+    assert len(cache) == 0 and cache.total == 0
+
+if __name__ == "__main__":
+    test_cached_output()
+    test_eviction()
+    print("🎉 所有测试通过！")
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# 测试稳定 UID 与基于 SEQUENCE 的增量更新
+import io
+import sys
+import os
+from datetime import datetime
+
+# 添加当前目录到Python路径
+sys.path.append(os.getcwd())
+
+from data import Course, School, Weeks
+from ics_diff import read_event_index
+
+def make_school(courses, **kwargs):
+    timetable = [(8, 0), (10, 10), (14, 0), (16, 0), (19, 0)]
+    return School(duration=110, timetable=timetable, start=(2025, 9, 1), courses=courses,
+                  stamp=datetime(2025, 9, 1), **kwargs)
+
+def test_reproducible_output():
+    """测试固定 DTSTAMP 后两次生成的日历逐字节相同"""
+    courses = [Course(name="电路", teacher="张三", classroom="J7-101", location="J7-101",
+                      weekday=1, weeks=Weeks(1, 4), indexes=[1])]
+    assert make_school(courses).generate() == make_school(courses).generate()
+
+def test_sequence_update():
+    """测试换教室后 UID 不变、SEQUENCE 加一，删除的课程被取消"""
+    math = Course(name="高等数学", teacher="李四", classroom="J7-101", location="J7-101",
+                  weekday=2, weeks=Weeks(1, 4), indexes=[1])
+    physics = Course(name="大学物理", teacher="王五", classroom="S1-201", location="S1-201",
+                     weekday=3, weeks=Weeks(1, 2), indexes=[3])
+    previous = read_event_index(io.StringIO(make_school([math, physics]).generate()))
+    
+    moved = Course(name="高等数学", teacher="李四", classroom="J7-102", location="J7-102",
+                   weekday=2, weeks=Weeks(1, 4), indexes=[1])
+    current = read_event_index(io.StringIO(make_school([moved, physics], previous=previous).generate()))
+    assert current.keys() == previous.keys()
+    assert sorted(event.sequence for event in current.values()) == [0, 0, 1, 1, 1, 1]
+    
+    changes = make_school([moved], previous=current, only_changed=True).generate()
+    assert changes.count("BEGIN:VEVENT") == 2
+    assert changes.count("STATUS:CANCELLED") == 2
+
+if __name__ == "__main__":
+    test_reproducible_output()
+    test_sequence_update()
+    print("🎉 所有测试通过！")
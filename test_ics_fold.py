@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# 测试按字节折叠日历内容行
+import io
+import sys
+import os
+
+# 添加当前目录到Python路径
+sys.path.append(os.getcwd())
+
+from ics_fold import FOLD_LIMIT, FoldingWriter, fold_line
+
+def test_fold_line():
+    """测试折叠后每行不超过 75 字节，且展开后与原文一致"""
+    test_cases = [
+        "BEGIN:VEVENT",
+        "DESCRIPTION:" + "a" * 200,
+        "DESCRIPTION:任课教师：张三\\n课程进度：第5次课，共32次课，剩27次课\\n下次上课：2025/09/18(本周四)",
+        "SUMMARY:" + "😀" * 40,  # 4 字节字符
+    ]
+    
+    for line in test_cases:
+        physical = fold_line(line)
+        assert all(len(p.encode("utf-8")) <= FOLD_LIMIT for p in physical), f"'{line}' 折叠后超长"
+        assert all(p.startswith(" ") for p in physical[1:])
+        assert "".join(p[1:] if i else p for i, p in enumerate(physical)) == line
+    
+    assert fold_line("A" * FOLD_LIMIT) == ["A" * FOLD_LIMIT]
+
+def test_folding_writer():
+    """测试 FoldingWriter 的输出与 fold_line 一致，且缓冲区大小不影响结果"""
+    lines = ["BEGIN:VCALENDAR", "DESCRIPTION:" + "课程" * 60, "END:VCALENDAR"]
+    expected = "\n".join(p for line in lines for p in fold_line(line)).encode("utf-8")
+    
+    for buffer_size in (1, 16, 64 * 1024):
+        out = io.BytesIO()
+        writer = FoldingWriter(out, buffer_size=buffer_size)
+        for line in lines:
+            writer.write_line(line)
+        writer.flush()
+        assert out.getvalue() == expected
+        assert writer.written == len(expected)
+
+def test_folding_writer_crlf():
+    """测试使用 CRLF 换行时的输出，缓冲区大小按实际换行符长度计算"""
+    lines = ["A" * 10, "DESCRIPTION:" + "课程" * 60, "B" * 10]
+    expected = "\r\n".join(p for line in lines for p in fold_line(line)).encode("utf-8")
+    
+    out = io.BytesIO()
+    writer = FoldingWriter(out, newline=b"\r\n")
+    writer.write_lines(lines)
+    writer.flush()
+    assert out.getvalue() == expected
+    
+    # 3 行各 10 字节，加上各自的换行符（CRLF 2 字节）恰好达到 36 字节的缓冲区上限
+    out = io.BytesIO()
+    writer = FoldingWriter(out, newline=b"\r\n", buffer_size=36)
+    writer.write_lines(["A" * 10, "B" * 10, "C" * 10])
+    assert out.getvalue() == b"AAAAAAAAAA\r\nBBBBBBBBBB\r\nCCCCCCCCCC"
+
+if __name__ == "__main__":
+    test_fold_line()
+    test_folding_writer()
+    test_folding_writer_crlf()
+    print("🎉 所有测试通过！")
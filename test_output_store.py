@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# 测试内容寻址的输出存储：相同课表只渲染一次，学生的输出文件硬链接到同一个存储对象
+import sys
+import os
+import tempfile
+
+# 添加当前目录到Python路径
+sys.path.append(os.getcwd())
+
+from batch import run_batch, summarize
+from data import Course, Weeks
+from output_store import STORE_DIR, OutputStore, canonical_courses, timetable_digest
+
+def make_courses():
+    return [
+        Course("线性代数", "张三", "J7-106室", "J7-106室", 1, Weeks(1, 16), (1, 2)),
+        Course("电路", "李四", "S1-201室", "S1-201室", 3, Weeks(2, 16), (3, 4)),
+    ]
+
+def test_digest():
+    """课程顺序不影响摘要，课程内容或学校配置变化时摘要不同"""
+    courses = make_courses()
+    timetable = [(8, 0), (8, 55)]
+    digest = timetable_digest(canonical_courses(courses), 45, timetable, (2025, 9, 1))
+    assert timetable_digest(canonical_courses(reversed(courses)), 45, timetable, (2025, 9, 1)) == digest
+    assert timetable_digest(canonical_courses(courses), 45, timetable, (2025, 9, 8)) != digest
+    assert timetable_digest(canonical_courses(courses), 45, timetable, (2025, 9, 1), compact=True) != digest
+    assert timetable_digest(canonical_courses(courses[:1]), 45, timetable, (2025, 9, 1)) != digest
+
+def test_store():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = OutputStore(os.path.join(tmp, STORE_DIR))
+        calls = []
+        render = lambda w: calls.append(w.write(b"BEGIN:VCALENDAR"))
+        assert store.put("ab" * 32, render)
+        assert not store.put("ab" * 32, render)
+        assert len(calls) == 1
+        for name in ("a/张三.ics", "a/李四.ics"):
+            store.link("ab" * 32, os.path.join(tmp, name))
+        assert os.path.samefile(os.path.join(tmp, "a/张三.ics"), os.path.join(tmp, "a/李四.ics"))
+        assert os.stat(store.object_path("ab" * 32)).st_nlink == 3
+
+def write_workbook(path, cell):
+    import openpyxl
+
+    book = openpyxl.Workbook()
+    sheet = book.active
+    sheet.append(["山东科技大学 2025-2026-1 学期理论课表"])
+    sheet.append(["", "星期一", "星期二", "星期三", "星期四", "星期五"])
+    sheet.append(["第一大节", cell])
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    book.save(path)
+
+def test_batch_dedupe():
+    """同一班级的课表只渲染一次；之后不去重地重新生成不会改写其他学生的日历"""
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "exports")
+        output = os.path.join(tmp, "ics")
+        inputs = []
+        for i in range(6):
+            path = os.path.join(source, f"class{i // 3}", f"student{i}.xlsx")
+            write_workbook(path, f"课程{i // 3}\n张三(讲师)\n1-16[周]\nJ7-106室")
+            inputs.append(path)
+        results = list(run_batch(inputs, output, (2025, 9, 1), jobs=1, input_root=source,
+                                 use_cache=False, dedupe=True))
+        summary = summarize(results, 1.0)
+        assert summary['dedupe'] == {'outputs': 6, 'distinct': 2, 'rendered': 2, 'ratio': 1 - 2 / 6}
+        first, second = results[0]['output'], results[1]['output']
+        assert os.path.samefile(first, second)
+        with open(second, "rb") as r:
+            before = r.read()
+
+        list(run_batch(inputs[:1], output, (2025, 9, 8), jobs=1, input_root=source, use_cache=False))
+        assert not os.path.samefile(first, second)
+        with open(second, "rb") as r:
+            assert r.read() == before
+
+if __name__ == "__main__":
+    test_digest()
+    test_store()
+    test_batch_dedupe()
+    print("🎉 所有测试通过！")
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# 测试解析结果缓存：缓存键失效、损坏缓存的回退、按 EVICT_INTERVAL 的 LRU 淘汰与写入失败的清理
+import sys
+import os
+import importlib
+import tempfile
+
+# 添加当前目录到Python路径
+sys.path.append(os.getcwd())
+
+import parse_cache
+from data import Course, Weeks
+
+def make_courses():
+    return [
+        Course("线性代数", "张三", "J7-106室", "J7-106室", 1, Weeks(1, 16), (1, 2)),
+        Course("电路", "李四", "S1-201室", "S1-201室", 3, Weeks(2, 16), (3, 4)),
+    ]
+
+class TempCacheDir:
+    """通过环境变量 SDUST_CACHE_DIR 将缓存目录指向临时目录，退出时恢复"""
+
+    def __enter__(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.saved = os.environ.get("SDUST_CACHE_DIR")
+        os.environ["SDUST_CACHE_DIR"] = self.tmp.name
+        importlib.reload(parse_cache)
+        return self.tmp.name
+
+    def __exit__(self, *exc_info):
+        if self.saved is None:
+            del os.environ["SDUST_CACHE_DIR"]
+        else:
+            os.environ["SDUST_CACHE_DIR"] = self.saved
+        importlib.reload(parse_cache)
+        self.tmp.cleanup()
+
+def test_key_invalidation():
+    """解析器版本、文件内容或建筑登记表变化时缓存键不同，旧缓存不会被读到"""
+    with TempCacheDir() as cache_dir:
+        assert parse_cache.CACHE_DIR == cache_dir
+        key = parse_cache.cache_key(b"workbook", 1, "registry")
+        parse_cache.store(key, make_courses())
+        assert os.path.exists(os.path.join(cache_dir, key + parse_cache.CACHE_SUFFIX))
+        assert parse_cache.load(key) == make_courses()
+        
+        assert parse_cache.cache_key(b"workbook", 1, "registry") == key
+        for other in (parse_cache.cache_key(b"workbook", 2, "registry"),
+                      parse_cache.cache_key(b"workbook2", 1, "registry"),
+                      parse_cache.cache_key(b"workbook", 1, "registry2")):
+            assert other != key
+            assert parse_cache.load(other) is None
+
+def test_corrupted_entry():
+    """缓存文件损坏时视为未命中并删除该文件"""
+    with TempCacheDir():
+        key = parse_cache.cache_key(b"workbook", 1)
+        path = parse_cache.cache_path(key)
+        with open(path, "wb") as w:
+            w.write(b"not zlib")
+        assert parse_cache.load(key) is None
+        assert not os.path.exists(path)
+        
+        parse_cache.store(key, make_courses())
+        assert parse_cache.load(key) == make_courses()
+
+def test_lru_eviction():
+    """每写入 EVICT_INTERVAL 次扫描一次缓存目录，按最近使用时间淘汰到大小上限以内"""
+    with TempCacheDir() as cache_dir:
+        size = len(parse_cache.serialize_courses(make_courses()))
+        keys = [parse_cache.cache_key(str(i).encode(), 1) for i in range(parse_cache.EVICT_INTERVAL + 1)]
+        for i, key in enumerate(keys[:-1]):
+            parse_cache.store(key, make_courses(), max_bytes=size * 3)
+            os.utime(parse_cache.cache_path(key), (i + 1, i + 1))
+        # 两次扫描之间不淘汰
+        assert len(os.listdir(cache_dir)) == parse_cache.EVICT_INTERVAL
+        
+        parse_cache.load(keys[0])  # 读取时刷新最近使用时间
+        parse_cache.store(keys[-1], make_courses(), max_bytes=size * 3)
+        remaining = sorted(os.listdir(cache_dir))
+        assert remaining == sorted(key + parse_cache.CACHE_SUFFIX for key in (keys[0], keys[-2], keys[-1]))
+
+def test_store_failure_cleanup():
+    """写入失败时不留下临时文件，也不影响调用方"""
+    with TempCacheDir() as cache_dir:
+        replace = os.replace
+        def failing_replace(*args):
+            raise OSError("磁盘已满")
+        os.replace = failing_replace
+        try:
+            parse_cache.store(parse_cache.cache_key(b"workbook", 1), make_courses())
+        finally:
+            os.replace = replace
+        assert os.listdir(cache_dir) == []
+
+if __name__ == "__main__":
+    test_key_invalidation()
+    test_corrupted_entry()
+    test_lru_eviction()
+    test_store_failure_cleanup()
+    print("🎉 所有测试通过！")
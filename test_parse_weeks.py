@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# 测试周次表达式解析及 WeekSet 周次集合
+import sys
+import os
+
+# 添加当前目录到Python路径
+sys.path.append(os.getcwd())
+
+from course_parser import parse_weeks
+from data import EvenWeeks, OddWeeks, WeekSet, Weeks
+
+def test_parse_weeks():
+    """测试周次表达式解析"""
+    test_cases = [
+        ("1-16[周]", list(range(1, 17))),
+        ("1-11,13-14[周]", [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 13, 14]),
+        ("1-15[单周]", [1, 3, 5, 7, 9, 11, 13, 15]),
+        ("2-16[双周]", [2, 4, 6, 8, 10, 12, 14, 16]),
+        ("3,5,7[周]", [3, 5, 7]),
+        ("1-8[周],10-16[双周]", [1, 2, 3, 4, 5, 6, 7, 8, 10, 12, 14, 16]),
+        ("5", [5]),
+        ("", []),  # 空字符串的情况
+    ]
+    
+    for week_text, expected in test_cases:
+        assert list(parse_weeks(week_text)) == expected, f"'{week_text}' 解析错误"
+
+def test_week_set():
+    """测试 WeekSet 的集合运算"""
+    weeks = WeekSet([3, 1, 2, 2])
+    assert list(weeks) == [1, 2, 3]
+    assert len(weeks) == 3
+    assert 2 in weeks and 4 not in weeks
+    assert weeks == Weeks(1, 3) and hash(weeks) == hash(Weeks(1, 3))
+    assert OddWeeks(1, 6) | EvenWeeks(1, 6) == Weeks(1, 6)
+    assert list(Weeks(1, 6) & EvenWeeks(1, 6)) == [2, 4, 6]
+    assert list(Weeks(1, 6) - OddWeeks(1, 6)) == [2, 4, 6]
+    assert (weeks.first, weeks.last) == (1, 3)
+    assert not WeekSet() and WeekSet().first == 0
+
+def test_week_recurrence():
+    """测试周次集合转换为重复规则（精简模式使用）"""
+    test_cases = [
+        ("1-16[周]", (1, 1, 16, [], [])),
+        ("1-15[单周]", (1, 2, 8, [], [])),
+        ("2-16[双周]", (2, 2, 8, [], [])),
+        ("1-11,13-14[周]", (1, 1, 14, [12], [])),
+        ("1-7[单周],10[周]", (1, 2, 5, [9], [10])),
+    ]
+    
+    for week_text, expected in test_cases:
+        first, interval, count, excluded, added = parse_weeks(week_text).recurrence()
+        assert (first, interval, count, list(excluded), list(added)) == expected, f"'{week_text}' 规则错误"
+    
+    assert parse_weeks("1-11,13-14[周]").expression() == "1-11,13-14"
+
+if __name__ == "__main__":
+    test_parse_weeks()
+    test_week_set()
+    test_week_recurrence()
+    print("🎉 所有测试通过！")
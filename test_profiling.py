@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# 测试性能分析：未开启时为空操作，嵌套阶段按开始顺序记录，批量记录按阶段汇总
+import sys
+import os
+import json
+import tempfile
+
+# 添加当前目录到Python路径
+sys.path.append(os.getcwd())
+
+import profiling
+
+def test_disabled_stage():
+    assert not profiling.enabled()
+    with profiling.stage("parse") as stage:
+        stage.count(courses=3)
+    assert stage is profiling.NULL_STAGE
+
+def test_nested_stages():
+    profiler = profiling.Profiler()
+    profiler.start()
+    previous = profiling.activate(profiler)
+    try:
+        with profiling.stage("parse"):
+            with profiling.stage("extract", cells=2) as stage:
+                data = [bytes(1024) for _ in range(256)]
+                stage.count(cells=3)
+            del data
+        with profiling.stage("generate", bytes=100):
+            pass
+    finally:
+        profiling.activate(previous)
+        profiler.stop()
+
+    assert [r['stage'] for r in profiler.records] == ["parse", "parse/extract", "generate"]
+    extract = profiler.records[1]
+    assert extract['counts'] == {'cells': 5}
+    assert extract['peak_delta_bytes'] >= 256 * 1024
+    # 子阶段的内存峰值也计入父阶段
+    assert profiler.records[0]['peak_bytes'] >= extract['peak_bytes']
+    assert profiler.records[2]['counts'] == {'bytes': 100}
+
+def test_summarize_records():
+    record = {'stage': "convert/parse", 'wall_s': 0.5, 'cpu_s': 0.25, 'peak_bytes': 10,
+              'peak_delta_bytes': 4, 'counts': {'courses': 3}}
+    other = dict(record, peak_bytes=20, peak_delta_bytes=2, counts={'courses': 4})
+    [total] = profiling.summarize_records([record, other])
+    assert total['calls'] == 2
+    assert total['wall_s'] == 1.0 and total['cpu_s'] == 0.5
+    assert total['peak_bytes'] == 20 and total['peak_delta_bytes'] == 4
+    assert total['counts'] == {'courses': 7}
+
+def test_session_report():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "report.json")
+        session = profiling.ProfileSession(path, hook="cprofile").start()
+        with profiling.stage("generate", bytes=42):
+            sum(range(1000))
+        session.add_records([{'stage': "convert", 'wall_s': 0.1, 'cpu_s': 0.1, 'peak_bytes': 0,
+                              'peak_delta_bytes': 0, 'counts': {}}])
+        assert session.finish(files=1) == path
+        assert session.finish() is None
+        assert not profiling.enabled()
+
+        with open(path, encoding="utf-8") as r:
+            report = json.load(r)
+        assert [s['stage'] for s in report['stages']] == ["generate", "convert"]
+        assert report['files'] == 1
+        assert os.path.exists(report['hook']['output'])
+
+def test_session_from_env():
+    os.environ.pop(profiling.PROFILE_ENV, None)
+    os.environ.pop(profiling.PROFILER_ENV, None)
+    assert profiling.session_from() is None
+    assert profiling.session_from("out.json").report_path == "out.json"
+    os.environ[profiling.PROFILE_ENV] = "1"
+    try:
+        assert profiling.session_from().report_path == profiling.DEFAULT_REPORT
+    finally:
+        del os.environ[profiling.PROFILE_ENV]
+
+if __name__ == "__main__":
+    test_disabled_stage()
+    test_nested_stages()
+    test_summarize_records()
+    test_session_report()
+    test_session_from_env()
+    print("🎉 所有测试通过！")
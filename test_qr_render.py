@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# 测试二维码矩阵编码一次后渲染为各种格式
+import sys
+import os
+import tempfile
+
+# 添加当前目录到Python路径
+sys.path.append(os.getcwd())
+
+from qr_render import BORDER, BOX_SIZE, QRMatrix, format_for, render_batch, render_pbm, render_png, render_svg, render_terminal
+
+MATRIX = QRMatrix(((True, False, True), (False, True, False), (True, True, False)))
+
+def test_render_formats():
+    """测试 PNG/PBM 的尺寸与像素、SVG 路径和终端字符画"""
+    width = (3 + 2 * BORDER) * BOX_SIZE
+    png = render_png(MATRIX)
+    assert png.startswith(b"\x89PNG\r\n\x1a\n")
+    assert int.from_bytes(png[16:20], "big") == width
+    
+    pbm = render_pbm(MATRIX, box_size=1, border=0)
+    assert pbm == b"P4\n3 3\n" + bytes([0b10100000, 0b01000000, 0b11000000])
+    
+    svg = render_svg(MATRIX, border=0).decode("utf-8")
+    assert 'd="M0 0h1v1h-1zM2 0h1v1h-1zM1 1h1v1h-1zM0 2h2v1h-2z"' in svg
+    
+    assert render_terminal(MATRIX, border=0, invert=False) == "▀▄▀\n▀▀\xa0"
+
+def test_render_batch():
+    """测试批量生成按扩展名选择格式"""
+    assert format_for("a.SVG") == "svg" and format_for("a") == "png"
+    with tempfile.TemporaryDirectory() as tmp:
+        items = [(f"https://example.com/{n}", os.path.join(tmp, f"{n}.{ext}"))
+                 for n, ext in enumerate(("png", "svg", "pbm"))]
+        results = list(render_batch(items, jobs=1))
+        assert all(r['success'] for r in results)
+        with open(items[2][1], "rb") as r:
+            assert r.read(3) == b"P4\n"
+
+if __name__ == "__main__":
+    test_render_formats()
+    test_render_batch()
+    print("🎉 所有测试通过！")
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# 测试订阅服务的条件请求、压缩协商与渲染缓存
+import asyncio
+import sys
+import os
+import tempfile
+
+# 添加当前目录到Python路径
+sys.path.append(os.getcwd())
+
+from serve import RenderCache, RenderedCalendar, SubscriptionServer, accepts_gzip, is_not_modified
+
+def make_calendar(etag, size=10):
+    return RenderedCalendar(body=b"x" * size, gzip_body=b"", etag=etag,
+                            last_modified="Mon, 01 Sep 2025 00:00:00 GMT", mtime=1756684800)
+
+def test_conditional_request():
+    """测试 If-None-Match 优先于 If-Modified-Since"""
+    calendar = make_calendar('"abc"')
+    assert is_not_modified({"if-none-match": '"abc"'}, calendar)
+    assert is_not_modified({"if-none-match": 'W/"abc", "def"'}, calendar)
+    assert not is_not_modified({"if-none-match": '"def"',
+                                "if-modified-since": "Mon, 01 Sep 2025 00:00:00 GMT"}, calendar)
+    assert is_not_modified({"if-modified-since": "Mon, 01 Sep 2025 00:00:00 GMT"}, calendar)
+    assert not is_not_modified({"if-modified-since": "Sun, 31 Aug 2025 00:00:00 GMT"}, calendar)
+    assert not is_not_modified({"if-modified-since": "invalid"}, calendar)
+    assert not is_not_modified({}, calendar)
+
+def test_accepts_gzip():
+    assert accepts_gzip("gzip, deflate, br")
+    assert accepts_gzip("br;q=1.0, gzip;q=0.8")
+    assert not accepts_gzip("gzip;q=0")
+    assert not accepts_gzip("identity")
+    assert not accepts_gzip("")
+
+def test_render_cache():
+    """测试版本变化视为未命中，超出大小上限时淘汰最久未使用的日历"""
+    cache = RenderCache(max_bytes=25)
+    cache.put("a", (1,), make_calendar('"a"'))
+    cache.put("b", (1,), make_calendar('"b"'))
+    assert cache.get("a", (2,)) is None
+    assert cache.get("a", (1,)).etag == '"a"'
+    cache.put("c", (1,), make_calendar('"c"'))
+    assert cache.get("b", (1,)) is None
+    assert len(cache) == 2 and cache.total == 20
+    assert (cache.hits, cache.misses) == (1, 2)
+
+async def read_response(reader):
+    """读取一个响应，返回 (状态码, 小写的响应头)"""
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    headers = {name.strip().lower(): value.strip()
+               for name, sep, value in (line.partition(":") for line in lines[1:]) if sep}
+    await reader.readexactly(int(headers["content-length"]))
+    return int(lines[0].split(" ")[1]), headers
+
+async def pipelined_requests():
+    with tempfile.TemporaryDirectory() as tmp:
+        ready = asyncio.get_running_loop().create_future()
+        server = asyncio.create_task(SubscriptionServer(tmp, (2025, 9, 1)).serve("127.0.0.1", 0, ready))
+        port = await ready
+        try:
+            # 请求体不能被当作下一个请求解析
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            body = b"GET /x HTTP/1.1\r\n\r\n"
+            writer.write(b"POST /a.ics HTTP/1.1\r\nContent-Length: %d\r\n\r\n" % len(body) + body
+                         + b"GET /a.ics HTTP/1.1\r\n\r\n")
+            await writer.drain()
+            status, headers = await read_response(reader)
+            assert status == 405 and headers["connection"] == "keep-alive"
+            status, headers = await read_response(reader)
+            assert status == 404
+            try:
+                await asyncio.wait_for(reader.read(1), 0.2)
+                assert False, "请求体被当作了第三个请求"
+            except asyncio.TimeoutError:
+                pass
+            writer.close()
+            
+            # 分块传输的请求体无法按长度跳过，响应后关闭连接
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"POST /a.ics HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n5\r\nhello\r\n0\r\n\r\n")
+            await writer.drain()
+            status, headers = await read_response(reader)
+            assert status == 405 and headers["connection"] == "close"
+            assert await reader.read() == b""
+            writer.close()
+        finally:
+            server.cancel()
+
+def test_request_body():
+    """测试带请求体的请求：请求体被读取并丢弃，同一连接上的后续请求正常处理"""
+    asyncio.run(pipelined_requests())
+
+if __name__ == "__main__":
+    test_conditional_request()
+    test_accepts_gzip()
+    test_render_cache()
+    test_request_body()
+    print("🎉 所有测试通过！")
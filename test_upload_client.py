@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# 测试上传客户端的重试、压缩与结果统计（使用本地 HTTP 服务模拟缓存服务）
+import gzip
+import json
+import sys
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 添加当前目录到Python路径
+sys.path.append(os.getcwd())
+
+from upload_and_qr import UploadClient
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """前 failures 次请求返回 503，之后返回上传成功"""
+    failures = 0
+    received = []
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        if self.headers.get('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+        FlakyHandler.received.append(json.loads(body))
+        if FlakyHandler.failures > 0:
+            FlakyHandler.failures -= 1
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        payload = json.dumps({'code': 200, 'uuid': 'abc', 'expiredAt': 1}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+def start_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FlakyHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/api?mode=set"
+
+def test_retry_and_compress():
+    """测试 5xx 后重试成功，gzip 请求体可被还原，结果包含耗时与发送字节数"""
+    server, url = start_server()
+    try:
+        FlakyHandler.failures = 2
+        FlakyHandler.received = []
+        content = "BEGIN:VCALENDAR\nSUMMARY:高等数学\nEND:VCALENDAR".encode('utf-8')
+        with UploadClient(api_url=url, retries=3, backoff=0.01, compress=True) as client:
+            result = client.upload_bytes(content, expired_hours=1)
+        assert result['success'], result
+        assert result['uuid'] == 'abc'
+        assert result['attempts'] == 3
+        assert result['latency'] > 0 and result['bytes_sent'] > 0
+        assert FlakyHandler.received[-1]['data'] == content.decode('utf-8')
+        
+        FlakyHandler.failures = 5
+        with UploadClient(api_url=url, retries=1, backoff=0.01) as client:
+            result = client.upload_bytes(content)
+        assert not result['success'] and result['attempts'] == 2
+        assert "503" in result['error']
+    finally:
+        server.shutdown()
+
+def test_main_upload():
+    """主程序生成 .ics 后直接上传内存中的日历内容（不重新读取文件）"""
+    import builtins
+    import runpy
+    import tempfile
+    import openpyxl
+    import upload_and_qr
+
+    main_path = os.path.abspath("main.py")
+    server, url = start_server()
+    saved = (sys.argv, builtins.input, os.getcwd(), upload_and_qr._default_client)
+    try:
+        FlakyHandler.failures = 0
+        FlakyHandler.received = []
+        with tempfile.TemporaryDirectory() as tmp:
+            book = openpyxl.Workbook()
+            book.active.append(["山东科技大学 2025-2026-1 学期理论课表"])
+            book.active.append(["", "星期一", "星期二", "星期三", "星期四", "星期五"])
+            book.active.append(["第一大节", "线性代数\n张三(讲师)\n1-16[周]\nJ7-106室"])
+            source = os.path.join(tmp, "课表.xlsx")
+            book.save(source)
+            
+            os.chdir(tmp)  # 二维码图片保存在当前目录
+            sys.argv = ["main.py", source, "--no-cache", "--force-upload", "-o", os.path.join(tmp, "out.ics")]
+            builtins.input = lambda prompt="": "2025-09-01"
+            upload_and_qr._default_client = UploadClient(api_url=url, retries=0)
+            runpy.run_path(main_path, run_name="__main__")
+            
+            with open(os.path.join(tmp, "out.ics"), "rb") as r:
+                assert FlakyHandler.received[-1]['data'] == r.read().decode('utf-8')
+            assert os.path.exists(os.path.join(tmp, "课表二维码.png"))
+    finally:
+        sys.argv, builtins.input, cwd, upload_and_qr._default_client = saved
+        os.chdir(cwd)
+        server.shutdown()
+
+if __name__ == "__main__":
+    test_retry_and_compress()
+    test_main_upload()
+    print("🎉 所有测试通过！")
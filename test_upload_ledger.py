@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# 测试上传记录：内容摘要忽略 DTSTAMP，链接即将过期时不再沿用
+import sys
+import os
+import tempfile
+
+# 添加当前目录到Python路径
+sys.path.append(os.getcwd())
+
+from upload_ledger import MIN_REMAINING, UploadLedger, calendar_digest, expires_at
+
+def test_calendar_digest():
+    first = b"BEGIN:VEVENT\nDTSTAMP:20250901T000000Z\nSUMMARY:\xe7\x94\xb5\xe8\xb7\xaf\nEND:VEVENT"
+    second = b"BEGIN:VEVENT\nDTSTAMP:20250902T080000Z\nSUMMARY:\xe7\x94\xb5\xe8\xb7\xaf\nEND:VEVENT"
+    changed = b"BEGIN:VEVENT\nDTSTAMP:20250902T080000Z\nSUMMARY:\xe7\x89\xa9\xe7\x90\x86\nEND:VEVENT"
+    assert calendar_digest(first) == calendar_digest(second)
+    assert calendar_digest(first) != calendar_digest(changed)
+
+def test_expires_at():
+    assert expires_at(1000, 1, None) == 1000 + 3600
+    assert expires_at(1000, 1, "2025-09-01") == 1000 + 3600
+    assert expires_at(1000, 1, 2_000_000) == 1000 + 3600  # 非毫秒时间戳时忽略
+    assert expires_at(1_700_000_000, 24, 1_700_000_600_000) == 1_700_000_600
+
+def test_ledger_lookup():
+    """测试有效期内沿用记录，临近过期时重新上传，写入时清理已过期的记录"""
+    with tempfile.TemporaryDirectory() as tmp:
+        ledger = UploadLedger(tmp)
+        now = 1_700_000_000
+        ledger.record("a", {'uuid': 'a', 'expires': now + MIN_REMAINING + 60}, now=now)
+        ledger.record("b", {'uuid': 'b', 'expires': now + 60}, now=now)
+        assert ledger.lookup("a", now=now)['uuid'] == 'a'
+        assert ledger.lookup("b", now=now) is None
+        assert ledger.lookup("a", now=now + 120) is None
+        
+        ledger.record("c", {'uuid': 'c', 'expires': now + 10 * MIN_REMAINING}, now=now + 120)
+        assert set(ledger.load()) == {"a", "c"}
+
+if __name__ == "__main__":
+    test_calendar_digest()
+    test_expires_at()
+    test_ledger_lookup()
+    print("🎉 所有测试通过！")
@@ -1,163 +1,285 @@
-import requests
-import qrcode
+# requests、qrcode 导入较慢，只在实际上传或生成二维码时导入
+import gzip
 import json
 import os
+import shutil
+import time
 from io import BytesIO
 from typing import Optional
 
-def upload_ics_file(file_path: str, expired_hours: int = 24) -> dict:
+import profiling
+from qr_render import QRMatrix, qr_matrix, render_terminal, write_qr
+
+# 临时文件缓存服务
+UPLOAD_API = 'https://cache.ravelloh.top/api?mode=set'
+DOWNLOAD_URL = 'https://cache.ravelloh.top/file.ics?uuid={uuid}'
+
+# 需要重试的 HTTP 状态码（服务端临时错误）
+RETRY_STATUS = (500, 502, 503, 504)
+
+
+class UploadClient:
+    """
+    上传客户端：
+    复用一个 requests.Session（长连接与连接池），多次上传无需重复建立 TLS 连接；
+    请求体可选 gzip 压缩（需服务端支持 Content-Encoding: gzip，默认关闭）；
+    遇到 5xx、超时或连接失败时按指数退避重试
+    """
+
+    def __init__(self, api_url: str = UPLOAD_API, timeout: float = 30, retries: int = 3,
+                 backoff: float = 0.5, compress: bool = False, pool_size: int = 10):
+        self.api_url = api_url
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.compress = compress
+        self.pool_size = pool_size
+        self._session = None
+
+    @property
+    def session(self):
+        """首次使用时才创建 Session（此时才导入 requests）"""
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            self._session = session
+        return self._session
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def encode_body(self, content: bytes, expired_hours: int) -> tuple[bytes, dict]:
+        """构造请求体和请求头：JSON 直接以 UTF-8 编码（中文不转义为 \\uXXXX），可选 gzip 压缩"""
+        upload_data = {
+            "data": content.decode('utf-8'),
+            "safeIP": "*.*.*.*",
+            "expiredTime": expired_hours * 60 * 60 * 1000,  # 转换为毫秒
+        }
+        body = json.dumps(upload_data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        headers = {'Content-Type': 'application/json; charset=utf-8'}
+        if self.compress:
+            body = gzip.compress(body, mtime=0)
+            headers['Content-Encoding'] = 'gzip'
+        return body, headers
+
+    def upload_bytes(self, content: bytes, expired_hours: int = 24) -> dict:
+        """
+        上传 ics 内容（无需先写入文件）并返回相关信息
+        结果中包含 attempts（请求次数）、latency（含重试的总耗时，秒）和 bytes_sent（实际发送的请求体字节数）
+        """
+        import requests
+
+        body, headers = self.encode_body(content, expired_hours)
+        began = time.perf_counter()
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                response = self.session.post(self.api_url, headers=headers, data=body, timeout=self.timeout)
+                if response.status_code not in RETRY_STATUS or attempts > self.retries:
+                    break
+            except (requests.Timeout, requests.ConnectionError) as e:
+                if attempts > self.retries:
+                    return self._result(False, began, attempts, body, error=f"网络请求失败：{str(e)}")
+            except requests.RequestException as e:
+                return self._result(False, began, attempts, body, error=f"网络请求失败：{str(e)}")
+            # 指数退避：0.5s、1s、2s ...
+            time.sleep(self.backoff * 2 ** (attempts - 1))
+
+        try:
+            if response.status_code != 200:
+                return self._result(False, began, attempts, body, error=f"HTTP错误：{response.status_code}")
+            result = response.json()
+            if result.get('code') != 200:
+                return self._result(False, began, attempts, body,
+                                    error=f"服务器返回错误：{result.get('message', '未知错误')}")
+            return self._result(True, began, attempts, body,
+                                uuid=result.get('uuid'),
+                                expired_at=result.get('expiredAt'),
+                                download_url=DOWNLOAD_URL.format(uuid=result.get('uuid')),
+                                message=result.get('message', '上传成功'))
+        except ValueError as e:
+            return self._result(False, began, attempts, body, error=f"服务器响应格式错误：{str(e)}")
+
+    def upload_file(self, file_path: str, expired_hours: int = 24) -> dict:
+        """上传 ics 文件（以字节读取，不经过字符串解码再编码）"""
+        try:
+            with open(file_path, 'rb') as f:
+                content = f.read()
+        except OSError as e:
+            return {'success': False, 'error': f"读取文件失败：{str(e)}"}
+        return self.upload_bytes(content, expired_hours)
+
+    @staticmethod
+    def _result(success: bool, began: float, attempts: int, body: bytes, **fields) -> dict:
+        return {
+            'success': success,
+            **fields,
+            'attempts': attempts,
+            'latency': time.perf_counter() - began,
+            'bytes_sent': len(body),
+        }
+
+
+_default_client: Optional[UploadClient] = None
+
+
+def get_upload_client() -> UploadClient:
+    """进程内共享的上传客户端，多次上传复用同一个连接池"""
+    global _default_client
+    if _default_client is None:
+        _default_client = UploadClient()
+    return _default_client
+
+
+def upload_ics_file(file_path: str, expired_hours: int = 24, client: Optional[UploadClient] = None) -> dict:
     """
     上传ics文件到远程存储并返回相关信息
     
     Args:
         file_path: ics文件路径
         expired_hours: 过期时间（小时），默认24小时
+        client: 上传客户端，默认使用进程内共享的客户端
     
     Returns:
         包含上传结果的字典
     """
     try:
-        # 读取ics文件内容
-        with open(file_path, 'r', encoding='utf-8') as f:
-            ics_content = f.read()
-        
-        # 准备上传数据
-        upload_data = {
-            "data": ics_content,
-            "safeIP": "*.*.*.*",
-            "expiredTime": expired_hours * 60 * 60 * 1000,  # 转换为毫秒
-        }
-        
-        # 发送POST请求
-        response = requests.post(
-            'https://cache.ravelloh.top/api?mode=set',
-            headers={'Content-Type': 'application/json'},
-            data=json.dumps(upload_data),
-            timeout=30
-        )
-        
-        # 检查响应
-        if response.status_code == 200:
-            result = response.json()
-            if result.get('code') == 200:
-                return {
-                    'success': True,
-                    'uuid': result.get('uuid'),
-                    'expired_at': result.get('expiredAt'),
-                    'download_url': f"https://cache.ravelloh.top/file.ics?uuid={result.get('uuid')}",
-                    'message': result.get('message', '上传成功')
-                }
-            else:
-                return {
-                    'success': False,
-                    'error': f"服务器返回错误：{result.get('message', '未知错误')}"
-                }
-        else:
-            return {
-                'success': False,
-                'error': f"HTTP错误：{response.status_code}"
-            }
-            
-    except requests.RequestException as e:
-        return {
-            'success': False,
-            'error': f"网络请求失败：{str(e)}"
-        }
+        return (client or get_upload_client()).upload_file(file_path, expired_hours)
     except Exception as e:
         return {
             'success': False,
             'error': f"上传过程中发生错误：{str(e)}"
         }
 
-def generate_qr_code(url: str, save_path: Optional[str] = None) -> str:
+def generate_qr_code(url: str, save_path: Optional[str] = None, matrix: Optional[QRMatrix] = None) -> str:
     """
     生成二维码
     
     Args:
         url: 要生成二维码的URL
-        save_path: 保存路径，如果不提供则保存到默认位置
+        save_path: 保存路径，如果不提供则保存到默认位置；格式按扩展名确定（.png/.svg/.pbm）
+        matrix: 已编码的二维码矩阵，不提供时根据 url 编码
     
     Returns:
         二维码文件的保存路径
     """
     try:
-        # 创建二维码实例
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.ERROR_CORRECT_L,
-            box_size=10,
-            border=4,
-        )
-        
-        # 添加数据
-        qr.add_data(url)
-        qr.make(fit=True)
-        
-        # 创建二维码图片
-        qr_img = qr.make_image(fill_color="black", back_color="white")
-        
         # 确定保存路径
         if save_path is None:
             save_path = "课表二维码.png"
         
-        # 保存图片
-        with open(save_path, 'wb') as f:
-            qr_img.save(f, 'PNG')
-        return save_path
+        # 直接写入目标路径
+        return write_qr(matrix or qr_matrix(url), save_path)
         
     except Exception as e:
         raise Exception(f"生成二维码失败：{str(e)}")
 
-def display_qr_in_terminal(url: str):
-    """在命令行中显示二维码"""
+def display_qr_in_terminal(url: str, matrix: Optional[QRMatrix] = None):
+    """在命令行中显示二维码（提供 matrix 时直接使用已编码的矩阵）"""
     try:
-        # 创建简化的二维码用于命令行显示
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.ERROR_CORRECT_L,
-            box_size=1,
-            border=1,
-        )
-        qr.add_data(url)
-        qr.make(fit=True)
-        
-        # 打印二维码到终端
-        qr.print_ascii(out=None, tty=False, invert=True)
+        print(render_terminal(matrix or qr_matrix(url)))
         
     except Exception as e:
         print(f"❌ 无法在终端显示二维码: {str(e)}")
         print("📱 请查看保存的二维码图片文件")
 
-def upload_and_generate_qr(ics_file_path: str, expired_hours: int = 24) -> dict:
+def upload_and_generate_qr(ics_file_path: str, expired_hours: int = 24, use_ledger: bool = True,
+                           qr_path: str = "课表二维码.png", content: Optional[bytes] = None) -> dict:
     """
     上传ics文件并生成二维码的完整流程
+    课表内容与之前上传过的相同且链接仍有效时，直接沿用之前的链接和二维码（见 upload_ledger）
     
     Args:
         ics_file_path: ics文件路径
         expired_hours: 过期时间（小时）
+        use_ledger: 是否查找并记录上传记录，为 False 时总是重新上传
+        qr_path: 二维码保存路径
+        content: ics文件内容，已在内存中时传入，不再重新读取 ics_file_path
     
     Returns:
         包含完整结果的字典
     """
-    print("🚀 正在上传课表文件...")
-    
-    # 上传文件
-    upload_result = upload_ics_file(ics_file_path, expired_hours)
+    from upload_ledger import UploadLedger, calendar_digest, expires_at
+
+    if content is None:
+        try:
+            with open(ics_file_path, 'rb') as f:
+                content = f.read()
+        except OSError as e:
+            return {
+                'success': False,
+                'error': f"读取文件失败：{str(e)}"
+            }
     
-    if not upload_result['success']:
-        return {
-            'success': False,
-            'error': upload_result['error']
-        }
+    ledger = UploadLedger() if use_ledger else None
+    digest = calendar_digest(content)
+    upload_result = ledger.lookup(digest) if ledger else None
+    reused = upload_result is not None
     
-    print(f"✅ 上传成功！UUID: {upload_result['uuid']}")
-    print(f"📅 过期时间: {upload_result['expired_at']}")
-    print(f"🔗 下载链接: {upload_result['download_url']}")
+    if reused:
+        print("♻️  课表内容未变化，沿用之前上传的下载链接")
+        print(f"📅 过期时间: {upload_result['expired_at']}")
+        print(f"🔗 下载链接: {upload_result['download_url']}")
+    else:
+        print("🚀 正在上传课表文件...")
+        
+        # 上传文件
+        started = time.time()
+        with profiling.stage("upload") as stage:
+            upload_result = get_upload_client().upload_bytes(content, expired_hours)
+            stage.count(bytes=upload_result.get('bytes_sent', 0), attempts=upload_result.get('attempts', 0))
+        
+        if not upload_result['success']:
+            return {
+                'success': False,
+                'error': upload_result['error']
+            }
+        
+        print(f"✅ 上传成功！UUID: {upload_result['uuid']}")
+        print(f"📅 过期时间: {upload_result['expired_at']}")
+        print(f"🔗 下载链接: {upload_result['download_url']}")
+        print(f"⏱️  上传耗时: {upload_result['latency']:.2f} 秒（{upload_result['attempts']} 次请求，"
+              f"发送 {upload_result['bytes_sent'] / 1024:.1f} KB）")
+        
+        if ledger:
+            ledger.record(digest, {
+                'uuid': upload_result['uuid'],
+                'download_url': upload_result['download_url'],
+                'expired_at': upload_result['expired_at'],
+                'expires': expires_at(started, expired_hours, upload_result['expired_at']),
+            })
     
-    # 生成二维码
-    print("📱 正在生成二维码...")
+    # 生成二维码（沿用链接时直接复制缓存的二维码图片）
     try:
-        qr_path = generate_qr_code(upload_result['download_url'])
+        # 二维码矩阵只编码一次，图片和终端字符画都由它渲染
+        with profiling.stage("qr") as stage:
+            matrix = qr_matrix(upload_result['download_url'])
+            cached_qr = ledger.qr_path(digest) if ledger else None
+            if reused and os.path.exists(cached_qr) and qr_path.lower().endswith(".png"):
+                shutil.copyfile(cached_qr, qr_path)
+            else:
+                print("📱 正在生成二维码...")
+                generate_qr_code(upload_result['download_url'], qr_path, matrix)
+                if cached_qr and qr_path.lower().endswith(".png"):
+                    try:
+                        shutil.copyfile(qr_path, cached_qr)
+                    except OSError:
+                        pass
+            stage.count(reused=int(reused))
         print(f"🖼️  二维码已保存到: {qr_path}")
         
         return {
@@ -166,7 +288,11 @@ def upload_and_generate_qr(ics_file_path: str, expired_hours: int = 24) -> dict:
             'download_url': upload_result['download_url'],
             'expired_at': upload_result['expired_at'],
             'qr_code_path': qr_path,
-            'message': '课表文件已上传并生成二维码'
+            'qr_matrix': matrix,
+            'reused': reused,
+            'latency': upload_result.get('latency', 0.0),
+            'bytes_sent': upload_result.get('bytes_sent', 0),
+            'message': '已沿用之前上传的链接' if reused else '课表文件已上传并生成二维码'
         }
         
     except Exception as e:
@@ -189,7 +315,7 @@ def display_results(result: dict):
         print("-" * 60)
         
         # 在命令行显示二维码
-        display_qr_in_terminal(result['download_url'])
+        display_qr_in_terminal(result['download_url'], result.get('qr_matrix'))
         
         print("-" * 60)
         print("\n�💡 使用说明：")
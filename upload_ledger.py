@@ -0,0 +1,91 @@
+"""
+上传记录：
+以日历内容摘要为键，记录上传得到的 uuid、下载链接、过期时间和二维码图片，
+重复运行时课表内容未变化且链接仍有效，就直接沿用之前的链接和二维码，不再重复上传
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Optional
+
+from parse_cache import CACHE_DIR
+
+LEDGER_NAME = "upload_ledger.json"
+
+# 链接剩余有效期不足该时间（秒）时重新上传
+MIN_REMAINING = 24 * 3600
+
+# 每次生成都会变化、不影响日历内容的属性
+VOLATILE_PREFIXES = (b"DTSTAMP:",)
+
+
+def calendar_digest(content: bytes) -> str:
+    """日历内容摘要（忽略 DTSTAMP，同一课表每次生成的摘要相同）"""
+    digest = hashlib.sha256()
+    for line in content.splitlines():
+        if not line.startswith(VOLATILE_PREFIXES):
+            digest.update(line)
+            digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def expires_at(started: float, expired_hours: int, expired_at) -> float:
+    """
+    链接过期时间（秒级时间戳）：按上传时间和有效期计算；
+    服务端返回毫秒时间戳形式的 expiredAt 时取两者中较早的一个
+    """
+    expires = started + expired_hours * 3600
+    if isinstance(expired_at, (int, float)) and expired_at > 1e12:
+        expires = min(expires, expired_at / 1000)
+    return expires
+
+
+class UploadLedger:
+    """上传记录文件（JSON 对象：摘要 -> 记录），二维码图片与记录保存在同一目录"""
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or CACHE_DIR
+        self.path = os.path.join(self.directory, LEDGER_NAME)
+
+    def load(self) -> dict[str, dict]:
+        try:
+            with open(self.path, encoding="utf-8") as r:
+                return json.load(r)
+        except (OSError, ValueError):
+            return {}
+
+    def lookup(self, digest: str, now: Optional[float] = None) -> Optional[dict]:
+        """查找仍然有效的上传记录"""
+        entry = self.load().get(digest)
+        now = time.time() if now is None else now
+        if entry is None or entry.get('expires', 0) - MIN_REMAINING <= now:
+            return None
+        return entry
+
+    def record(self, digest: str, entry: dict, now: Optional[float] = None):
+        """写入一条记录，同时清理已过期的记录（先写临时文件再原子替换）"""
+        now = time.time() if now is None else now
+        previous = self.load()
+        entries = {key: value for key, value in previous.items() if value.get('expires', 0) > now}
+        for key in previous.keys() - entries.keys():
+            try:
+                os.remove(self.qr_path(key))
+            except OSError:
+                pass
+        entries[digest] = entry
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as w:
+                json.dump(entries, w, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            # 上传记录只是为了避免重复上传，写入失败不影响结果
+            pass
+
+    def qr_path(self, digest: str) -> str:
+        """该日历的二维码图片缓存路径"""
+        return os.path.join(self.directory, digest[:32] + ".png")